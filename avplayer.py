@@ -6,9 +6,11 @@ import CoreMedia
 import MediaToolbox
 import objc
 
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QUrl
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest
+
+from icyreader import IcyReader
+from network import shared_network
 
 
 class VideoWidget(QWidget):
@@ -17,6 +19,7 @@ class VideoWidget(QWidget):
     mousePressed = pyqtSignal()
     doubleClicked = pyqtSignal()
     metadataChanged = pyqtSignal(dict)
+    seekFinished = pyqtSignal()
 
     ########################################
     #
@@ -29,8 +32,8 @@ class VideoWidget(QWidget):
 
         self._volume = 1.
         self._muted = False
-        self._metadata = None
         self._is_icy = False
+        self._ready_status = None
 
         self._player = None
         self._playerLayer = None
@@ -51,24 +54,11 @@ class VideoWidget(QWidget):
 
         MediaToolbox.MTRegisterProfessionalVideoWorkflowFormatReaders()
 
-        # ugly polling for metadata in case of shoutcast streams, causing extra traffic
-        # but the native AVPlayerItemMetadataOutput API would be really tricky to implement
-        self._timer_metadata = QTimer(self)
-        self._timer_metadata.setInterval(8000)
-        self._timer_metadata.timeout.connect(self.__check_metadata)
-
-        self._net_manager = QNetworkAccessManager(self)
-        self._req_icy = QNetworkRequest()
-        self._req_icy.setRawHeader(b'Icy-MetaData', b'1')
-
-    ########################################
-    #
-    ########################################
-    def __parse_http_headers(self, reply):
-        res = {}
-        for k,v in reply.rawHeaderPairs():
-            res[k.data().decode().lower()] = v.data().decode()
-        return res
+        # metadata of shoutcast streams is read from a single extra connection that
+        # stays open, the native AVPlayerItemMetadataOutput API would be really tricky to implement
+        self._icy_reader = IcyReader(self, shared_network().manager)
+        self._icy_reader.ready.connect(self.__icy_ready)
+        self._icy_reader.metadataChanged.connect(self.metadataChanged)
 
     ########################################
     #
@@ -81,18 +71,8 @@ class VideoWidget(QWidget):
                 self.filename = None
 
             if self.is_url and not self.has_video():
-                self._req_icy.setUrl(QUrl(self.filename))
-                reply = self._net_manager.get(self._req_icy)
-                def _metadata_available():
-                    reply.abort()
-                    headers = self.__parse_http_headers(reply)
-                    self._is_icy = 'icy-metaint' in headers
-                    self.mediaReady.emit(status == 1)  # 2 means failed
-                    if self._is_icy:
-                        self._metaint = int(headers['icy-metaint'])
-                        self.__check_metadata()
-                        self._timer_metadata.start()
-                reply.metaDataChanged.connect(_metadata_available)
+                self._ready_status = status
+                self._icy_reader.start(self.filename)
             else:
                 self.mediaReady.emit(status == 1)  # 2 means failed
                 cm = self._player.currentItem().asset().commonMetadata()
@@ -105,30 +85,9 @@ class VideoWidget(QWidget):
     ########################################
     #
     ########################################
-    def __check_metadata(self):
-        reply = self._net_manager.get(self._req_icy)
-        reply.setReadBufferSize(self._metaint + 256)  # ???
-        def _loaded(reply=reply):
-            if reply.bytesAvailable() >= self._metaint + 256:
-                data = reply.readAll().data()[self._metaint:]
-                reply.abort()
-                try:
-                    metadata = {}
-                    for line in data[1:data[0] * 16].strip(b'\0').split(b';'):
-                        if line:
-                            k, v = line.split(b'=', 2)
-                            if v.startswith(b"'"):
-                                v = v[1:-1]
-                            k = k.decode().lower()
-                            if k.startswith('stream'):
-                                k = k[6:]
-                            metadata[k] = v.decode()
-                    if metadata != self._metadata:
-                        self._metadata = metadata
-                        self.metadataChanged.emit(metadata)
-                except:
-                    print('parsing metadata failed')
-        reply.readyRead.connect(_loaded)
+    def __icy_ready(self, is_icy):
+        self._is_icy = is_icy
+        self.mediaReady.emit(self._ready_status == 1)  # 2 means failed
 
     ########################################
     #
@@ -167,7 +126,7 @@ class VideoWidget(QWidget):
             self._playerLayer.removeFromSuperlayer()
             self._playerLayer = None
         self.repaint()
-        self._timer_metadata.stop()
+        self._icy_reader.stop()
 
     ########################################
     #
@@ -269,14 +228,20 @@ class VideoWidget(QWidget):
             self._player.setVolume_(0 if flag else self._volume)
 
     ########################################
-    # as seconds (float)
+    # as seconds (float), fast seeks go to the nearest keyframe, otherwise to
+    # the exact time. seekFinished is emitted when the seek completed (or was
+    # superseded)
     ########################################
-    def seek_to_time(self, sec: float):
+    def seek_to_time(self, sec: float, fast: bool=False):
         if self._player is None:
+            self.seekFinished.emit()
             return
         cm = self._player.currentItem().duration()
         cm.value = cm.timescale * sec
-        self._player.seekToTime_(cm)
+        tolerance = CoreMedia.kCMTimePositiveInfinity if fast else CoreMedia.kCMTimeZero
+        # completion handler may be called on another thread, the signal is queued then
+        self._player.seekToTime_toleranceBefore_toleranceAfter_completionHandler_(cm, tolerance, tolerance,
+                lambda finished: self.seekFinished.emit())
 
     ########################################
     # as seconds (float)
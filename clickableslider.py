@@ -1,14 +1,19 @@
 '''
 Implemenst a slider that "jumps" to the corresponding position if clicked outside the knob,
 and then follows the mouse while the left mouse button is pressed.
+While the mouse is over the slider, hoverMoved reports the value under the cursor.
 '''
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import QSlider, QStyleOptionSlider, QStyle
 
 
 class ClickableSlider(QSlider):
 
+    # value under the mouse, x or y position of the mouse
+    hoverMoved = pyqtSignal(int, int)
+    hoverLeft = pyqtSignal()
+
     ########################################
     #
     ########################################
@@ -18,11 +23,13 @@ class ClickableSlider(QSlider):
         self.initStyleOption(self._opt)
         sr = self.style().subControlRect(QStyle.CC_Slider, self._opt, QStyle.SC_SliderHandle, self)
         self._handle_size = sr.width() if self.orientation() == Qt.Horizontal else sr.height()
+        self.is_pressed_outside = False
+        self.setMouseTracking(True)
 
     ########################################
-    #
+    # returns value at mouse position of event
     ########################################
-    def __set(self, event):
+    def value_at(self, event):
         maxi, mini = self.maximum(), self.minimum()
         if self.orientation() == Qt.Horizontal:
             val = min(maxi, max(mini, int(mini + ((maxi - mini) * (event.x() - self._handle_size // 2)) / (self.width() - self._handle_size))))
@@ -30,8 +37,14 @@ class ClickableSlider(QSlider):
             val = min(maxi, max(mini, int(maxi - ((maxi - mini) * (event.y() - self._handle_size // 2)) / (self.height() - self._handle_size))))
         if self.invertedAppearance():
             val = maxi - val
-        self.setValue(val)
-        self.sliderMoved.emit(val)
+        return val
+
+    ########################################
+    #
+    ########################################
+    def __set(self, event):
+        # the slider is down, so setValue emits sliderMoved
+        self.setValue(self.value_at(event))
         event.accept()
 
     ########################################
@@ -41,6 +54,7 @@ class ClickableSlider(QSlider):
         sr = self.style().subControlRect(QStyle.CC_Slider, self._opt, QStyle.SC_SliderHandle, self)
         self.is_pressed_outside = event.button() == Qt.LeftButton and not sr.contains(event.pos())
         if self.is_pressed_outside:
+            self.setSliderDown(True)
             self.__set(event)
         else:
             super().mousePressEvent(event)
@@ -49,7 +63,27 @@ class ClickableSlider(QSlider):
     #
     ########################################
     def mouseMoveEvent(self, event):
+        self.hoverMoved.emit(self.value_at(event), event.x() if self.orientation() == Qt.Horizontal else event.y())
         if self.is_pressed_outside:
             self.__set(event)
         else:
             super().mouseMoveEvent(event)
+
+    ########################################
+    # the slider is down (isSliderDown, sliderPressed, sliderReleased) as well
+    # while it's dragged after clicking outside the knob
+    ########################################
+    def mouseReleaseEvent(self, event):
+        if self.is_pressed_outside:
+            self.is_pressed_outside = False
+            self.setSliderDown(False)
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
+
+    ########################################
+    #
+    ########################################
+    def leaveEvent(self, event):
+        self.hoverLeft.emit()
+        super().leaveEvent(event)
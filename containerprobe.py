@@ -0,0 +1,635 @@
+'''
+In-process container probe for MP4/MOV and Matroska/WebM.
+
+probe() memory-maps the file and walks only the metadata: the MP4 moov box
+(mdat is skipped by its size), or the Matroska EBML header, Info, Tracks and
+Cues (found via the SeekHead if they are behind the clusters). Media payload
+is never touched, so probing takes about the same time for a 100 MB and a
+100 GB file, no matter where it's stored. Pure Python, no platform code.
+
+The result is a dict with 'format', 'duration' (seconds) and 'tracks', a list
+of dicts with 'type' ('video', 'audio', 'subtitle' or the handler), 'codec',
+'language' and, depending on the type, 'width', 'height', 'fps', 'channels'
+and 'sample_rate'. Matroska results also have 'cues', the number of cue points.
+
+read_index() returns the keyframe and frame timestamps of the first video
+track, from the MP4 sample tables (stts, ctts, stss, edit list) or from the
+Matroska Cues and the track's default frame duration.
+'''
+
+from array import array
+from itertools import accumulate, repeat
+import mmap
+import os
+import struct
+
+__all__ = ['probe', 'read_index', 'format_infos']
+
+CODEC_NAMES = {
+    'avc1': 'H.264', 'avc3': 'H.264', 'hvc1': 'H.265', 'hev1': 'H.265', 'av01': 'AV1', 'vp09': 'VP9',
+    'mp4v': 'MPEG-4 Visual', 'mp4a': 'AAC', 'ac-3': 'AC-3', 'ec-3': 'E-AC-3', 'Opus': 'Opus', 'fLaC': 'FLAC',
+    '.mp3': 'MP3', 'alac': 'ALAC', 'tx3g': 'Timed Text', 'wvtt': 'WebVTT',
+    'V_MPEG4/ISO/AVC': 'H.264', 'V_MPEGH/ISO/HEVC': 'H.265', 'V_AV1': 'AV1', 'V_VP8': 'VP8', 'V_VP9': 'VP9',
+    'V_MPEG2': 'MPEG-2 Video', 'A_AAC': 'AAC', 'A_AC3': 'AC-3', 'A_EAC3': 'E-AC-3', 'A_DTS': 'DTS',
+    'A_OPUS': 'Opus', 'A_VORBIS': 'Vorbis', 'A_FLAC': 'FLAC', 'A_MPEG/L3': 'MP3', 'S_TEXT/UTF8': 'SRT',
+    'S_TEXT/ASS': 'ASS', 'S_HDMV/PGS': 'PGS', 'S_VOBSUB': 'VobSub',
+}
+
+TRACK_LABELS = {
+    'codec': 'Codec', 'language': 'Language', 'width': 'Width', 'height': 'Height', 'fps': 'Frame rate',
+    'channels': 'Channels', 'sample_rate': 'Sampling rate',
+}
+
+MP4_HANDLERS = {'vide': 'video', 'soun': 'audio', 'sbtl': 'subtitle', 'subt': 'subtitle', 'text': 'subtitle'}
+MKV_TRACK_TYPES = {1: 'video', 2: 'audio', 17: 'subtitle'}
+
+# Matroska element ids
+EBML = 0x1A45DFA3
+DOC_TYPE = 0x4282
+SEGMENT = 0x18538067
+SEEK_HEAD = 0x114D9B74
+SEEK = 0x4DBB
+SEEK_ID = 0x53AB
+SEEK_POSITION = 0x53AC
+INFO = 0x1549A966
+TIMECODE_SCALE = 0x2AD7B1
+DURATION = 0x4489
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_NUMBER = 0xD7
+TRACK_TYPE = 0x83
+CODEC_ID = 0x86
+LANGUAGE = 0x22B59C
+DEFAULT_DURATION = 0x23E383
+VIDEO = 0xE0
+PIXEL_WIDTH = 0xB0
+PIXEL_HEIGHT = 0xBA
+AUDIO = 0xE1
+SAMPLING_FREQUENCY = 0xB5
+CHANNELS = 0x9F
+CUES = 0x1C53BB6B
+CUE_POINT = 0xBB
+CUE_TIME = 0xB3
+CUE_TRACK_POSITIONS = 0xB7
+CUE_TRACK = 0xF7
+CLUSTER = 0x1F43B675
+
+
+########################################
+# returns dict of container infos of file at path, or None if it isn't a
+# (readable) MP4/MOV or Matroska file; with cues=False, Matroska cue points
+# aren't counted (walking them is most of the time spent on large files)
+########################################
+def probe(path, cues=True):
+    return _read(path, _probe_mp4, lambda mm: _probe_matroska(mm, cues))
+
+
+########################################
+# returns dict with 'keyframes' (array of sorted presentation times in seconds)
+# and 'frames' (the same for all frames, MP4) or 'frame_duration' (seconds,
+# Matroska), or None if the file has no video track
+########################################
+def read_index(path):
+    return _read(path, _index_mp4, _index_matroska)
+
+
+########################################
+# returns multi-line text (like mediainfo's) of infos returned by probe()
+########################################
+def format_infos(infos):
+    lines = ['General', f'{"Format":<20}: {infos["format"]}']
+    if infos['duration']:
+        lines.append(f'{"Duration":<20}: {infos["duration"]:.3f} s')
+    if 'cues' in infos:
+        lines.append(f'{"Cue points":<20}: {infos["cues"]}')
+    for i, track in enumerate(infos['tracks']):
+        lines += ['', f'{track["type"].capitalize()} #{i + 1}']
+        for key, label in TRACK_LABELS.items():
+            if track.get(key):
+                value = f'{track[key]:.3f}' if key == 'fps' else track[key]
+                lines.append(f'{label:<20}: {value}')
+    return '\n'.join(lines)
+
+
+########################################
+# maps file and passes it to read_mp4 or read_matroska
+########################################
+def _read(path, read_mp4, read_matroska):
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < 16:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:4] == b'\x1a\x45\xdf\xa3':
+                    return read_matroska(mm)
+                if mm[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+                    return read_mp4(mm)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        print('containerprobe: reading failed:', e)
+    return None
+
+
+########################################
+# MP4/MOV
+########################################
+
+########################################
+# yields (type, payload start, end) of boxes between start and end
+########################################
+def _boxes(mm, start, end):
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', mm, pos)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', mm, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type.decode('latin-1'), pos + header, pos + size
+        pos += size
+
+
+########################################
+# returns (payload start, end) of first box at path (list of types) or None
+########################################
+def _find_box(mm, start, end, path):
+    for box_type, payload, box_end in _boxes(mm, start, end):
+        if box_type == path[0]:
+            return (payload, box_end) if len(path) == 1 else _find_box(mm, payload, box_end, path[1:])
+    return None
+
+
+########################################
+#
+########################################
+def _probe_mp4(mm):
+    moov = _find_box(mm, 0, len(mm), ['moov'])
+    if moov is None:
+        return None
+    infos = {'format': 'MPEG-4', 'duration': 0, 'tracks': []}
+    mvhd = _find_box(mm, *moov, ['mvhd'])
+    if mvhd:
+        p = mvhd[0]
+        if mm[p] == 1:
+            timescale, duration = struct.unpack_from('>IQ', mm, p + 20)
+        else:
+            timescale, duration = struct.unpack_from('>II', mm, p + 12)
+        if timescale:
+            infos['duration'] = duration / timescale
+    for box_type, payload, end in _boxes(mm, *moov):
+        if box_type == 'trak':
+            track = _mp4_track(mm, payload, end)
+            if track is not None:
+                infos['tracks'].append(track)
+    return infos
+
+
+########################################
+#
+########################################
+def _mp4_track(mm, start, end):
+    hdlr = _find_box(mm, start, end, ['mdia', 'hdlr'])
+    mdhd = _find_box(mm, start, end, ['mdia', 'mdhd'])
+    stbl = _find_box(mm, start, end, ['mdia', 'minf', 'stbl'])
+    if hdlr is None or mdhd is None or stbl is None:
+        return None
+    handler = bytes(mm[hdlr[0] + 8:hdlr[0] + 12]).decode('latin-1')
+    track = {'type': MP4_HANDLERS.get(handler, handler)}
+
+    p = mdhd[0]
+    if mm[p] == 1:
+        timescale, duration, language = struct.unpack_from('>IQH', mm, p + 20)
+    else:
+        timescale, duration, language = struct.unpack_from('>IIH', mm, p + 12)
+    # packed ISO 639-2/T code, 3 x 5 bits
+    if language and language != 0x7FFF:
+        track['language'] = ''.join(chr(((language >> shift) & 0x1F) + 0x60) for shift in (10, 5, 0))
+
+    stsd = _find_box(mm, *stbl, ['stsd'])
+    if stsd and struct.unpack_from('>I', mm, stsd[0] + 4)[0] > 0:
+        entry = stsd[0] + 8
+        fourcc = bytes(mm[entry + 4:entry + 8]).decode('latin-1')
+        track['codec'] = CODEC_NAMES.get(fourcc, fourcc)
+        if track['type'] == 'video':
+            track['width'], track['height'] = struct.unpack_from('>HH', mm, entry + 32)
+        elif track['type'] == 'audio':
+            track['channels'] = struct.unpack_from('>H', mm, entry + 24)[0]
+            track['sample_rate'] = struct.unpack_from('>I', mm, entry + 32)[0] >> 16
+
+    if track['type'] == 'video' and timescale:
+        stts = _find_box(mm, *stbl, ['stts'])
+        if stts:
+            count = struct.unpack_from('>I', mm, stts[0] + 4)[0]
+            samples = total = 0
+            for sample_count, delta in struct.iter_unpack('>II', mm[stts[0] + 8:stts[0] + 8 + 8 * count]):
+                samples += sample_count
+                total += sample_count * delta
+            if total:
+                track['fps'] = samples * timescale / total
+    return track
+
+
+########################################
+# returns table of box as list of tuples (format without the entry count)
+########################################
+def _table(mm, box, fmt):
+    count = struct.unpack_from('>I', mm, box[0] + 4)[0]
+    size = struct.calcsize(fmt)
+    return list(struct.iter_unpack(fmt, mm[box[0] + 8:box[0] + 8 + size * count]))
+
+
+########################################
+#
+########################################
+def _index_mp4(mm):
+    moov = _find_box(mm, 0, len(mm), ['moov'])
+    if moov is None:
+        return None
+    for box_type, start, end in _boxes(mm, *moov):
+        if box_type != 'trak':
+            continue
+        hdlr = _find_box(mm, start, end, ['mdia', 'hdlr'])
+        if hdlr is None or mm[hdlr[0] + 8:hdlr[0] + 12] != b'vide':
+            continue
+        mdhd = _find_box(mm, start, end, ['mdia', 'mdhd'])
+        stbl = _find_box(mm, start, end, ['mdia', 'minf', 'stbl'])
+        stts = stbl and _find_box(mm, *stbl, ['stts'])
+        if mdhd is None or not stts:
+            return None
+        timescale = struct.unpack_from('>I', mm, mdhd[0] + (20 if mm[mdhd[0]] == 1 else 12))[0]
+        # decode times, from runs of (sample count, delta)
+        deltas = []
+        for sample_count, delta in _table(mm, stts, '>II'):
+            deltas.extend(repeat(delta, sample_count))
+        times = list(accumulate(deltas[:-1], initial=0))
+        # composition offsets (B-frames)
+        ctts = _find_box(mm, *stbl, ['ctts'])
+        if ctts:
+            i = 0
+            for sample_count, offset in _table(mm, ctts, '>Ii' if mm[ctts[0]] == 1 else '>II'):
+                if offset >= 0x80000000:
+                    offset -= 0x100000000
+                for j in range(i, min(i + sample_count, len(times))):
+                    times[j] += offset
+                i += sample_count
+        # the first edit's media time is presentation time 0
+        shift = 0
+        elst = _find_box(mm, start, end, ['edts', 'elst'])
+        if elst:
+            version = mm[elst[0]]
+            for entry in _table(mm, elst, '>QqI' if version == 1 else '>IiI'):
+                if entry[1] >= 0:
+                    shift = entry[1]
+                    break
+        # sync samples (1-based), all samples are keyframes without stss
+        stss = _find_box(mm, *stbl, ['stss'])
+        sync = [n - 1 for n, in _table(mm, stss, '>I')] if stss else range(len(times))
+        return {
+            'keyframes': array('d', sorted((times[n] - shift) / timescale for n in sync if n < len(times))),
+            'frames': array('d', sorted((t - shift) / timescale for t in times)),
+        }
+    return None
+
+
+########################################
+# Matroska/WebM
+########################################
+
+########################################
+# returns (value, length) of variable size integer at pos, the length marker
+# is kept for ids, value is None for unknown sizes
+########################################
+def _vint(mm, pos, is_id=False):
+    first = mm[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError('invalid EBML integer')
+    value = int.from_bytes(mm[pos:pos + length], 'big')
+    if is_id:
+        return value, length
+    value &= (1 << (7 * length)) - 1
+    return (None if value == (1 << (7 * length)) - 1 else value), length
+
+
+########################################
+# returns (id, data start, data end) of element at pos, elements of unknown size
+# end at end
+########################################
+def _element(mm, pos, end):
+    element_id, id_length = _vint(mm, pos, True)
+    size, size_length = _vint(mm, pos + id_length)
+    data = pos + id_length + size_length
+    return element_id, data, end if size is None else min(data + size, end)
+
+
+########################################
+# yields (id, data start, data end) of elements between start and end
+########################################
+def _elements(mm, start, end):
+    pos = start
+    while pos < end:
+        element = _element(mm, pos, end)
+        yield element
+        pos = element[2]
+
+
+########################################
+#
+########################################
+def _uint(mm, start, end):
+    return int.from_bytes(mm[start:end], 'big')
+
+
+########################################
+#
+########################################
+def _float(mm, start, end):
+    return struct.unpack_from('>f' if end - start == 4 else '>d', mm, start)[0]
+
+
+########################################
+#
+########################################
+def _string(mm, start, end):
+    return bytes(mm[start:end]).rstrip(b'\0').decode('utf-8', 'replace')
+
+
+########################################
+#
+########################################
+def _probe_matroska(mm, cues=True):
+    res = _matroska_segment(mm)
+    if res is None:
+        return None
+    doc_type, found = res
+    infos = {'format': 'WebM' if doc_type == 'webm' else 'Matroska', 'duration': 0, 'tracks': []}
+    if INFO in found:
+        timecode_scale, duration = _matroska_info(mm, found[INFO])
+        infos['duration'] = duration * timecode_scale / 1e9
+    if TRACKS in found:
+        for child_id, start, end in _elements(mm, *found[TRACKS]):
+            if child_id == TRACK_ENTRY:
+                infos['tracks'].append(_matroska_track(mm, start, end))
+    if cues and CUES in found:
+        infos['cues'] = sum(1 for child_id, start, end in _elements(mm, *found[CUES]) if child_id == CUE_POINT)
+    return infos
+
+
+########################################
+#
+########################################
+def _index_matroska(mm):
+    res = _matroska_segment(mm)
+    if res is None or TRACKS not in res[1]:
+        return None
+    doc_type, found = res
+    timecode_scale = _matroska_info(mm, found[INFO])[0] if INFO in found else 1000000
+    video = None
+    for child_id, start, end in _elements(mm, *found[TRACKS]):
+        if child_id == TRACK_ENTRY:
+            track = _matroska_track(mm, start, end)
+            if track['type'] == 'video':
+                video = track
+                break
+    if video is None:
+        return None
+    keyframes = array('d')
+    if CUES in found:
+        for child_id, start, end in _elements(mm, *found[CUES]):
+            if child_id != CUE_POINT:
+                continue
+            cue_time = None
+            tracks = set()
+            for cue_id, cue_start, cue_end in _elements(mm, start, end):
+                if cue_id == CUE_TIME:
+                    cue_time = _uint(mm, cue_start, cue_end)
+                elif cue_id == CUE_TRACK_POSITIONS:
+                    for position_id, position_start, position_end in _elements(mm, cue_start, cue_end):
+                        if position_id == CUE_TRACK:
+                            tracks.add(_uint(mm, position_start, position_end))
+            # cue points without track positions are accepted for any track
+            if cue_time is not None and (not tracks or video.get('number') in tracks):
+                keyframes.append(cue_time * timecode_scale / 1e9)
+    return {
+        'keyframes': array('d', sorted(keyframes)),
+        'frame_duration': 1 / video['fps'] if video.get('fps') else 0,
+    }
+
+
+########################################
+# returns (doc type, dict id: (data start, end) of the segment's top level
+# elements) or None
+########################################
+def _matroska_segment(mm):
+    element_id, start, end = _element(mm, 0, len(mm))
+    doc_type = 'matroska'
+    for child_id, child_start, child_end in _elements(mm, start, end):
+        if child_id == DOC_TYPE:
+            doc_type = _string(mm, child_start, child_end)
+
+    element_id, segment, segment_end = _element(mm, end, len(mm))
+    if element_id != SEGMENT:
+        return None
+    # top level elements up to the first cluster, the others via the seek head
+    found = {}
+    seek_positions = {}
+    for element_id, start, end in _elements(mm, segment, segment_end):
+        if element_id == CLUSTER:
+            break
+        found.setdefault(element_id, (start, end))
+        if element_id == SEEK_HEAD:
+            seek_positions.update(_seek_head(mm, start, end, segment))
+    for element_id in (INFO, TRACKS, CUES):
+        if element_id not in found and element_id in seek_positions and seek_positions[element_id] < len(mm):
+            child_id, start, end = _element(mm, seek_positions[element_id], segment_end)
+            if child_id == element_id:
+                found[element_id] = (start, end)
+    return doc_type, found
+
+
+########################################
+# returns (timecode scale, duration in timecode scale units) of Info element
+########################################
+def _matroska_info(mm, info):
+    timecode_scale = 1000000
+    duration = 0
+    for child_id, start, end in _elements(mm, *info):
+        if child_id == TIMECODE_SCALE:
+            timecode_scale = _uint(mm, start, end)
+        elif child_id == DURATION:
+            duration = _float(mm, start, end)
+    return timecode_scale, duration
+
+
+########################################
+# returns dict id: absolute position of seek head entries
+########################################
+def _seek_head(mm, start, end, segment):
+    res = {}
+    for child_id, child_start, child_end in _elements(mm, start, end):
+        if child_id != SEEK:
+            continue
+        seek_id = position = None
+        for entry_id, entry_start, entry_end in _elements(mm, child_start, child_end):
+            if entry_id == SEEK_ID:
+                seek_id = _uint(mm, entry_start, entry_end)
+            elif entry_id == SEEK_POSITION:
+                position = _uint(mm, entry_start, entry_end)
+        if seek_id is not None and position is not None:
+            res[seek_id] = segment + position
+    return res
+
+
+########################################
+#
+########################################
+def _matroska_track(mm, start, end):
+    track = {'type': 'unknown', 'language': 'eng'}
+    for child_id, child_start, child_end in _elements(mm, start, end):
+        if child_id == TRACK_NUMBER:
+            track['number'] = _uint(mm, child_start, child_end)
+        elif child_id == TRACK_TYPE:
+            track_type = _uint(mm, child_start, child_end)
+            track['type'] = MKV_TRACK_TYPES.get(track_type, str(track_type))
+        elif child_id == CODEC_ID:
+            codec = _string(mm, child_start, child_end)
+            track['codec'] = CODEC_NAMES.get(codec, codec)
+        elif child_id == LANGUAGE:
+            track['language'] = _string(mm, child_start, child_end)
+        elif child_id == DEFAULT_DURATION:
+            # ns per frame
+            frame_duration = _uint(mm, child_start, child_end)
+            if frame_duration:
+                track['fps'] = 1e9 / frame_duration
+        elif child_id == VIDEO:
+            for video_id, video_start, video_end in _elements(mm, child_start, child_end):
+                if video_id == PIXEL_WIDTH:
+                    track['width'] = _uint(mm, video_start, video_end)
+                elif video_id == PIXEL_HEIGHT:
+                    track['height'] = _uint(mm, video_start, video_end)
+        elif child_id == AUDIO:
+            for audio_id, audio_start, audio_end in _elements(mm, child_start, child_end):
+                if audio_id == SAMPLING_FREQUENCY:
+                    track['sample_rate'] = int(_float(mm, audio_start, audio_end))
+                elif audio_id == CHANNELS:
+                    track['channels'] = _uint(mm, audio_start, audio_end)
+    return track
+
+
+if __name__ == '__main__':
+    # benchmark: probing a corpus of sample files (the files passed on the command line,
+    # or generated ones with sparse payloads of 64 MB to 16 GB, moov/Cues at the end),
+    # compared with mediainfo if it's in resources or on PATH
+    import shutil, subprocess, sys, tempfile, time
+
+    def _box(box_type, *payloads):
+        data = b''.join(payloads)
+        return struct.pack('>I4s', 8 + len(data), box_type.encode()) + data
+
+    def _mp4_moov(duration, width, height, fps):
+        timescale = 90000
+        frames = int(duration * fps)
+        video = _box('trak',
+            _box('tkhd', bytes(84)),
+            _box('mdia',
+                _box('mdhd', struct.pack('>I8xIIH2x', 0, timescale, int(duration * timescale), 0x15C7)),
+                _box('hdlr', struct.pack('>I4s4s12x', 0, b'\0\0\0\0', b'vide'), b'Video\0'),
+                _box('minf', _box('stbl',
+                    _box('stsd', struct.pack('>II', 0, 1), _box('avc1', bytes(24), struct.pack('>HH', width, height),
+                            bytes(50))),
+                    _box('stts', struct.pack('>III', 0, 1, frames), struct.pack('>I', int(timescale / fps)))))))
+        audio = _box('trak',
+            _box('tkhd', bytes(84)),
+            _box('mdia',
+                _box('mdhd', struct.pack('>I8xIIH2x', 0, 48000, int(duration * 48000), 0x15C7)),
+                _box('hdlr', struct.pack('>I4s4s12x', 0, b'\0\0\0\0', b'soun'), b'Audio\0'),
+                _box('minf', _box('stbl',
+                    _box('stsd', struct.pack('>II', 0, 1), _box('mp4a', bytes(8), bytes(8),
+                            struct.pack('>HH4xI', 2, 16, 48000 << 16)))))))
+        return _box('moov', _box('mvhd', struct.pack('>I8xII', 0, 1000, int(duration * 1000)), bytes(80)), video, audio)
+
+    def _ebml(element_id, *payloads):
+        data = b''.join(payloads)
+        id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big')
+        return id_bytes + (len(data) | (1 << 56)).to_bytes(8, 'big') + data
+
+    def _write_mp4(path, payload, duration):
+        with open(path, 'wb') as f:
+            f.write(_box('ftyp', b'isom\0\0\0\0isomavc1'))
+            f.write(struct.pack('>I4sQ', 1, b'mdat', 16 + payload))
+            f.seek(payload, 1)
+            f.write(_mp4_moov(duration, 1920, 1080, 25))
+
+    def _write_mkv(path, payload, duration):
+        info = _ebml(INFO, _ebml(TIMECODE_SCALE, (1000000).to_bytes(3, 'big')),
+                _ebml(DURATION, struct.pack('>d', duration * 1000)))
+        tracks = _ebml(TRACKS,
+            _ebml(TRACK_ENTRY, _ebml(TRACK_NUMBER, b'\1'), _ebml(TRACK_TYPE, b'\1'), _ebml(CODEC_ID, b'V_MPEGH/ISO/HEVC'),
+                _ebml(DEFAULT_DURATION, (41708333).to_bytes(4, 'big')),
+                _ebml(VIDEO, _ebml(PIXEL_WIDTH, (3840).to_bytes(2, 'big')), _ebml(PIXEL_HEIGHT, (2160).to_bytes(2, 'big')))),
+            _ebml(TRACK_ENTRY, _ebml(TRACK_NUMBER, b'\2'), _ebml(TRACK_TYPE, b'\2'), _ebml(CODEC_ID, b'A_OPUS'),
+                _ebml(LANGUAGE, b'ger'), _ebml(AUDIO, _ebml(SAMPLING_FREQUENCY, struct.pack('>d', 48000.)),
+                _ebml(CHANNELS, b'\6'))))
+        cues = _ebml(CUES, *(_ebml(CUE_POINT, _ebml(0xB3, (i * 2000).to_bytes(4, 'big'))) for i in range(int(duration / 2))))
+        seek_head_size = len(_ebml(SEEK_HEAD, *(_ebml(SEEK, _ebml(SEEK_ID, bytes(4)), _ebml(SEEK_POSITION, bytes(8)))
+                for i in range(3))))
+        cluster = len(_ebml(CLUSTER)) + payload
+        positions = {INFO: seek_head_size, TRACKS: seek_head_size + len(info),
+                CUES: seek_head_size + len(info) + len(tracks) + cluster}
+        seek_head = _ebml(SEEK_HEAD, *(_ebml(SEEK, _ebml(SEEK_ID, element_id.to_bytes(4, 'big')),
+                _ebml(SEEK_POSITION, position.to_bytes(8, 'big'))) for element_id, position in positions.items()))
+        segment = seek_head + info + tracks
+        with open(path, 'wb') as f:
+            f.write(_ebml(EBML, _ebml(DOC_TYPE, b'matroska')))
+            f.write(SEGMENT.to_bytes(4, 'big') + (len(segment) + cluster + len(cues) | (1 << 56)).to_bytes(8, 'big'))
+            f.write(segment)
+            f.write(CLUSTER.to_bytes(4, 'big') + (payload | (1 << 56)).to_bytes(8, 'big'))
+            f.seek(payload, 1)
+            f.write(cues)
+
+    mediainfo = None
+    res_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'resources')
+    for candidate in (os.path.join(res_dir, 'mediainfo.exe' if sys.platform == 'win32' else 'mediainfo'),
+            shutil.which('mediainfo')):
+        if candidate and os.path.isfile(candidate):
+            mediainfo = candidate
+            break
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = sys.argv[1:]
+        if not files:
+            for i, size in enumerate((64, 1024, 16384)):
+                for ext, write in (('mp4', _write_mp4), ('mkv', _write_mkv)):
+                    files.append(os.path.join(tmp_dir, f'sample_{size}.{ext}'))
+                    write(files[-1], size << 20, 600. * (i + 1))
+        total = total_mediainfo = 0
+        for path in files:
+            t = time.perf_counter()
+            infos = probe(path)
+            t_probe = time.perf_counter() - t
+            total += t_probe
+            line = f'{os.path.basename(path):>18} ({os.path.getsize(path) >> 20:5} MB): probe {1000 * t_probe:6.2f} ms'
+            if mediainfo:
+                t = time.perf_counter()
+                subprocess.run([mediainfo, path], capture_output=True)
+                t_mediainfo = time.perf_counter() - t
+                total_mediainfo += t_mediainfo
+                line += f', mediainfo {1000 * t_mediainfo:7.1f} ms'
+            if infos:
+                line += (f'  {infos["format"]}, {infos["duration"]:.0f} s, ' +
+                        ', '.join(f'{track["type"]} {track.get("codec")}' +
+                        (f' {track["width"]}x{track["height"]} {track["fps"]:.3f} fps' if track['type'] == 'video' else '')
+                        for track in infos['tracks']))
+            print(line)
+        print(f'{len(files)} files: probe {1000 * total:.1f} ms' +
+                (f', mediainfo {1000 * total_mediainfo:.0f} ms' if mediainfo else ' (mediainfo not found)'))
+        if not sys.argv[1:]:
+            print()
+            print(format_infos(probe(files[-1])))
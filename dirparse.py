@@ -0,0 +1,201 @@
+'''
+Incremental (expat based) parsers for radio directory responses.
+
+Instead of building a complete DOM, records are emitted as lightweight tuples as
+soon as their element is complete, so the first items can be shown while the rest
+of the response is still arriving:
+
+    genre   -> (name, id)         SHOUTcast genre/primary, genre/secondary
+    station -> (name, id)         SHOUTcast station/advancedsearch
+    channel -> (title, fastpls)   SomaFM channels.xml
+    outline -> (text, URL)        TuneIn OPML (only outlines that have a URL)
+    opml    -> (text, URL, type)  TuneIn OPML incl. outline type ('link', 'audio' or '')
+
+TuneInParser handles TuneIn responses that are either OPML (outline records) or
+a plain list of stream URLs ((None, url) records).
+'''
+
+from xml.parsers import expat
+
+__all__ = ['RECORD_KINDS', 'RecordParser', 'TuneInParser', 'parse_records']
+
+# kind: (element, required attributes, optional attributes)
+_ATTRIBUTE_RECORDS = {
+    'genre': ('genre', ('name', 'id'), ()),
+    'station': ('station', ('name', 'id'), ()),
+    'outline': ('outline', ('text', 'URL'), ()),
+    'opml': ('outline', ('text', 'URL'), ('type',)),
+}
+
+RECORD_KINDS = tuple(_ATTRIBUTE_RECORDS) + ('channel',)
+
+
+class RecordParser():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, kind):
+        if kind not in RECORD_KINDS:
+            raise ValueError(f'unknown record kind: {kind}')
+        self._records = []
+        self._failed = False
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        if kind == 'channel':
+            self._channel = None
+            self._text = None
+            self._parser.StartElementHandler = self.__start_channel_element
+            self._parser.EndElementHandler = self.__end_channel_element
+            self._parser.CharacterDataHandler = self.__character_data
+        else:
+            self._tag, self._attrs, self._optional = _ATTRIBUTE_RECORDS[kind]
+            self._parser.StartElementHandler = self.__start_element
+
+    ########################################
+    #
+    ########################################
+    def __start_element(self, name, attrs):
+        if name == self._tag:
+            try:
+                record = tuple(attrs[a] for a in self._attrs)
+            except KeyError:
+                return
+            if self._optional:
+                record += tuple(attrs.get(a, '') for a in self._optional)
+            self._records.append(record)
+
+    ########################################
+    #
+    ########################################
+    def __start_channel_element(self, name, attrs):
+        if name == 'channel':
+            self._channel = {}
+        elif self._channel is not None and name in ('title', 'fastpls') and name not in self._channel:
+            self._text = []
+
+    ########################################
+    #
+    ########################################
+    def __end_channel_element(self, name):
+        if self._channel is None:
+            return
+        if name == 'channel':
+            if 'title' in self._channel and 'fastpls' in self._channel:
+                self._records.append((self._channel['title'], self._channel['fastpls']))
+            self._channel = None
+        elif self._text is not None and name in ('title', 'fastpls'):
+            self._channel[name] = ''.join(self._text).strip()
+            self._text = None
+
+    ########################################
+    #
+    ########################################
+    def __character_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    ########################################
+    # returns list of records completed by this chunk
+    ########################################
+    def feed(self, data, final=False):
+        if not self._failed:
+            try:
+                self._parser.Parse(data, final)
+            except expat.ExpatError as e:
+                print('dirparse: parsing failed:', e)
+                self._failed = True
+        records, self._records = self._records, []
+        return records
+
+    ########################################
+    #
+    ########################################
+    def close(self):
+        return self.feed(b'', True)
+
+
+class TuneInParser():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self):
+        # True for OPML, False for url list, None until detected
+        self._xml = None
+        self._parser = None
+        self._head = b''
+
+    ########################################
+    # returns list of records completed by this chunk
+    ########################################
+    def feed(self, data, final=False):
+        if self._xml is None:
+            self._head += data
+            head = self._head.lstrip()
+            if not head and not final:
+                return []
+            self._xml = head.startswith(b'<')
+            data, self._head = head, b''
+            if self._xml:
+                self._parser = RecordParser('outline')
+        if self._xml:
+            return self._parser.feed(data, final)
+        self._head += data
+        if not final:
+            return []
+        return [(None, line.strip()) for line in self._head.decode('utf-8', errors='replace').split('\n')
+                if '://' in line]
+
+
+########################################
+#
+########################################
+def parse_records(kind, data):
+    parser = RecordParser(kind)
+    return parser.feed(data, True)
+
+
+if __name__ == '__main__':
+    # benchmark: peak memory and time-to-first-item, minidom vs. RecordParser
+    import time, tracemalloc
+    from xml.dom import minidom
+
+    CHUNK_SIZE = 16384
+
+    def _minidom(data):
+        items = []
+        t0 = time.perf_counter()
+        dom = minidom.parseString(data.decode())
+        for element in dom.getElementsByTagName('station'):
+            items.append((element.attributes['name'].value, element.attributes['id'].value))
+            if len(items) == 1:
+                t_first = time.perf_counter() - t0
+        return items, t_first
+
+    def _streaming(data):
+        items = []
+        t0 = time.perf_counter()
+        t_first = None
+        parser = RecordParser('station')
+        for pos in range(0, len(data), CHUNK_SIZE):
+            items += parser.feed(data[pos:pos + CHUNK_SIZE])
+            if t_first is None and items:
+                t_first = time.perf_counter() - t0
+        items += parser.close()
+        return items, t_first
+
+    for n in (1000, 10000, 50000):
+        data = ('<stationlist><tunein base="/sbin/tunein-station.pls"/>' + ''.join(
+                f'<station name="Station &amp; Radio {i}" mt="audio/mpeg" id="{100000 + i}" br="128" '
+                f'genre="Rock" genre2="Metal" lc="{i % 500}"/>' for i in range(n)) + '</stationlist>').encode()
+        for label, func in (('minidom', _minidom), ('expat', _streaming)):
+            tracemalloc.start()
+            t = time.perf_counter()
+            items, t_first = func(data)
+            t = time.perf_counter() - t
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert len(items) == n
+            print(f'{n:>6} stations, {label:>7}: first item {1000 * t_first:8.2f} ms, '
+                  f'total {1000 * t:8.1f} ms, peak {peak / 2**20:7.1f} MB')
@@ -562,13 +562,14 @@ class Player():
         return self._media_seeking.GetCurrentPosition() / 10000.0
 
     ########################################
-    #
+    # with keyframe=True, seeks to the nearest keyframe (faster)
     ########################################
-    def set_time(self, ms):
+    def set_time(self, ms, keyframe=False):
         if self._media_seeking is None:
             raise Exception('E_NOINTERFACE')
+        flags = AM_SEEKING_AbsolutePositioning | AM_SEEKING_SeekToKeyFrame if keyframe else AM_SEEKING_AbsolutePositioning
         hr, stop_time = self._media_seeking.SetPositions(int(ms*10000),
-                AM_SEEKING_AbsolutePositioning, 0, AM_SEEKING_NoPositioning)
+                flags, 0, AM_SEEKING_NoPositioning)
         return SUCCEEDED(hr)
 
     ########################################
@@ -697,29 +698,7 @@ class Player():
     ########################################
     #
     ########################################
-    def get_metadata(self):
+    def get_filter_graph(self):
         if self._filter_graph is None:
             raise Exception('E_NOINTERFACE')
-        enum = self._filter_graph.EnumFilters()
-        while True:
-            filt, fetched = enum.Next(1)
-            if not fetched:
-                break
-            try:
-                media_content = filt.QueryInterface(IAMMediaContent)
-                res = {}
-                try:
-                    res['author'] = media_content.get_AuthorName()
-                except:
-                    pass
-                try:
-                    res['title'] = media_content.get_Title()
-                except:
-                    pass
-                try:
-                    res['description'] = media_content.get_Description()
-                except:
-                    pass
-                return res
-            except:
-                pass
+        return self._filter_graph
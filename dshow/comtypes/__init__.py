@@ -185,6 +185,20 @@ com_interface_registry = {}
 # allows to find coclasses by guid strings (clsid)
 com_coclass_registry = {}
 
+# precompiled interface descriptors, see use_descriptor_cache
+_descriptor_cache = None
+
+def use_descriptor_cache(path, save_path=None):
+    """Use the COM interface descriptors cached in the file at path when
+    creating deferred interface methods.  New or changed entries are
+    written to save_path (default: path) when Python exits, a valid file
+    at save_path is used instead of path.  Returns the DescriptorCache."""
+    global _descriptor_cache
+    from dshow.comtypes._descriptors import DescriptorCache
+    _descriptor_cache = DescriptorCache(path, save_path)
+    atexit.register(_descriptor_cache.save)
+    return _descriptor_cache
+
 def _is_object(obj):
     """This function determines if the argument is a COM object.  It
     is used in several places to determine whether propputref or
@@ -202,6 +216,9 @@ def _is_object(obj):
 ################################################################
 # The metaclasses...
 
+# name prefixes of propget, propput and propputref methods
+_PROPERTY_PREFIXES = ("_get_", "_set_", "_setref_")
+
 class _cominterface_meta(type):
     """Metaclass for COM interfaces.  Automatically creates high level
     methods from COMMETHOD lists.
@@ -251,6 +268,8 @@ class _cominterface_meta(type):
                 # case insensitive attributes for COM methods and properties
                 def __getattr__(self, name):
                     """Implement case insensitive access to methods and properties"""
+                    if self.__com_interface__._materialize():
+                        return getattr(self, name)
                     try:
                         fixed_name = self.__map_case__[name.lower()]
                     except KeyError:
@@ -267,10 +286,21 @@ class _cominterface_meta(type):
                 # How much faster would this be if implemented in C?
                 def __setattr__(self, name, value):
                     """Implement case insensitive access to methods and properties"""
+                    self.__com_interface__._materialize()
                     object.__setattr__(self,
                                        self.__map_case__.get(name.lower(), name),
                                        value)
 
+        else:
+
+            @patcher.Patch(p)
+            class LazyMethods(object):
+                def __getattr__(self, name):
+                    """Create deferred COM methods on first access"""
+                    if self.__com_interface__._materialize():
+                        return getattr(self, name)
+                    raise AttributeError(name)
+
         @patcher.Patch(POINTER(p))
         class ReferenceFix(object):
             def __setitem__(self, index, value):
@@ -301,7 +331,16 @@ class _cominterface_meta(type):
         return cls
 
     def __setattr__(self, name, value):
+        if name == "_methods_" and callable(value):
+            # A callable returning the methods list defers creating the
+            # methods until they are first used, see _materialize.  The
+            # interface is registered now, so it can be found by iid.
+            com_interface_registry[str(self.__dict__["_iid_"])] = self
+            type.__setattr__(self, "_lazy_methods_", value)
+            return
         if name == "_methods_":
+            # base interfaces may still be deferred
+            self._materialize()
             # XXX I'm no longer sure why the code generator generates
             # "_methods_ = []" in the interface definition, and later
             # overrides this by "Interface._methods_ = [...]
@@ -314,6 +353,35 @@ class _cominterface_meta(type):
             self._make_specials()
         type.__setattr__(self, name, value)
 
+    def _materialize(self):
+        """Create the methods of this interface and its base interfaces that
+        were deferred by assigning a callable to _methods_.  Base interfaces
+        come first, so that the vtable offsets are right.  Returns True if
+        there were any."""
+        pending = [itf for itf in reversed(self.__mro__)
+                   if "_lazy_methods_" in itf.__dict__]
+        for itf in pending:
+            func = itf.__dict__["_lazy_methods_"]
+            type.__delattr__(itf, "_lazy_methods_")
+            cached = None
+            if _descriptor_cache is not None:
+                cached = _descriptor_cache.get(itf, func)
+                # a base interface has changed
+                if (cached is not None and
+                        cached[1]["offset"] != itf.__get_baseinterface_methodcount()):
+                    cached = None
+            if cached is None:
+                methods = func()
+                layout = itf._make_layout(methods)
+                if _descriptor_cache is not None:
+                    _descriptor_cache.put(itf, func, methods, layout)
+            else:
+                methods, layout = cached
+            itf._make_methods(methods, layout)
+            itf._make_specials()
+            type.__setattr__(itf, "_methods_", methods)
+        return bool(pending)
+
     def _make_specials(self):
         # This call installs methods that forward the Python protocols
         # to COM protocols.
@@ -646,7 +714,66 @@ class _cominterface_meta(type):
             return rescode
         return call_with_inout
 
-    def _make_methods(self, methods):
+    def _make_layout(self, methods):
+        """Return the metadata derived from a methods list, as plain data so
+        that it can be cached (see _descriptors): the vtable offset, for
+        each method a (property kind, number of property arguments, has
+        [in, out] arguments) tuple, and the case map entries.  The property
+        kind is 0 for propget, 1 for propput, 2 for propputref and None for
+        plain methods."""
+        infos = []
+        map_case = []
+        properties = {}
+        for restype, name, argtypes, paramflags, idlflags, doc in methods:
+            kind = None
+            nargs = 0
+            # see comment in the _fix_inout_args method
+            inout = bool(paramflags) and 3 in [(p[0]&3) for p in paramflags]
+
+            # XXX Hm.  What, when paramflags is None?
+            # Or does have '0' values?
+            # Seems we loose then, at least for properties...
+
+            # The following code assumes that the docstrings for
+            # propget and propput are identical.
+            if "propget" in idlflags:
+                assert name.startswith("_get_")
+                kind = 0
+                nargs = len([flags for flags in paramflags
+                             if flags[0] & 7 in (0, 1)])
+                # XXX or should we do this?
+                # nargs = len([flags for flags in paramflags
+                #             if (flags[0] & 1) or (flags[0] == 0)])
+            elif "propput" in idlflags:
+                assert name.startswith("_set_")
+                kind = 1
+                nargs = len([flags for flags in paramflags
+                              if flags[0] & 7 in (0, 1)]) - 1
+            elif "propputref" in idlflags:
+                assert name.startswith("_setref_")
+                kind = 2
+                nargs = len([flags for flags in paramflags
+                              if flags[0] & 7 in (0, 1)]) - 1
+            infos.append((kind, nargs, inout))
+
+            # COM is case insensitive.
+            #
+            # For a method, this is the real name.  For a property,
+            # this is the name WITHOUT the _set_ or _get_ prefix.
+            map_case.append((name.lower(), name))
+            if kind is not None:
+                map_case.append((name[5:].lower(), name[5:]))
+                properties[name[len(_PROPERTY_PREFIXES[kind]):], doc, nargs] = None
+
+        # COM is case insensitive, also for the public properties
+        for name, doc, nargs in properties:
+            map_case.append((name.lower(), name))
+
+        return {"offset": self.__get_baseinterface_methodcount(),
+                "methods": infos,
+                "map_case": map_case}
+
+    def _make_methods(self, methods, layout=None):
         if self._case_insensitive_:
             self._make_case_insensitive()
 
@@ -667,13 +794,16 @@ class _cominterface_meta(type):
 ##                    warnings.warn(text, UserWarning)
             com_interface_registry[iid] = self
             del iid
-        vtbl_offset = self.__get_baseinterface_methodcount()
+        if layout is None:
+            layout = self._make_layout(methods)
+        vtbl_offset = layout["offset"]
 
         properties = {}
 
         # create private low level, and public high level methods
-        for i, item in enumerate(methods):
+        for i, (item, info) in enumerate(zip(methods, layout["methods"])):
             restype, name, argtypes, paramflags, idlflags, doc = item
+            kind, nargs, inout = info
             # the function prototype
             prototype = WINFUNCTYPE(restype, *argtypes)
 
@@ -694,13 +824,10 @@ class _cominterface_meta(type):
                     "_%s__com_%s" % (self.__name__, name),
                     instancemethod(raw_func, None, self))
 
-            if paramflags:
-                # see comment in the _fix_inout_args method
-                dirflags = [(p[0]&3) for p in paramflags]
-                if 3 in dirflags:
-##                    fullname = "%s::%s" % (self.__name__, name)
-##                    print "FIX %s" % fullname
-                    func = self._fix_inout_args(func, argtypes, paramflags)
+            if inout:
+##                fullname = "%s::%s" % (self.__name__, name)
+##                print "FIX %s" % fullname
+                func = self._fix_inout_args(func, argtypes, paramflags)
 
             # 'func' is a high level function calling the COM method
             func.__doc__ = doc
@@ -713,57 +840,19 @@ class _cominterface_meta(type):
             mth = instancemethod(func, None, self)
 
             # is it a property set or property get?
-            is_prop = False
-
-            # XXX Hm.  What, when paramflags is None?
-            # Or does have '0' values?
-            # Seems we loose then, at least for properties...
-
-            # The following code assumes that the docstrings for
-            # propget and propput are identical.
-            if "propget" in idlflags:
-                assert name.startswith("_get_")
-                nargs = len([flags for flags in paramflags
-                             if flags[0] & 7 in (0, 1)])
-                # XXX or should we do this?
-                # nargs = len([flags for flags in paramflags
-                #             if (flags[0] & 1) or (flags[0] == 0)])
-                propname = name[len("_get_"):]
-                properties.setdefault((propname, doc, nargs), [None, None, None])[0] = func
-                is_prop = True
-            elif "propput" in idlflags:
-                assert name.startswith("_set_")
-                nargs = len([flags for flags in paramflags
-                              if flags[0] & 7 in (0, 1)]) - 1
-                propname = name[len("_set_"):]
-                properties.setdefault((propname, doc, nargs), [None, None, None])[1] = func
-                is_prop = True
-            elif "propputref" in idlflags:
-                assert name.startswith("_setref_")
-                nargs = len([flags for flags in paramflags
-                              if flags[0] & 7 in (0, 1)]) - 1
-                propname = name[len("_setref_"):]
-                properties.setdefault((propname, doc, nargs), [None, None, None])[2] = func
-                is_prop = True
+            if kind is not None:
+                propname = name[len(_PROPERTY_PREFIXES[kind]):]
+                properties.setdefault((propname, doc, nargs), [None, None, None])[kind] = func
 
             # We install the method in the class, except when it's a
             # property accessor.  And we make sure we don't overwrite
             # a property that's already present in the class.
-            if not is_prop:
+            if kind is None:
                 if hasattr(self, name):
                     setattr(self, "_" + name, mth)
                 else:
                     setattr(self, name, mth)
 
-            # COM is case insensitive.
-            #
-            # For a method, this is the real name.  For a property,
-            # this is the name WITHOUT the _set_ or _get_ prefix.
-            if self._case_insensitive_:
-                self.__map_case__[name.lower()] = name
-                if is_prop:
-                    self.__map_case__[name[5:].lower()] = name[5:]
-
         # create public properties / attribute accessors
         for (name, doc, nargs), methods in list(properties.items()):
             # methods contains [propget or None, propput or None, propputref or None]
@@ -802,9 +891,8 @@ class _cominterface_meta(type):
             else:
                 setattr(self, name, prop)
 
-            # COM is case insensitive
-            if self._case_insensitive_:
-                self.__map_case__[name.lower()] = name
+        if self._case_insensitive_:
+            self.__map_case__.update(layout["map_case"])
 
 
 ################################################################
@@ -1132,6 +1220,7 @@ class IUnknown(object, metaclass=_cominterface_meta):
 
     def QueryInterface(self, interface, iid=None):
         "QueryInterface(interface) -> instance"
+        interface._materialize()
         p = POINTER(interface)()
         if iid is None:
             iid = interface._iid_
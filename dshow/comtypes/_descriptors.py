@@ -0,0 +1,202 @@
+# comtypes._descriptors helper module
+"""Precompiled COM interface descriptors.
+
+Interfaces in dshow.lib assign their _methods_ as a callable returning the
+COMMETHOD list, which is evaluated when the interface is first used (see
+_cominterface_meta._materialize).  A DescriptorCache keeps the evaluated
+method tables together with the metadata derived from them (vtable offset,
+property kinds, [in, out] masks, case map, see _cominterface_meta._make_layout)
+in a single marshal file, so neither the COMMETHOD lists nor the metadata have
+to be computed again on the next start.  The file is read at once, entries
+are only unmarshaled when their interface is used.
+
+ctypes types are stored in a table shared by all entries, by the name they
+have in the module defining the interface, or structurally for pointer and
+array types, and are looked up again when they are first needed.  Each entry
+carries a fingerprint of the _methods_ callable's code, an entry that doesn't
+match the source definition anymore is ignored and replaced.  The whole file
+is discarded if it was written by another CACHE_VERSION or Python version.
+
+A cache can be read from a bundled file and written to another one, e.g. in
+the user's cache directory, which is preferred on the next start.
+"""
+import _ctypes
+import ctypes
+import hashlib
+import logging
+import marshal
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# types of values that can be stored in paramflags and idlflags
+_PLAIN_TYPES = (bool, int, float, str, bytes)
+
+
+def fingerprint(func):
+    "Return a fingerprint of the code of a _methods_ callable"
+    code = func.__code__
+    return hashlib.sha1(marshal.dumps((code.co_code, code.co_consts, code.co_names))).hexdigest()
+
+
+def _plain(value):
+    # marshal only stores exact builtin types, e.g. helpstring becomes str
+    if value is None:
+        return None
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    for typ in _PLAIN_TYPES:
+        if isinstance(value, typ):
+            return typ(value)
+    raise ValueError("can't store %r" % (value,))
+
+
+class DescriptorCache(object):
+    """Method tables and derived metadata of COM interfaces, stored in the
+    file at path, or read from the file at path and written to the one at
+    save_path (read instead of path if it exists and is valid)"""
+
+    def __init__(self, path, save_path=None):
+        self.path = path
+        self.save_path = save_path or path
+        self.dirty = False
+        # encoded types: ("name", module, name), ("pointer", index) or
+        # ("array", index, length)
+        self._types = []
+        # decoded types by index, None if not decoded yet
+        self._decoded = []
+        # encoded type: index
+        self._indexes = {}
+        # "module.Interface": (fingerprint, marshaled methods and layout)
+        self._entries = {}
+        # module name: {type: name}
+        self._names = {}
+        for fn in dict.fromkeys((self.save_path, path)):
+            if self._load(fn):
+                break
+
+    def _load(self, path):
+        "Read the cache file at path, return True if it was valid"
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            version, types, entries = marshal.loads(data)
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            logger.warning("reading descriptor cache %s failed: %s", path, err)
+            return False
+        if version != (CACHE_VERSION, tuple(sys.version_info[:2])):
+            return False
+        self._types = list(types)
+        self._decoded = [None] * len(types)
+        self._indexes = {data: index for index, data in enumerate(types)}
+        self._entries = entries
+        return True
+
+    def get(self, itf, func):
+        """Return (methods, layout) of interface itf whose _methods_ callable
+        is func, or None if there is no entry or it's stale"""
+        entry = self._entries.get("%s.%s" % (itf.__module__, itf.__name__))
+        if entry is None or entry[0] != fingerprint(func):
+            return None
+        typ = self._type
+        try:
+            encoded, layout = marshal.loads(entry[1])
+            methods = [(restype if restype is None else typ(restype), name,
+                        tuple([typ(index) for index in argtypes]),
+                        paramflags, idlflags, doc)
+                       for restype, name, argtypes, paramflags, idlflags, doc in encoded]
+        except (KeyError, AttributeError, TypeError, ValueError, EOFError, IndexError):
+            # a type was removed or renamed
+            return None
+        return methods, layout
+
+    def put(self, itf, func, methods, layout):
+        "Store methods and layout of interface itf whose _methods_ callable is func"
+        module = itf.__module__
+        try:
+            encoded = []
+            for restype, name, argtypes, paramflags, idlflags, doc in methods:
+                encoded.append((None if restype is None else self._index(restype, module), name,
+                                tuple(self._index(typ, module) for typ in argtypes),
+                                _plain(paramflags), _plain(idlflags), _plain(doc)))
+        except (ValueError, TypeError, AttributeError) as err:
+            # e.g. a ctypes instance as default value, the interface is
+            # always created from its source definition
+            logger.debug("not caching %s: %s", itf.__name__, err)
+            return
+        self._entries["%s.%s" % (module, itf.__name__)] = (fingerprint(func),
+                                                         marshal.dumps((encoded, layout)))
+        self.dirty = True
+
+    def save(self):
+        "Write the cache file if there are new entries"
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.save_path)), exist_ok=True)
+            with open(self.save_path + ".tmp", "wb") as f:
+                marshal.dump(((CACHE_VERSION, tuple(sys.version_info[:2])), self._types, self._entries), f)
+            os.replace(self.save_path + ".tmp", self.save_path)
+        except OSError as err:
+            # e.g. installed to a read-only location
+            logger.warning("writing descriptor cache %s failed: %s", self.save_path, err)
+            return
+        self.dirty = False
+
+    def _type(self, index):
+        typ = self._decoded[index]
+        if typ is None:
+            data = self._types[index]
+            if data[0] == "name":
+                typ = getattr(sys.modules[data[1]], data[2])
+            elif data[0] == "pointer":
+                typ = ctypes.POINTER(self._type(data[1]))
+            else:
+                typ = self._type(data[1]) * data[2]
+            self._decoded[index] = typ
+        return typ
+
+    def _index(self, typ, module):
+        # returns table index of typ, by its name in module if it has one
+        names = self._names.get(module)
+        if names is None:
+            names = self._names[module] = {}
+            for name, value in vars(sys.modules[module]).items():
+                if isinstance(value, type) and not name.startswith("__"):
+                    names.setdefault(value, name)
+        if typ in names:
+            data = ("name", module, names[typ])
+        elif "__com_interface__" in typ.__dict__:
+            data = ("pointer", self._index(typ.__com_interface__, module))
+        elif issubclass(typ, _ctypes._Pointer):
+            data = ("pointer", self._index(typ._type_, module))
+        elif issubclass(typ, ctypes.Array):
+            data = ("array", self._index(typ._type_, module), typ._length_)
+        elif getattr(sys.modules.get(typ.__module__), typ.__name__, None) is typ:
+            data = ("name", typ.__module__, typ.__name__)
+        else:
+            raise ValueError("can't store type %r" % typ)
+        index = self._indexes.get(data)
+        if index is None:
+            index = self._indexes[data] = len(self._types)
+            self._types.append(data)
+            self._decoded.append(typ)
+        return index
+
+
+if __name__ == "__main__":
+    # Writes the descriptor cache of all interfaces in dshow.lib to the
+    # path passed, used when building the frozen app
+    import dshow.comtypes
+    import dshow.lib
+
+    cache = dshow.comtypes.use_descriptor_cache(sys.argv[1])
+    for value in list(vars(dshow.lib).values()):
+        if isinstance(value, dshow.comtypes._cominterface_meta):
+            value._materialize()
+    cache.save()
@@ -37,7 +37,7 @@ class IBaseFilter(IMediaFilter):
     _case_insensitive_ = True
     _iid_ = GUID('{56A86895-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IFilterChain._methods_ = [
+IFilterChain._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'StartChain',
               ( ['in'], POINTER(IBaseFilter), 'pStartFilter' ),
               ( ['in'], POINTER(IBaseFilter), 'pEndFilter' )),
@@ -59,7 +59,7 @@ class IDVEnc(IUnknown):
 class __MIDL___MIDL_itf_DirectShow_0345_0001(Structure):
     pass
 DVINFO = __MIDL___MIDL_itf_DirectShow_0345_0001
-IDVEnc._methods_ = [
+IDVEnc._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_IFormatResolution',
               ( ['out'], POINTER(c_int), 'VideoFormat' ),
               ( ['out'], POINTER(c_int), 'DVFormat' ),
@@ -78,7 +78,7 @@ class IRegisterServiceProvider(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{7B3A2F01-0751-48DD-B556-004785171C54}')
     _idlflags_ = []
-IRegisterServiceProvider._methods_ = [
+IRegisterServiceProvider._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RegisterService',
               ( ['in'], POINTER(GUID), 'guidService' ),
               ( ['in'], POINTER(IUnknown), 'punkObject' )),
@@ -102,7 +102,7 @@ class IEnumString(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{00000101-0000-0000-C000-000000000046}')
     _idlflags_ = []
-IBindCtx._methods_ = [
+IBindCtx._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RegisterObjectBound',
               ( ['in'], POINTER(IUnknown), 'punk' )),
     COMMETHOD([], HRESULT, 'RevokeObjectBound',
@@ -131,7 +131,7 @@ class IVMRAspectRatioControl(IUnknown):
     'IVMRAspectRatioControl Interface'
     _iid_ = GUID('{EDE80B5C-BAD6-4623-B537-65586C9F8DFD}')
     _idlflags_ = []
-IVMRAspectRatioControl._methods_ = [
+IVMRAspectRatioControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetAspectRatioMode',
               ( ['out'], POINTER(c_ulong), 'lpdwARMode' )),
     COMMETHOD([], HRESULT, 'SetAspectRatioMode',
@@ -144,7 +144,7 @@ class IAMStreamConfig(IUnknown):
     _idlflags_ = []
 class _AMMediaType(Structure):
     pass
-IAMStreamConfig._methods_ = [
+IAMStreamConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetFormat',
               ( ['in'], POINTER(_AMMediaType), 'pmt' )),
     COMMETHOD([], HRESULT, 'GetFormat',
@@ -222,7 +222,7 @@ class IMediaSample2(IMediaSample):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73884-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-IMediaSample._methods_ = [
+IMediaSample._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetPointer',
               ( ['out'], POINTER(POINTER(c_ubyte)), 'ppBuffer' )),
     COMMETHOD([], c_int, 'GetSize'),
@@ -256,7 +256,7 @@ IMediaSample._methods_ = [
               ( ['in'], POINTER(c_longlong), 'pTimeEnd' )),
 ]
 
-IMediaSample2._methods_ = [
+IMediaSample2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetProperties',
               ( ['in'], c_ulong, 'cbProperties' ),
               ( ['out'], POINTER(c_ubyte), 'pbProperties' )),
@@ -269,7 +269,7 @@ class IConfigAviMux(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{5ACD6AA0-F482-11CE-8B67-00AA00A3F1A6}')
     _idlflags_ = []
-IConfigAviMux._methods_ = [
+IConfigAviMux._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetMasterStream',
               ( ['in'], c_int, 'IStream' )),
     COMMETHOD([], HRESULT, 'GetMasterStream',
@@ -284,7 +284,7 @@ class IAMOverlayFX(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{62FAE250-7E65-4460-BFC9-6398B322073C}')
     _idlflags_ = []
-IAMOverlayFX._methods_ = [
+IAMOverlayFX._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'QueryOverlayFXCaps',
               ( ['out'], POINTER(c_ulong), 'lpdwOverlayFXCaps' )),
     COMMETHOD([], HRESULT, 'SetOverlayFX',
@@ -305,7 +305,7 @@ class IReferenceClock(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A86897-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IReferenceClock._methods_ = [
+IReferenceClock._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetTime',
               ( ['out'], POINTER(c_longlong), 'pTime' )),
     COMMETHOD([], HRESULT, 'AdviseTime',
@@ -337,7 +337,7 @@ class IKsPropertySet(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{31EFAC30-515C-11D0-A9AA-00AA0061BE93}')
     _idlflags_ = []
-IKsPropertySet._methods_ = [
+IKsPropertySet._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteSet',
               ( ['in'], POINTER(GUID), 'guidPropSet' ),
               ( ['in'], c_ulong, 'dwPropID' ),
@@ -363,7 +363,7 @@ class IPinConnection(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{4A9A62D3-27D4-403D-91E9-89F540E55534}')
     _idlflags_ = []
-IPinConnection._methods_ = [
+IPinConnection._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'DynamicQueryAccept',
               ( ['in'], POINTER(_AMMediaType), 'pmt' )),
     COMMETHOD([], HRESULT, 'NotifyEndOfStream',
@@ -377,7 +377,7 @@ class IVPManager(IUnknown):
     'IVPManager Interface'
     _iid_ = GUID('{AAC18C18-E186-46D2-825D-A1F8DC8E395A}')
     _idlflags_ = []
-IVPManager._methods_ = [
+IVPManager._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetVideoPortIndex',
               ( ['in'], c_ulong, 'dwVideoPortIndex' )),
     COMMETHOD([], HRESULT, 'GetVideoPortIndex',
@@ -394,7 +394,7 @@ class IMediaPropertyBag(IPropertyBag):
     _case_insensitive_ = True
     _iid_ = GUID('{6025A880-C0D5-11D0-BD4E-00A0C911CE86}')
     _idlflags_ = []
-IMediaPropertyBag._methods_ = [
+IMediaPropertyBag._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'EnumProperty',
               ( ['in'], c_ulong, 'iProperty' ),
               ( ['in', 'out'], POINTER(VARIANT), 'pvarPropertyName' ),
@@ -454,7 +454,7 @@ class IVMRVideoStreamControl(IUnknown):
     _iid_ = GUID('{058D1F11-2A54-4BEF-BD54-DF706626B727}')
     _idlflags_ = []
 DDCOLORKEY = __MIDL___MIDL_itf_DirectShow_0370_0001
-IVMRVideoStreamControl._methods_ = [
+IVMRVideoStreamControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetColorKey',
               ( ['in'], POINTER(DDCOLORKEY), 'lpClrKey' )),
     COMMETHOD([], HRESULT, 'GetColorKey',
@@ -494,7 +494,7 @@ class IEncoderAPI(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{70423839-6ACC-4B23-B079-21DBF08156A5}')
     _idlflags_ = []
-IEncoderAPI._methods_ = [
+IEncoderAPI._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'IsSupported',
               ( ['in'], POINTER(GUID), 'Api' )),
     COMMETHOD([], HRESULT, 'IsAvailable',
@@ -529,7 +529,7 @@ class IMemAllocator(IUnknown):
     _idlflags_ = []
 class _AllocatorProperties(Structure):
     pass
-IAsyncReader._methods_ = [
+IAsyncReader._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RequestAllocator',
               ( ['in'], POINTER(IMemAllocator), 'pPreferred' ),
               ( ['in'], POINTER(_AllocatorProperties), 'pProps' ),
@@ -577,7 +577,7 @@ class IAMTimecodeReader(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{9B496CE1-811B-11CF-8C77-00AA006B6814}')
     _idlflags_ = []
-IAMTimecodeReader._methods_ = [
+IAMTimecodeReader._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetTCRMode',
               ( ['in'], c_int, 'Param' ),
               ( ['out'], POINTER(c_int), 'pValue' )),
@@ -609,7 +609,7 @@ class IAMVideoCompression(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13343-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMVideoCompression._methods_ = [
+IAMVideoCompression._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'put_KeyFrameRate',
               ( ['in'], c_int, 'KeyFrameRate' )),
     COMMETHOD([], HRESULT, 'get_KeyFrameRate',
@@ -690,7 +690,7 @@ class IStream(ISequentialStream):
     _case_insensitive_ = True
     _iid_ = GUID('{0000000C-0000-0000-C000-000000000046}')
     _idlflags_ = []
-IPersistStream._methods_ = [
+IPersistStream._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'IsDirty'),
     COMMETHOD([], HRESULT, 'Load',
               ( ['in'], POINTER(IStream), 'pstm' )),
@@ -706,7 +706,7 @@ State_Stopped = 0
 State_Paused = 1
 State_Running = 2
 _FilterState = c_int # enum
-IMediaFilter._methods_ = [
+IMediaFilter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Stop'),
     COMMETHOD([], HRESULT, 'Pause'),
     COMMETHOD([], HRESULT, 'Run',
@@ -720,7 +720,7 @@ IMediaFilter._methods_ = [
               ( ['out'], POINTER(POINTER(IReferenceClock)), 'pClock' )),
 ]
 
-IMemAllocator._methods_ = [
+IMemAllocator._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetProperties',
               ( ['in'], POINTER(_AllocatorProperties), 'pRequest' ),
               ( ['out'], POINTER(_AllocatorProperties), 'pActual' )),
@@ -754,7 +754,7 @@ class IOverlayNotify(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868A0-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IOverlay._methods_ = [
+IOverlay._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetPalette',
               ( ['out'], POINTER(c_ulong), 'pdwColors' ),
               ( ['out'], POINTER(POINTER(tagPALETTEENTRY)), 'ppPalette' )),
@@ -792,7 +792,7 @@ class IVMRImageCompositor(IUnknown):
     'IVMRImageCompositor Interface'
     _iid_ = GUID('{7A4FB5AF-479F-4074-BB40-CE6722E43C82}')
     _idlflags_ = []
-IVMRFilterConfig._methods_ = [
+IVMRFilterConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetImageCompositor',
               ( ['in'], POINTER(IVMRImageCompositor), 'lpVMRImgCompositor' )),
     COMMETHOD([], HRESULT, 'SetNumberOfStreams',
@@ -809,7 +809,7 @@ IVMRFilterConfig._methods_ = [
               ( ['out'], POINTER(c_ulong), 'pMode' )),
 ]
 
-IVMRImageCompositor._methods_ = [
+IVMRImageCompositor._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'InitCompositionTarget',
               ( ['in'], POINTER(IUnknown), 'pD3DDevice' ),
               ( ['in'], POINTER(c_ulong), 'pddsRenderTarget' )),
@@ -854,7 +854,7 @@ class IVMRMixerBitmap(IUnknown):
     _idlflags_ = []
 class _VMRALPHABITMAP(Structure):
     pass
-IVMRMixerBitmap._methods_ = [
+IVMRMixerBitmap._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetAlphaBitmap',
               ( ['in'], POINTER(_VMRALPHABITMAP), 'pBmpParms' )),
     COMMETHOD([], HRESULT, 'UpdateAlphaBitmapParameters',
@@ -871,7 +871,7 @@ class IEnumMoniker(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{00000102-0000-0000-C000-000000000046}')
     _idlflags_ = []
-IRunningObjectTable._methods_ = [
+IRunningObjectTable._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Register',
               ( ['in'], c_ulong, 'grfFlags' ),
               ( ['in'], POINTER(IUnknown), 'punkObject' ),
@@ -901,7 +901,7 @@ class IAMTimecodeGenerator(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{9B496CE0-811B-11CF-8C77-00AA006B6814}')
     _idlflags_ = []
-IAMTimecodeGenerator._methods_ = [
+IAMTimecodeGenerator._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetTCGMode',
               ( ['in'], c_int, 'Param' ),
               ( ['out'], POINTER(c_int), 'pValue' )),
@@ -941,7 +941,7 @@ class IAMDevMemoryControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6545BF1-E76B-11D0-BD52-00A0C911CE86}')
     _idlflags_ = []
-IAMDevMemoryControl._methods_ = [
+IAMDevMemoryControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'QueryWriteSync'),
     COMMETHOD([], HRESULT, 'WriteSync'),
     COMMETHOD([], HRESULT, 'GetDevId',
@@ -956,7 +956,7 @@ class IMemAllocatorNotifyCallbackTemp(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{92980B30-C1DE-11D2-ABF5-00A0C905F375}')
     _idlflags_ = []
-IMemAllocatorCallbackTemp._methods_ = [
+IMemAllocatorCallbackTemp._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetNotify',
               ( ['in'], POINTER(IMemAllocatorNotifyCallbackTemp), 'pNotify' )),
     COMMETHOD([], HRESULT, 'GetFreeCount',
@@ -1011,7 +1011,7 @@ tagQuality._fields_ = [
 ]
 # The size provided by the typelib is incorrect.
 # The size and alignment check for tagQuality is skipped.
-IQualityControl._methods_ = [
+IQualityControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Notify',
               ( ['in'], POINTER(IBaseFilter), 'pSelf' ),
               ( ['in'], tagQuality, 'q' )),
@@ -1068,7 +1068,7 @@ class IAMTunerNotification(IUnknown):
 # values for enumeration 'tagAMTunerEventType'
 AMTUNER_EVENT_CHANGED = 1
 tagAMTunerEventType = c_int # enum
-IAMTunerNotification._methods_ = [
+IAMTunerNotification._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'OnEvent',
               ( ['in'], tagAMTunerEventType, 'Event' )),
 ]
@@ -1077,7 +1077,7 @@ class IAMOpenProgress(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{8E1C39A1-DE53-11CF-AA63-0080C744528D}')
     _idlflags_ = []
-IAMOpenProgress._methods_ = [
+IAMOpenProgress._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'QueryProgress',
               ( ['out'], POINTER(c_longlong), 'pllTotal' ),
               ( ['out'], POINTER(c_longlong), 'pllCurrent' )),
@@ -1109,7 +1109,7 @@ class IEnumStreamIdMap(IUnknown):
             return item
         raise IndexError(index)
 
-IMPEG2StreamIdMap._methods_ = [
+IMPEG2StreamIdMap._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'MapStreamId',
               ( ['in'], c_ulong, 'ulStreamId' ),
               ( ['in'], c_ulong, 'MediaSampleContent' ),
@@ -1135,7 +1135,7 @@ class _VMRVideoDesc(Structure):
     pass
 class _VMRDeinterlaceCaps(Structure):
     pass
-IVMRDeinterlaceControl._methods_ = [
+IVMRDeinterlaceControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetNumberOfDeinterlaceModes',
               ( ['in'], POINTER(_VMRVideoDesc), 'lpVideoDescription' ),
               ( ['in', 'out'], POINTER(c_ulong), 'lpdwNumDeinterlaceModes' ),
@@ -1210,7 +1210,7 @@ class ICreateDevEnum(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{29840822-5B84-11D0-BD3B-00A0C911CE86}')
     _idlflags_ = []
-ICreateDevEnum._methods_ = [
+ICreateDevEnum._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'CreateClassEnumerator',
               ( ['in'], POINTER(GUID), 'clsidDeviceClass' ),
               ( ['out'], POINTER(POINTER(IEnumMoniker)), 'ppenumMoniker' ),
@@ -1229,7 +1229,7 @@ class IAMCopyCaptureFileProgress(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{670D1D20-A068-11D0-B3F0-00AA003761C5}')
     _idlflags_ = []
-ICaptureGraphBuilder._methods_ = [
+ICaptureGraphBuilder._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetFiltergraph',
               ( ['in'], POINTER(IGraphBuilder), 'pfg' )),
     COMMETHOD([], HRESULT, 'GetFiltergraph',
@@ -1270,7 +1270,7 @@ class IPinFlowControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C56E9858-DBF3-4F6B-8119-384AF2060DEB}')
     _idlflags_ = []
-IPinFlowControl._methods_ = [
+IPinFlowControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Block',
               ( ['in'], c_ulong, 'dwBlockFlags' ),
               ( ['in'], c_void_p, 'hEvent' )),
@@ -1294,7 +1294,7 @@ class IGraphVersion(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868AB-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IGraphVersion._methods_ = [
+IGraphVersion._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'QueryVersion',
               ( [], POINTER(c_int), 'pVersion' )),
 ]
@@ -1325,7 +1325,7 @@ class IVMRImagePresenter(IUnknown):
     _idlflags_ = []
 class tagVMRPRESENTATIONINFO(Structure):
     pass
-IVMRImagePresenter._methods_ = [
+IVMRImagePresenter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'StartPresenting',
               ( ['in'], ULONG_PTR, 'dwUserID' )),
     COMMETHOD([], HRESULT, 'StopPresenting',
@@ -1340,7 +1340,7 @@ class IVMRMonitorConfig(IUnknown):
     'IVMRMonitorConfig Interface'
     _iid_ = GUID('{9CF0B1B6-FBAA-4B7F-88CF-CF1F130A0DCE}')
     _idlflags_ = []
-IVMRMonitorConfig._methods_ = [
+IVMRMonitorConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetMonitor',
               ( ['in'], POINTER(tagVMRGUID), 'pGUID' )),
     COMMETHOD([], HRESULT, 'GetMonitor',
@@ -1359,7 +1359,7 @@ class IMediaEventSink(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868A2-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IMediaEventSink._methods_ = [
+IMediaEventSink._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Notify',
               ( ['in'], c_int, 'EventCode' ),
               ( ['in'], LONG_PTR, 'EventParam1' ),
@@ -1384,7 +1384,7 @@ __MIDL___MIDL_itf_DirectShow_0134_0005._fields_ = [
 # values for enumeration '_REM_FILTER_FLAGS'
 REMFILTERF_LEAVECONNECTED = 1
 _REM_FILTER_FLAGS = c_int # enum
-IFileSinkFilter._methods_ = [
+IFileSinkFilter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetFileName',
               ( ['in'], WSTRING, 'pszFileName' ),
               ( ['in'], POINTER(_AMMediaType), 'pmt' )),
@@ -1393,7 +1393,7 @@ IFileSinkFilter._methods_ = [
               ( ['out'], POINTER(_AMMediaType), 'pmt' )),
 ]
 
-IFileSinkFilter2._methods_ = [
+IFileSinkFilter2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetMode',
               ( ['in'], c_ulong, 'dwFlags' )),
     COMMETHOD([], HRESULT, 'GetMode',
@@ -1430,7 +1430,7 @@ class IDVRGB219(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{58473A19-2BC8-4663-8012-25F81BABDDD1}')
     _idlflags_ = []
-IDVRGB219._methods_ = [
+IDVRGB219._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetRGB219',
               ( ['in'], c_int, 'bState' )),
 ]
@@ -1439,7 +1439,7 @@ class IAMAnalogVideoDecoder(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13350-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMAnalogVideoDecoder._methods_ = [
+IAMAnalogVideoDecoder._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_AvailableTVFormats',
               ( ['out'], POINTER(c_int), 'lAnalogVideoStandard' )),
     COMMETHOD([], HRESULT, 'put_TVFormat',
@@ -1506,7 +1506,7 @@ class IPin(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A86891-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IFilterGraph._methods_ = [
+IFilterGraph._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'AddFilter',
               ( ['in'], POINTER(IBaseFilter), 'pFilter' ),
               ( ['in'], WSTRING, 'pName' )),
@@ -1528,7 +1528,7 @@ IFilterGraph._methods_ = [
     COMMETHOD([], HRESULT, 'SetDefaultSyncSource'),
 ]
 
-IGraphBuilder._methods_ = [
+IGraphBuilder._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Connect',
               ( ['in'], POINTER(IPin), 'ppinOut' ),
               ( ['in'], POINTER(IPin), 'ppinIn' )),
@@ -1573,7 +1573,7 @@ class IVMRSurfaceAllocator(IUnknown):
     'IVMRSurfaceAllocator Interface'
     _iid_ = GUID('{31CE832E-4484-458B-8CCA-F4D7E3DB0B52}')
     _idlflags_ = []
-IVMRSurfaceAllocatorNotify._methods_ = [
+IVMRSurfaceAllocatorNotify._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'AdviseSurfaceAllocator',
               ( ['in'], ULONG_PTR, 'dwUserID' ),
               ( ['in'], POINTER(IVMRSurfaceAllocator), 'lpIVRMSurfaceAllocator' )),
@@ -1597,7 +1597,7 @@ class IAMResourceControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{8389D2D0-77D7-11D1-ABE6-00A0C905F375}')
     _idlflags_ = []
-IAMResourceControl._methods_ = [
+IAMResourceControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Reserve',
               ( ['in'], c_ulong, 'dwFlags' ),
               ( ['in'], c_void_p, 'pvReserved' )),
@@ -1617,7 +1617,7 @@ AM_AUDREND_STAT_PARAM_SLAVE_ACCUMERROR = 10
 AM_AUDREND_STAT_PARAM_BUFFERFULLNESS = 11
 AM_AUDREND_STAT_PARAM_JITTER = 12
 _AM_AUDIO_RENDERER_STAT_PARAM = c_int # enum
-IVMRSurfaceAllocator._methods_ = [
+IVMRSurfaceAllocator._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'AllocateSurface',
               ( ['in'], ULONG_PTR, 'dwUserID' ),
               ( ['in'], POINTER(tagVMRALLOCATIONINFO), 'lpAllocInfo' ),
@@ -1671,7 +1671,7 @@ class IGraphConfigCallback(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{ADE0FD60-D19D-11D2-ABF6-00A0C905F375}')
     _idlflags_ = []
-IGraphConfig._methods_ = [
+IGraphConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Reconnect',
               ( ['in'], POINTER(IPin), 'pOutputPin' ),
               ( ['in'], POINTER(IPin), 'pInputPin' ),
@@ -1732,7 +1732,7 @@ class IEnumRegFilters(IUnknown):
             return item
         raise IndexError(index)
 
-IFilterMapper._methods_ = [
+IFilterMapper._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RegisterFilter',
               ( ['in'], GUID, 'clsid' ),
               ( ['in'], WSTRING, 'Name' ),
@@ -1789,7 +1789,7 @@ tagCOLORKEY._fields_ = [
 ]
 # The size provided by the typelib is incorrect.
 # The size and alignment check for tagCOLORKEY is skipped.
-IOverlayNotify._methods_ = [
+IOverlayNotify._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'OnPaletteChange',
               ( ['in'], c_ulong, 'dwColors' ),
               ( ['in'], POINTER(tagPALETTEENTRY), 'pPalette' )),
@@ -1811,7 +1811,7 @@ class ICodecAPI(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{901DB4C7-31CE-41A2-85DC-8FA0BF41B8DA}')
     _idlflags_ = []
-ICodecAPI._methods_ = [
+ICodecAPI._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'IsSupported',
               ( ['in'], POINTER(GUID), 'Api' )),
     COMMETHOD([], HRESULT, 'IsModifiable',
@@ -1863,7 +1863,7 @@ class IVMRSurface(IUnknown):
     'IVMRSurface Interface'
     _iid_ = GUID('{A9849BBE-9EC8-4263-B764-62730F0D15D0}')
     _idlflags_ = []
-IVMRSurface._methods_ = [
+IVMRSurface._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'IsSurfaceLocked'),
     COMMETHOD([], HRESULT, 'LockSurface',
               ( ['out'], POINTER(POINTER(c_ubyte)), 'lpSurface' )),
@@ -1876,7 +1876,7 @@ class IAMVfwCompressDialogs(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{D8D715A3-6E5E-11D0-B3F0-00AA003761C5}')
     _idlflags_ = []
-IAMVfwCompressDialogs._methods_ = [
+IAMVfwCompressDialogs._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'ShowDialog',
               ( ['in'], c_int, 'iDialog' ),
               ( ['in'], wireHWND, 'hwnd' )),
@@ -1920,7 +1920,7 @@ class IAMVideoProcAmp(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13360-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMVideoProcAmp._methods_ = [
+IAMVideoProcAmp._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetRange',
               ( ['in'], c_int, 'Property' ),
               ( ['out'], POINTER(c_int), 'pMin' ),
@@ -1942,7 +1942,7 @@ IAMVideoProcAmp._methods_ = [
 VideoProcAmp_Flags_Auto = 1
 VideoProcAmp_Flags_Manual = 2
 tagVideoProcAmpFlags = c_int # enum
-IIPDVDec._methods_ = [
+IIPDVDec._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_IPDisplay',
               ( ['out'], POINTER(c_int), 'displayPix' )),
     COMMETHOD([], HRESULT, 'put_IPDisplay',
@@ -1961,7 +1961,7 @@ class IOverlayNotify2(IOverlayNotify):
     _case_insensitive_ = True
     _iid_ = GUID('{680EFA10-D535-11D1-87C8-00A0C9223196}')
     _idlflags_ = []
-IOverlayNotify2._methods_ = [
+IOverlayNotify2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'OnDisplayChange',
               ( [], c_void_p, 'hMonitor' )),
 ]
@@ -1988,7 +1988,7 @@ class IEnumMediaTypes(IUnknown):
             return item
         raise IndexError(index)
 
-IPin._methods_ = [
+IPin._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Connect',
               ( ['in'], POINTER(IPin), 'pReceivePin' ),
               ( ['in'], c_ulong, 'pmt' )),
@@ -2029,7 +2029,7 @@ DECIMATION_USE_VIDEOPORT_ONLY = 2
 DECIMATION_USE_OVERLAY_ONLY = 3
 DECIMATION_DEFAULT = 4
 _DECIMATION_USAGE = c_int # enum
-IMoniker._methods_ = [
+IMoniker._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteBindToObject',
               ( ['in'], POINTER(IBindCtx), 'pbc' ),
               ( ['in'], POINTER(IMoniker), 'pmkToLeft' ),
@@ -2090,7 +2090,7 @@ class IVideoEncoder(IEncoderAPI):
     _case_insensitive_ = True
     _iid_ = GUID('{02997C3B-8E1B-460E-9270-545E0DE9563E}')
     _idlflags_ = []
-IVideoEncoder._methods_ = [
+IVideoEncoder._methods_ = lambda: [
 ]
 ################################################################
 ## code template for IVideoEncoder implementation
@@ -2099,7 +2099,7 @@ IVideoEncoder._methods_ = [
 class __MIDL___MIDL_itf_DirectShow_0355_0001(Structure):
     pass
 STREAM_ID_MAP = __MIDL___MIDL_itf_DirectShow_0355_0001
-IEnumStreamIdMap._methods_ = [
+IEnumStreamIdMap._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Next',
               ( ['in'], c_ulong, 'cRequest' ),
               ( ['in', 'out'], POINTER(STREAM_ID_MAP), 'pStreamIdMap' ),
@@ -2115,7 +2115,7 @@ class IAMClockAdjust(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{4D5466B0-A49C-11D1-ABE8-00A0C905F375}')
     _idlflags_ = []
-IAMClockAdjust._methods_ = [
+IAMClockAdjust._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetClockDelta',
               ( ['in'], c_longlong, 'rtDelta' )),
 ]
@@ -2132,7 +2132,7 @@ class IDrawVideoImage(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{48EFB120-AB49-11D2-AED2-00A0C995E8D5}')
     _idlflags_ = []
-IDrawVideoImage._methods_ = [
+IDrawVideoImage._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'DrawVideoImageBegin'),
     COMMETHOD([], HRESULT, 'DrawVideoImageEnd'),
     COMMETHOD([], HRESULT, 'DrawVideoImageDraw',
@@ -2163,7 +2163,7 @@ class IAMGraphBuilderCallback(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{4995F511-9DDB-4F12-BD3B-F04611807B79}')
     _idlflags_ = []
-IAMGraphBuilderCallback._methods_ = [
+IAMGraphBuilderCallback._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SelectedFilter',
               ( ['in'], POINTER(IMoniker), 'pMon' )),
     COMMETHOD([], HRESULT, 'CreatedFilter',
@@ -2176,7 +2176,7 @@ AM_STREAM_INFO_STOP_DEFINED = 2
 AM_STREAM_INFO_DISCARDING = 4
 AM_STREAM_INFO_STOP_SEND_EXTRA = 16
 __MIDL___MIDL_itf_DirectShow_0156_0001 = c_int # enum
-ISequentialStream._methods_ = [
+ISequentialStream._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteRead',
               ( ['out'], POINTER(c_ubyte), 'pv' ),
               ( ['in'], c_ulong, 'cb' ),
@@ -2200,7 +2200,7 @@ _AMMediaType._fields_ = [
 ]
 # The size provided by the typelib is incorrect.
 # The size and alignment check for _AMMediaType is skipped.
-IEnumRegFilters._methods_ = [
+IEnumRegFilters._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Next',
               ( ['in'], c_ulong, 'cFilters' ),
               ( ['out'], POINTER(POINTER(REGFILTER)), 'apRegFilter' ),
@@ -2216,7 +2216,7 @@ class ISeekingPassThru(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73883-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-ISeekingPassThru._methods_ = [
+ISeekingPassThru._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Init',
               ( ['in'], c_int, 'bSupportRendering' ),
               ( ['in'], POINTER(IPin), 'pPin' )),
@@ -2233,7 +2233,7 @@ class IFileSourceFilter(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868A6-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IFileSourceFilter._methods_ = [
+IFileSourceFilter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Load',
               ( ['in'], WSTRING, 'pszFileName' ),
               ( ['in'], POINTER(_AMMediaType), 'pmt' )),
@@ -2246,7 +2246,7 @@ class IAMLatency(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{62EA93BA-EC62-11D2-B770-00C04FB6BD3D}')
     _idlflags_ = []
-IAMLatency._methods_ = [
+IAMLatency._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetLatency',
               ( ['in'], POINTER(c_longlong), 'prtLatency' )),
 ]
@@ -2255,7 +2255,7 @@ class IMediaSeeking(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73880-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-IMediaSeeking._methods_ = [
+IMediaSeeking._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetCapabilities',
               ( ['out'], POINTER(c_ulong), 'pCapabilities' )),
     COMMETHOD([], HRESULT, 'CheckCapabilities',
@@ -2312,7 +2312,7 @@ class IAMTVTuner(IAMTuner):
     _case_insensitive_ = True
     _iid_ = GUID('{211A8766-03AC-11D1-8D13-00AA00BD8339}')
     _idlflags_ = []
-IAMTuner._methods_ = [
+IAMTuner._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'put_Channel',
               ( ['in'], c_int, 'lChannel' ),
               ( ['in'], c_int, 'lVideoSubChannel' ),
@@ -2354,7 +2354,7 @@ IAMTuner._methods_ = [
 TunerInputCable = 0
 TunerInputAntenna = 1
 tagTunerInputType = c_int # enum
-IAMTVTuner._methods_ = [
+IAMTVTuner._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_AvailableTVFormats',
               ( ['out'], POINTER(c_int), 'lAnalogVideoStandard' )),
     COMMETHOD([], HRESULT, 'get_TVFormat',
@@ -2381,7 +2381,7 @@ IAMTVTuner._methods_ = [
               ( ['out'], POINTER(c_int), 'lFreq' )),
 ]
 
-IGraphConfigCallback._methods_ = [
+IGraphConfigCallback._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Reconfigure',
               ( [], c_void_p, 'pvContext' ),
               ( [], c_ulong, 'dwFlags' )),
@@ -2391,7 +2391,7 @@ class IAMDeviceRemoval(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{F90A6130-B658-11D2-AE49-0000F8754B99}')
     _idlflags_ = []
-IAMDeviceRemoval._methods_ = [
+IAMDeviceRemoval._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'DeviceInfo',
               ( ['out'], POINTER(GUID), 'pclsidInterfaceClass' ),
               ( ['out'], POINTER(POINTER(c_ushort)), 'pwszSymbolicLink' )),
@@ -2407,7 +2407,7 @@ class IResourceConsumer(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868AD-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IResourceManager._methods_ = [
+IResourceManager._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Register',
               ( ['in'], WSTRING, 'pName' ),
               ( ['in'], c_int, 'cResource' ),
@@ -2474,7 +2474,7 @@ class IAMVfwCaptureDialogs(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{D8D715A0-6E5E-11D0-B3F0-00AA003761C5}')
     _idlflags_ = []
-IAMVfwCaptureDialogs._methods_ = [
+IAMVfwCaptureDialogs._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'HasDialog',
               ( ['in'], c_int, 'iDialog' )),
     COMMETHOD([], HRESULT, 'ShowDialog',
@@ -2491,7 +2491,7 @@ class IAMAudioInputMixer(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{54C39221-8380-11D0-B3F0-00AA003761C5}')
     _idlflags_ = []
-IAMAudioInputMixer._methods_ = [
+IAMAudioInputMixer._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'put_Enable',
               ( ['in'], c_int, 'fEnable' )),
     COMMETHOD([], HRESULT, 'get_Enable',
@@ -2530,7 +2530,7 @@ class IDistributorNotify(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868AF-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IDistributorNotify._methods_ = [
+IDistributorNotify._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Stop'),
     COMMETHOD([], HRESULT, 'Pause'),
     COMMETHOD([], HRESULT, 'Run',
@@ -2544,7 +2544,7 @@ class IAMTVAudio(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{83EC1C30-23D1-11D1-99E6-00A0C9560266}')
     _idlflags_ = []
-IAMTVAudio._methods_ = [
+IAMTVAudio._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetHardwareSupportedTVAudioModes',
               ( ['out'], POINTER(c_int), 'plModes' )),
     COMMETHOD([], HRESULT, 'GetAvailableTVAudioModes',
@@ -2560,7 +2560,7 @@ IAMTVAudio._methods_ = [
               ( [], POINTER(IAMTunerNotification), 'pNotify' )),
 ]
 
-IPersistMediaPropertyBag._methods_ = [
+IPersistMediaPropertyBag._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'InitNew'),
     COMMETHOD([], HRESULT, 'Load',
               ( ['in'], POINTER(IMediaPropertyBag), 'pPropBag' ),
@@ -2579,7 +2579,7 @@ class IFilterMapper3(IFilterMapper2):
     _case_insensitive_ = True
     _iid_ = GUID('{B79BB0B1-33C1-11D1-ABE1-00A0C905F375}')
     _idlflags_ = []
-IFilterMapper2._methods_ = [
+IFilterMapper2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'CreateCategory',
               ( ['in'], POINTER(GUID), 'clsidCategory' ),
               ( ['in'], c_ulong, 'dwCategoryMerit' ),
@@ -2613,7 +2613,7 @@ IFilterMapper2._methods_ = [
               ( ['in'], POINTER(GUID), 'pPinCategoryOut' )),
 ]
 
-IFilterMapper3._methods_ = [
+IFilterMapper3._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetICreateDevEnum',
               ( ['out'], POINTER(POINTER(ICreateDevEnum)), 'ppenum' )),
 ]
@@ -2629,7 +2629,7 @@ __MIDL___MIDL_itf_DirectShow_0156_0002._fields_ = [
 ]
 # The size provided by the typelib is incorrect.
 # The size and alignment check for __MIDL___MIDL_itf_DirectShow_0156_0002 is skipped.
-IAMCopyCaptureFileProgress._methods_ = [
+IAMCopyCaptureFileProgress._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Progress',
               ( ['in'], c_int, 'iProgress' )),
 ]
@@ -2646,7 +2646,7 @@ class IAMovieSetup(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{A3D8CEC0-7E5A-11CF-BBC5-00805F6CEF20}')
     _idlflags_ = []
-IAMovieSetup._methods_ = [
+IAMovieSetup._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Register'),
     COMMETHOD([], HRESULT, 'Unregister'),
 ]
@@ -2655,7 +2655,7 @@ class IAMPushSource(IAMLatency):
     _case_insensitive_ = True
     _iid_ = GUID('{F185FE76-E64E-11D2-B76E-00C04FB6BD3D}')
     _idlflags_ = []
-IAMPushSource._methods_ = [
+IAMPushSource._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetPushSourceFlags',
               ( ['out'], POINTER(c_ulong), 'pFlags' )),
     COMMETHOD([], HRESULT, 'SetPushSourceFlags',
@@ -2680,7 +2680,7 @@ class IAMBufferNegotiation(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56ED71A0-AF5F-11D0-B3F0-00AA003761C5}')
     _idlflags_ = []
-IAMBufferNegotiation._methods_ = [
+IAMBufferNegotiation._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SuggestAllocatorProperties',
               ( ['in'], POINTER(_AllocatorProperties), 'pprop' )),
     COMMETHOD([], HRESULT, 'GetAllocatorProperties',
@@ -2691,7 +2691,7 @@ class IAMTimecodeDisplay(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{9B496CE2-811B-11CF-8C77-00AA006B6814}')
     _idlflags_ = []
-IAMTimecodeDisplay._methods_ = [
+IAMTimecodeDisplay._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetTCDisplayEnable',
               ( ['out'], POINTER(c_int), 'pState' )),
     COMMETHOD([], HRESULT, 'SetTCDisplayEnable',
@@ -2708,7 +2708,7 @@ class IDecimateVideoImage(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{2E5EA3E0-E924-11D2-B6DA-00A0C995E8DF}')
     _idlflags_ = []
-IDecimateVideoImage._methods_ = [
+IDecimateVideoImage._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetDecimationImageSize',
               ( ['in'], c_int, 'lWidth' ),
               ( ['in'], c_int, 'lHeight' )),
@@ -2719,7 +2719,7 @@ class IAMAnalogVideoEncoder(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E133B0-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMAnalogVideoEncoder._methods_ = [
+IAMAnalogVideoEncoder._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_AvailableTVFormats',
               ( ['out'], POINTER(c_int), 'lAnalogVideoStandard' )),
     COMMETHOD([], HRESULT, 'put_TVFormat',
@@ -2749,7 +2749,7 @@ class IBPCSatelliteTuner(IAMTuner):
     _case_insensitive_ = True
     _iid_ = GUID('{211A8765-03AC-11D1-8D13-00AA00BD8339}')
     _idlflags_ = []
-IBPCSatelliteTuner._methods_ = [
+IBPCSatelliteTuner._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_DefaultSubChannelTypes',
               ( ['out'], POINTER(c_int), 'plDefaultVideoType' ),
               ( ['out'], POINTER(c_int), 'plDefaultAudioType' )),
@@ -2763,14 +2763,14 @@ class IGetCapabilitiesKey(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{A8809222-07BB-48EA-951C-33158100625B}')
     _idlflags_ = []
-IGetCapabilitiesKey._methods_ = [
+IGetCapabilitiesKey._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetCapabilitiesKey',
               ( ['out'], POINTER(c_void_p), 'pHKey' )),
 ]
 
 class tagSTATSTG(Structure):
     pass
-IStream._methods_ = [
+IStream._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteSeek',
               ( ['in'], _LARGE_INTEGER, 'dlibMove' ),
               ( ['in'], c_ulong, 'dwOrigin' ),
@@ -2810,7 +2810,7 @@ class IAMFilterMiscFlags(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{2DD74950-A890-11D1-ABE8-00A0C905F375}')
     _idlflags_ = []
-IAMFilterMiscFlags._methods_ = [
+IAMFilterMiscFlags._methods_ = lambda: [
     COMMETHOD([], c_ulong, 'GetMiscFlags'),
 ]
 
@@ -2824,7 +2824,7 @@ class IAMGraphStreams(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{632105FA-072E-11D3-8AF9-00C04FB6BD3D}')
     _idlflags_ = []
-IAMGraphStreams._methods_ = [
+IAMGraphStreams._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'FindUpstreamInterface',
               ( ['in'], POINTER(IPin), 'pPin' ),
               ( ['in'], POINTER(GUID), 'riid' ),
@@ -2841,7 +2841,7 @@ class IAMAudioRendererStats(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{22320CB2-D41A-11D2-BF7C-D7CB9DF0BF93}')
     _idlflags_ = []
-IAMAudioRendererStats._methods_ = [
+IAMAudioRendererStats._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetStatParam',
               ( ['in'], c_ulong, 'dwParam' ),
               ( ['out'], POINTER(c_ulong), 'pdwParam1' ),
@@ -2879,7 +2879,7 @@ class IEnumPins(IUnknown):
 
 class _FilterInfo(Structure):
     pass
-IBaseFilter._methods_ = [
+IBaseFilter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'EnumPins',
               ( ['out', 'retval'], POINTER(POINTER(IEnumPins)), 'ppenum' )),
     COMMETHOD([], HRESULT, 'FindPin',
@@ -2918,7 +2918,7 @@ class IAMVideoControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{6A2E0670-28E4-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMVideoControl._methods_ = [
+IAMVideoControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetCaps',
               ( ['in'], POINTER(IPin), 'pPin' ),
               ( ['out'], POINTER(c_int), 'pCapsFlags' )),
@@ -2960,7 +2960,7 @@ tagSTATSTG._fields_ = [
 ]
 # The size provided by the typelib is incorrect.
 # The size and alignment check for tagSTATSTG is skipped.
-IEnumString._methods_ = [
+IEnumString._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteNext',
               ( ['in'], c_ulong, 'celt' ),
               ( ['out'], POINTER(WSTRING), 'rgelt' ),
@@ -2972,7 +2972,7 @@ IEnumString._methods_ = [
               ( ['out'], POINTER(POINTER(IEnumString)), 'ppenum' )),
 ]
 
-IMemAllocatorNotifyCallbackTemp._methods_ = [
+IMemAllocatorNotifyCallbackTemp._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'NotifyRelease'),
 ]
 
@@ -2980,7 +2980,7 @@ class IAMStreamControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73881-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-IAMStreamControl._methods_ = [
+IAMStreamControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'StartAt',
               ( ['in'], POINTER(c_longlong), 'ptStart' ),
               ( ['in'], c_ulong, 'dwCookie' )),
@@ -2996,7 +2996,7 @@ class IMpeg2Demultiplexer(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{436EEE9C-264F-4242-90E1-4E330C107512}')
     _idlflags_ = []
-IMpeg2Demultiplexer._methods_ = [
+IMpeg2Demultiplexer._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'CreateOutputPin',
               ( ['in'], POINTER(_AMMediaType), 'pMediaType' ),
               ( ['in'], WSTRING, 'pszPinName' ),
@@ -3008,7 +3008,7 @@ IMpeg2Demultiplexer._methods_ = [
               ( ['in'], WSTRING, 'pszPinName' )),
 ]
 
-IDVSplitter._methods_ = [
+IDVSplitter._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'DiscardAlternateVideoFrames',
               ( ['in'], c_int, 'nDiscard' )),
 ]
@@ -3023,14 +3023,14 @@ class IVMRImagePresenterExclModeConfig(IVMRImagePresenterConfig):
     'IVMRImagePresenterExclModeConfig Interface'
     _iid_ = GUID('{E6F7CE40-4673-44F1-8F77-5499D68CB4EA}')
     _idlflags_ = []
-IVMRImagePresenterConfig._methods_ = [
+IVMRImagePresenterConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetRenderingPrefs',
               ( ['in'], c_ulong, 'dwRenderFlags' )),
     COMMETHOD([], HRESULT, 'GetRenderingPrefs',
               ( ['out'], POINTER(c_ulong), 'dwRenderFlags' )),
 ]
 
-IVMRImagePresenterExclModeConfig._methods_ = [
+IVMRImagePresenterExclModeConfig._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetXlcModeDDObjAndPrimarySurface',
               ( ['in'], POINTER(c_ulong), 'lpDDObj' ),
               ( ['in'], POINTER(c_ulong), 'lpPrimarySurf' )),
@@ -3039,7 +3039,7 @@ IVMRImagePresenterExclModeConfig._methods_ = [
               ( ['out'], POINTER(POINTER(c_ulong)), 'lpPrimarySurf' )),
 ]
 
-IEnumFilters._methods_ = [
+IEnumFilters._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Next',
               ( ['in'], c_ulong, 'cFilters' ),
               ( ['out'], POINTER(POINTER(IBaseFilter)), 'ppFilter' ),
@@ -3055,7 +3055,7 @@ class IMemInputPin(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A8689D-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IMemInputPin._methods_ = [
+IMemInputPin._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetAllocator',
               ( ['out'], POINTER(POINTER(IMemAllocator)), 'ppAllocator' )),
     COMMETHOD([], HRESULT, 'NotifyAllocator',
@@ -3087,7 +3087,7 @@ class IAMDevMemoryAllocator(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6545BF0-E76B-11D0-BD52-00A0C911CE86}')
     _idlflags_ = []
-IAMDevMemoryAllocator._methods_ = [
+IAMDevMemoryAllocator._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetInfo',
               ( ['out'], POINTER(c_ulong), 'pdwcbTotalFree' ),
               ( ['out'], POINTER(c_ulong), 'pdwcbLargestFree' ),
@@ -3109,7 +3109,7 @@ class IAMExtDevice(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{B5730A90-1A2C-11CF-8C23-00AA006B6814}')
     _idlflags_ = []
-IAMExtDevice._methods_ = [
+IAMExtDevice._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetCapability',
               ( ['in'], c_int, 'Capability' ),
               ( ['out'], POINTER(c_int), 'pValue' ),
@@ -3136,7 +3136,7 @@ class IConfigInterleaving(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{BEE3D220-157B-11D0-BD23-00A0C911CE86}')
     _idlflags_ = []
-IConfigInterleaving._methods_ = [
+IConfigInterleaving._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'put_Mode',
               ( ['in'], InterleavingMode, 'mode' )),
     COMMETHOD([], HRESULT, 'get_Mode',
@@ -3149,7 +3149,7 @@ IConfigInterleaving._methods_ = [
               ( ['out'], POINTER(c_longlong), 'prtPreroll' )),
 ]
 
-IResourceConsumer._methods_ = [
+IResourceConsumer._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'AcquireResource',
               ( ['in'], c_int, 'idResource' )),
     COMMETHOD([], HRESULT, 'ReleaseResource',
@@ -3169,7 +3169,7 @@ class IReferenceClock2(IReferenceClock):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73885-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-IReferenceClock2._methods_ = [
+IReferenceClock2._methods_ = lambda: [
 ]
 
 # values for enumeration '_AM_RENSDEREXFLAGS'
@@ -3179,7 +3179,7 @@ class IAMDroppedFrames(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13344-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMDroppedFrames._methods_ = [
+IAMDroppedFrames._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetNumDropped',
               ( ['out'], POINTER(c_int), 'plDropped' )),
     COMMETHOD([], HRESULT, 'GetNumNotDropped',
@@ -3192,7 +3192,7 @@ IAMDroppedFrames._methods_ = [
               ( ['out'], POINTER(c_int), 'plAverageSize' )),
 ]
 
-IEnumMoniker._methods_ = [
+IEnumMoniker._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'RemoteNext',
               ( ['in'], c_ulong, 'celt' ),
               ( ['out'], POINTER(POINTER(IMoniker)), 'rgelt' ),
@@ -3222,7 +3222,7 @@ class IAMVideoDecimationProperties(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{60D32930-13DA-11D3-9EC6-C4FCAEF5C7BE}')
     _idlflags_ = []
-IAMVideoDecimationProperties._methods_ = [
+IAMVideoDecimationProperties._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'QueryDecimationUsage',
               ( ['out'], POINTER(_DECIMATION_USAGE), 'lpUsage' )),
     COMMETHOD([], HRESULT, 'SetDecimationUsage',
@@ -3238,7 +3238,7 @@ ADVISE_POSITION = 8
 ADVISE_DISPLAY_CHANGE = 16
 __MIDL___MIDL_itf_DirectShow_0138_0002 = c_int # enum
 VIDEOENCODER_BITRATE_MODE = __MIDL___MIDL_itf_DirectShow_0364_0001
-IEnumPins._methods_ = [
+IEnumPins._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Next',
               ( ['in'], c_ulong, 'cPins' ),
               ( ['out'], POINTER(POINTER(IPin)), 'ppPins' ),
@@ -3254,7 +3254,7 @@ class IVideoFrameStep(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{E46A9787-2B71-444D-A4B5-1FAB7B708D6A}')
     _idlflags_ = []
-IVideoFrameStep._methods_ = [
+IVideoFrameStep._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Step',
               ( [], c_ulong, 'dwFrames' ),
               ( [], POINTER(IUnknown), 'pStepObject' )),
@@ -3264,7 +3264,7 @@ IVideoFrameStep._methods_ = [
     COMMETHOD([], HRESULT, 'CancelStep'),
 ]
 
-ICaptureGraphBuilder2._methods_ = [
+ICaptureGraphBuilder2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetFiltergraph',
               ( ['in'], POINTER(IGraphBuilder), 'pfg' )),
     COMMETHOD([], HRESULT, 'GetFiltergraph',
@@ -3316,7 +3316,7 @@ class IAMExtTransport(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{A03CD5F0-3045-11CF-8C44-00AA006B6814}')
     _idlflags_ = []
-IAMExtTransport._methods_ = [
+IAMExtTransport._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetCapability',
               ( ['in'], c_int, 'Capability' ),
               ( ['out'], POINTER(c_int), 'pValue' ),
@@ -3420,7 +3420,7 @@ class IStreamBuilder(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{56A868BF-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IStreamBuilder._methods_ = [
+IStreamBuilder._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Render',
               ( ['in'], POINTER(IPin), 'ppinOut' ),
               ( ['in'], POINTER(IGraphBuilder), 'pGraph' )),
@@ -3469,7 +3469,7 @@ class IVMRMixerControl(IUnknown):
     'IVMRMixerControl Interface'
     _iid_ = GUID('{1C1A17B0-BED0-415D-974B-DC6696131599}')
     _idlflags_ = []
-IVMRMixerControl._methods_ = [
+IVMRMixerControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetAlpha',
               ( ['in'], c_ulong, 'dwStreamId' ),
               ( ['in'], c_float, 'Alpha' )),
@@ -3498,7 +3498,7 @@ IVMRMixerControl._methods_ = [
               ( ['out'], POINTER(c_ulong), 'pdwMixerPrefs' )),
 ]
 
-IEnumMediaTypes._methods_ = [
+IEnumMediaTypes._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Next',
               ( ['in'], c_ulong, 'cMediaTypes' ),
               ( ['out'], POINTER(POINTER(_AMMediaType)), 'ppMediaTypes' ),
@@ -3514,7 +3514,7 @@ class IAMTVAudioNotification(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{83EC1C33-23D1-11D1-99E6-00A0C9560266}')
     _idlflags_ = []
-IAMTVAudioNotification._methods_ = [
+IAMTVAudioNotification._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'OnEvent',
               ( ['in'], tagAMTVAudioEventType, 'Event' )),
 ]
@@ -3523,7 +3523,7 @@ class IAMPhysicalPinInfo(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{F938C991-3029-11CF-8C44-00AA006B6814}')
     _idlflags_ = []
-IAMPhysicalPinInfo._methods_ = [
+IAMPhysicalPinInfo._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetPhysicalType',
               ( ['out'], POINTER(c_int), 'pType' ),
               ( ['out'], POINTER(WSTRING), 'ppszType' )),
@@ -3533,7 +3533,7 @@ class IAMStreamSelect(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C1960960-17F5-11D1-ABE1-00A0C905F375}')
     _idlflags_ = []
-IAMStreamSelect._methods_ = [
+IAMStreamSelect._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Count',
               ( ['out'], POINTER(c_ulong), 'pcStreams' )),
     COMMETHOD([], HRESULT, 'Info',
@@ -3554,7 +3554,7 @@ class IFilterGraph2(IGraphBuilder):
     _case_insensitive_ = True
     _iid_ = GUID('{36B73882-C2C8-11CF-8B46-00805F6CEF60}')
     _idlflags_ = []
-IFilterGraph2._methods_ = [
+IFilterGraph2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'AddSourceFilterForMoniker',
               ( ['in'], POINTER(IMoniker), 'pMoniker' ),
               ( ['in'], POINTER(IBindCtx), 'pCtx' ),
@@ -3573,7 +3573,7 @@ class IAMCameraControl(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13370-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMCameraControl._methods_ = [
+IAMCameraControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetRange',
               ( ['in'], c_int, 'Property' ),
               ( ['out'], POINTER(c_int), 'pMin' ),
@@ -3595,7 +3595,7 @@ class IAMDecoderCaps(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C0DFF467-D499-4986-972B-E1D9090FA941}')
     _idlflags_ = []
-IAMDecoderCaps._methods_ = [
+IAMDecoderCaps._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetDecoderCaps',
               ( ['in'], c_ulong, 'dwCapIndex' ),
               ( ['out'], POINTER(c_ulong), 'lpdwCap' )),
@@ -3605,7 +3605,7 @@ class IAMClockSlave(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{9FD52741-176D-4B36-8F51-CA8F933223BE}')
     _idlflags_ = []
-IAMClockSlave._methods_ = [
+IAMClockSlave._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetErrorTolerance',
               ( ['in'], c_ulong, 'dwTolerance' )),
     COMMETHOD([], HRESULT, 'GetErrorTolerance',
@@ -3622,7 +3622,7 @@ class IAMCrossbar(IUnknown):
     _case_insensitive_ = True
     _iid_ = GUID('{C6E13380-30AC-11D0-A18C-00A0C9118956}')
     _idlflags_ = []
-IAMCrossbar._methods_ = [
+IAMCrossbar._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'get_PinCounts',
               ( ['out'], POINTER(c_int), 'OutputPinCount' ),
               ( ['out'], POINTER(c_int), 'InputPinCount' )),
@@ -3647,7 +3647,7 @@ class IVMRWindowlessControl(IUnknown):
     'IVMRWindowlessControl Interface'
     _iid_ = GUID('{0EB1088C-4DCD-46F0-878F-39DAE86A51B7}')
     _idlflags_ = []
-IVMRWindowlessControl._methods_ = [
+IVMRWindowlessControl._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetNativeVideoSize',
               ( ['out'], POINTER(c_int), 'lpWidth' ),
               ( ['out'], POINTER(c_int), 'lpHeight' ),
@@ -3705,7 +3705,7 @@ class IMediaEventEx(IMediaEvent):
     'IMediaEventEx interface'
     _iid_ = GUID('{56A868C0-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IMediaEvent._methods_ = [
+IMediaEvent._methods_ = lambda: [
     COMMETHOD([dispid(1610743808)], HRESULT, 'GetEventHandle',
               ( ['out'], POINTER(LONG_PTR), 'hEvent' )),
     COMMETHOD([dispid(1610743809)], HRESULT, 'GetEvent',
@@ -3726,7 +3726,7 @@ IMediaEvent._methods_ = [
               ( ['in'], LONG_PTR, 'lParam2' )),
 ]
 
-IMediaEventEx._methods_ = [
+IMediaEventEx._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetNotifyWindow',
               ( ['in'], LONG_PTR, 'hwnd' ),
               ( ['in'], c_int, 'lMsg' ),
@@ -3742,7 +3742,7 @@ class IPinInfo(IDispatch):
     'Pin Info'
     _iid_ = GUID('{56A868BD-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IPinInfo._methods_ = [
+IPinInfo._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Pin',
               ( ['out', 'retval'], POINTER(POINTER(IUnknown)), 'ppUnk' )),
     COMMETHOD([dispid(1610743809), 'propget'], HRESULT, 'ConnectedTo',
@@ -3775,7 +3775,7 @@ class IVideoWindow(IDispatch):
     'IVideoWindow interface'
     _iid_ = GUID('{56A868B4-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IVideoWindow._methods_ = [
+IVideoWindow._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propput'], HRESULT, 'Caption',
               ( ['in'], BSTR, 'strCaption' )),
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Caption',
@@ -3885,7 +3885,7 @@ class IBasicVideo2(IBasicVideo):
     'IBasicVideo2'
     _iid_ = GUID('{329BB360-F6EA-11D1-9038-00A0C9697298}')
     _idlflags_ = []
-IBasicVideo._methods_ = [
+IBasicVideo._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'AvgTimePerFrame',
               ( ['out', 'retval'], POINTER(c_double), 'pAvgTimePerFrame' )),
     COMMETHOD([dispid(1610743809), 'propget'], HRESULT, 'BitRate',
@@ -3965,7 +3965,7 @@ IBasicVideo._methods_ = [
     COMMETHOD([dispid(1610743839)], HRESULT, 'IsUsingDefaultDestination'),
 ]
 
-IBasicVideo2._methods_ = [
+IBasicVideo2._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetPreferredAspectRatio',
               ( ['out'], POINTER(c_int), 'plAspectX' ),
               ( ['out'], POINTER(c_int), 'plAspectY' )),
@@ -3976,7 +3976,7 @@ class IAMCollection(IDispatch):
     'Collection'
     _iid_ = GUID('{56A868B9-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IAMCollection._methods_ = [
+IAMCollection._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Count',
               ( ['out', 'retval'], POINTER(c_int), 'plCount' )),
     COMMETHOD([dispid(1610743809)], HRESULT, 'Item',
@@ -3991,7 +3991,7 @@ class IMediaPosition(IDispatch):
     'IMediaPosition interface'
     _iid_ = GUID('{56A868B2-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IMediaPosition._methods_ = [
+IMediaPosition._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Duration',
               ( ['out', 'retval'], POINTER(c_double), 'plength' )),
     COMMETHOD([dispid(1610743809), 'propput'], HRESULT, 'CurrentPosition',
@@ -4021,7 +4021,7 @@ class IMediaControl(IDispatch):
     'IMediaControl interface'
     _iid_ = GUID('{56A868B1-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IMediaControl._methods_ = [
+IMediaControl._methods_ = lambda: [
     COMMETHOD([dispid(1610743808)], HRESULT, 'Run'),
     COMMETHOD([dispid(1610743809)], HRESULT, 'Pause'),
     COMMETHOD([dispid(1610743810)], HRESULT, 'Stop'),
@@ -4045,7 +4045,7 @@ class IBasicAudio(IDispatch):
     'IBasicAudio interface'
     _iid_ = GUID('{56A868B3-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IBasicAudio._methods_ = [
+IBasicAudio._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propput'], HRESULT, 'Volume',
               ( ['in'], c_int, 'plVolume' )),
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Volume',
@@ -4066,7 +4066,7 @@ class IDeferredCommand(IUnknown):
     'IDeferredCommand'
     _iid_ = GUID('{56A868B8-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = []
-IQueueCommand._methods_ = [
+IQueueCommand._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'InvokeAtStreamTime',
               ( ['out'], POINTER(POINTER(IDeferredCommand)), 'pCmd' ),
               ( ['in'], c_double, 'time' ),
@@ -4094,7 +4094,7 @@ class IAMStats(IDispatch):
     'Statistics'
     _iid_ = GUID('{BC9BCF80-DCD2-11D2-ABF6-00A0C905F375}')
     _idlflags_ = ['dual', 'oleautomation']
-IAMStats._methods_ = [
+IAMStats._methods_ = lambda: [
     COMMETHOD([dispid(1610743808)], HRESULT, 'Reset'),
     COMMETHOD([dispid(1610743809), 'propget'], HRESULT, 'Count',
               ( ['out', 'retval'], POINTER(c_int), 'plCount' )),
@@ -4130,7 +4130,7 @@ class IFilterInfo(IDispatch):
     'FilterInfo'
     _iid_ = GUID('{56A868BA-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IFilterInfo._methods_ = [
+IFilterInfo._methods_ = lambda: [
     COMMETHOD([dispid(1610743808)], HRESULT, 'FindPin',
               ( ['in'], BSTR, 'strPinID' ),
               ( ['out'], POINTER(POINTER(IDispatch)), 'ppUnk' )),
@@ -4155,14 +4155,14 @@ class IRegFilterInfo(IDispatch):
     'Registry Filter Info'
     _iid_ = GUID('{56A868BB-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IRegFilterInfo._methods_ = [
+IRegFilterInfo._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Name',
               ( ['out', 'retval'], POINTER(BSTR), 'strName' )),
     COMMETHOD([dispid(1610743809)], HRESULT, 'Filter',
               ( ['out'], POINTER(POINTER(IDispatch)), 'ppUnk' )),
 ]
 
-IDeferredCommand._methods_ = [
+IDeferredCommand._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'Cancel'),
     COMMETHOD([], HRESULT, 'Confidence',
               ( ['out'], POINTER(c_int), 'pConfidence' )),
@@ -4185,7 +4185,7 @@ class IMediaTypeInfo(IDispatch):
     'Media Type'
     _iid_ = GUID('{56A868BC-0AD4-11CE-B03A-0020AF0BA770}')
     _idlflags_ = ['dual', 'oleautomation']
-IMediaTypeInfo._methods_ = [
+IMediaTypeInfo._methods_ = lambda: [
     COMMETHOD([dispid(1610743808), 'propget'], HRESULT, 'Type',
               ( ['out', 'retval'], POINTER(BSTR), 'strType' )),
     COMMETHOD([dispid(1610743809), 'propget'], HRESULT, 'Subtype',
@@ -4344,7 +4344,7 @@ class IVMRAspectRatioControl9(IUnknown):
 	_iid_ = GUID('{00D96C29-BBDE-4EFC-9901-BB5036392146}')
 	_idlflags_ = []
 
-IVMRAspectRatioControl9._methods_ = [
+IVMRAspectRatioControl9._methods_ = lambda: [
 	COMMETHOD([], HRESULT, 'GetAspectRatioMode',
 			(['retval', 'out'], POINTER(DWORD), 'lpdwARMode')),
 	COMMETHOD([], HRESULT, 'SetAspectRatioMode',
@@ -4392,7 +4392,7 @@ class VMR9ProcAmpControlRange(Structure):
 	def __init__(self):
 		self.dwSize = sizeof(self)
 
-IVMRMixerControl9._methods_ = [
+IVMRMixerControl9._methods_ = lambda: [
 	COMMETHOD([], HRESULT, 'SetAlpha',
 			(['in'], DWORD, 'dwStreamID'),
 			(['in'], FLOAT, 'Alpha')),
@@ -4438,7 +4438,7 @@ class IDirectVobSub(IUnknown):
 	_iid_ = GUID('{EBE1FB08-3957-47CA-AF13-5827E5442E56}')
 	_idlflags_ = []
 
-IDirectVobSub._methods_ = [
+IDirectVobSub._methods_ = lambda: [
 	COMMETHOD([], HRESULT, 'get_FileName',
 			(['in'], POINTER(BSTR), 'fn')),
 	COMMETHOD([], HRESULT, 'put_FileName',
@@ -4494,7 +4494,7 @@ class CAUUID(Structure):
 		('element_count', ULONG),
 		('elements', POINTER(GUID)),
 	)
-ISpecifyPropertyPages._methods_ = [
+ISpecifyPropertyPages._methods_ = lambda: [
 	COMMETHOD([], HRESULT, 'GetPages',
 			(['out'], POINTER(CAUUID), 'pPages'),
 			)
@@ -4508,7 +4508,7 @@ class IAMMediaContent(IDispatch):
 	_iid_ = GUID('{FA2AA8F4-8B62-11D0-A520-000000000000}')
 	_idlflags_ = []
 
-IAMMediaContent._methods_ = [
+IAMMediaContent._methods_ = lambda: [
 	COMMETHOD([], HRESULT, 'get_AuthorName',
 			(['retval', 'out'], POINTER(BSTR), 'pbstrAuthorName')),
 	COMMETHOD([], HRESULT, 'get_Title',
@@ -4545,7 +4545,7 @@ class IVMRFilterConfig9(IUnknown):
 	_iid_ = GUID('{5a804648-4f66-4867-9c43-4f5c822cf1b8}')
 	_idlflags_ = []
 
-IVMRFilterConfig9._methods_ = [
+IVMRFilterConfig9._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'SetImageCompositor',
               ( ['in'], c_void_p, 'lpVMRImgCompositor' )),
     COMMETHOD([], HRESULT, 'SetNumberOfStreams',
@@ -4588,7 +4588,7 @@ class BITMAPINFOHEADER(Structure):
             ('biClrImportant', DWORD)
     ]
 
-IVMRWindowlessControl9._methods_ = [
+IVMRWindowlessControl9._methods_ = lambda: [
     COMMETHOD([], HRESULT, 'GetNativeVideoSize',
               ( ['out'], POINTER(LONG), 'lpWidth' ),
               ( ['out'], POINTER(LONG), 'lpHeight' ),
@@ -0,0 +1,304 @@
+'''
+Simulated COM backend, so dshow (dshow.comtypes and the interface definitions
+in dshow.lib) can be imported on other platforms than Windows, e.g. for
+benchmarking the import on a Linux CI machine.
+
+install() has to be called before dshow is imported, it adds the Windows only
+parts of ctypes that are used at import time: WINFUNCTYPE (creating COM method
+prototypes for a vtable index, bound to a dummy function that must not be
+called), HRESULT, COMError, windll/oledll with stand-ins of the few ole32
+functions used at import time (GUID parsing and formatting), 32 bit
+c_long/c_ulong, BSTR (which has a Windows only type code, it's simulated by a
+c_wchar_p) and the mbcs codec that dshow/lib.py is declared in. Nothing can be
+called through COM.
+
+Load it by path (not as dshow.simcom), dshow/__init__.py itself needs the
+backend:
+
+    runpy.run_path('dshow/simcom.py')['install']()
+'''
+
+import codecs
+import ctypes
+import _ctypes
+import sys
+import uuid
+
+__all__ = ['install']
+
+_prototypes = {}
+
+
+########################################
+#
+########################################
+class _COMError(Exception):
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, hresult, text, details):
+        super().__init__(hresult, text, details)
+        self.hresult = hresult
+        self.text = text
+        self.details = details
+
+
+########################################
+#
+########################################
+class _HRESULT(ctypes.c_int):
+    pass
+
+
+########################################
+# metaclass of the _SimpleCData stand-in, subclasses are real _SimpleCData
+# types with Windows only type codes mapped to portable ones
+########################################
+class _SimpleTypeMapper(type):
+
+    ########################################
+    #
+    ########################################
+    def __new__(mcls, name, bases, namespace):
+        if not bases:
+            return super().__new__(mcls, name, bases, namespace)
+        if namespace.get('_type_') == 'X':
+            namespace['_type_'] = 'Z'
+        return type(ctypes.c_int)(name, (_ctypes._SimpleCData,), namespace)
+
+
+########################################
+#
+########################################
+class _SimpleCData(metaclass=_SimpleTypeMapper):
+    pass
+
+
+########################################
+# calls of DLL functions that aren't simulated do nothing and return 0
+########################################
+class _Function():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, name, impl=None):
+        self.__name__ = name
+        self._impl = impl
+
+    ########################################
+    #
+    ########################################
+    def __call__(self, *args):
+        return self._impl(*args) if self._impl else 0
+
+
+########################################
+#
+########################################
+class _DLL():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, name, functions=None):
+        self._name = name
+        self._functions = functions or {}
+
+    ########################################
+    #
+    ########################################
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        func = _Function(name, self._functions.get(name))
+        setattr(self, name, func)
+        return func
+
+    ########################################
+    #
+    ########################################
+    def __getitem__(self, name):
+        return getattr(self, str(name))
+
+
+########################################
+#
+########################################
+class _Loader():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, functions):
+        self._functions = functions
+
+    ########################################
+    #
+    ########################################
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        dll = _DLL(name, self._functions.get(name.lower()))
+        setattr(self, name, dll)
+        return dll
+
+    ########################################
+    #
+    ########################################
+    def LoadLibrary(self, name):
+        return _DLL(name)
+
+
+########################################
+#
+########################################
+def _clsid_from_string(text, ref):
+    ctypes.memmove(ctypes.addressof(ref._obj), uuid.UUID(text.strip('{}')).bytes_le, 16)
+    return 0
+
+
+########################################
+#
+########################################
+def _string_from_clsid(ref, result):
+    result._obj.value = '{' + str(uuid.UUID(bytes_le=ctypes.string_at(ctypes.addressof(ref._obj), 16))).upper() + '}'
+    return 0
+
+
+########################################
+# returns COM method prototype class of restype and argtypes
+########################################
+def _winfunctype(restype, *argtypes):
+    key = (restype, argtypes)
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        base = ctypes.CFUNCTYPE(restype, *argtypes)
+
+        # prototype(vtable index, name, paramflags, iid) creates a COM method
+        class prototype(base):
+            _flags_ = base._flags_
+            _restype_ = base._restype_
+            _argtypes_ = base._argtypes_
+            def __new__(cls, *args):
+                if len(args) == 4 and isinstance(args[0], int):
+                    return base.__new__(cls, _dummy_address())
+                return base.__new__(cls, *args)
+            def __init__(self, *args):
+                pass
+
+        _prototypes[key] = prototype
+    return prototype
+
+
+########################################
+# address of a C function that COM method stand-ins point to
+########################################
+def _dummy_address():
+    global _address
+    if _address is None:
+        _address = ctypes.cast(ctypes.pythonapi.Py_GetVersion, ctypes.c_void_p).value
+    return _address
+
+_address = None
+
+
+########################################
+# adds the Windows only ctypes parts, does nothing on Windows
+########################################
+def install():
+    if sys.platform == 'win32':
+        return
+    ole32 = {
+        'CLSIDFromString': _clsid_from_string,
+        'StringFromCLSID': _string_from_clsid,
+    }
+    # long is 32 bit on Windows
+    ctypes.c_long, ctypes.c_ulong = ctypes.c_int, ctypes.c_uint
+    ctypes.WINFUNCTYPE = _winfunctype
+    ctypes.HRESULT = _HRESULT
+    ctypes._SimpleCData = _SimpleCData
+    ctypes.windll = _Loader({'ole32': ole32})
+    ctypes.oledll = _Loader({'ole32': ole32})
+    ctypes.WinDLL = ctypes.OleDLL = _DLL
+    ctypes.FormatError = lambda code=None: f'error {code}'
+    ctypes.GetLastError = lambda: 0
+    ctypes.WinError = lambda code=None, descr=None: OSError(code, descr)
+    _ctypes.COMError = _COMError
+    _ctypes.CopyComPointer = lambda src, dst: 0
+    codecs.register(lambda name: codecs.lookup('cp1252') if name == 'mbcs' else None)
+
+
+if __name__ == '__main__':
+    # benchmark: import time of dshow (fresh interpreter each run, best of 15), with the
+    # COM interface methods created on first use, plus creating those of the interfaces
+    # the player uses, plus creating all of them (what the import used to do); and
+    # getting the method tables and derived metadata of all interfaces from the
+    # precompiled descriptors vs. from the source definitions (best of 20)
+    import os, subprocess, tempfile, time
+
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    USED = ['IFilterGraph', 'IGraphBuilder', 'IMediaControl', 'IMediaEventEx', 'IMediaSeeking',
+            'IBasicVideo', 'IVideoWindow', 'IBasicAudio', 'IBaseFilter', 'IPin', 'IEnumFilters',
+            'IEnumPins', 'IFileSourceFilter', 'IVMRFilterConfig9', 'IVMRWindowlessControl9',
+            'IVMRAspectRatioControl9', 'IVMRMixerControl9', 'IAMMediaContent']
+
+    CODE = '''
+import runpy, sys, time
+runpy.run_path({simcom!r})['install']()
+sys.path.insert(0, {root!r})
+t = time.perf_counter()
+import dshow, dshow.lib as lib
+t_import = time.perf_counter() - t
+names = {names!r}
+if names is None:
+    names = [n for n, v in vars(lib).items() if isinstance(v, type) and hasattr(v, '_materialize')]
+for name in names:
+    getattr(lib, name)._materialize()
+print(t_import, time.perf_counter() - t, len(names))
+'''
+
+    def _run(names, env=None):
+        code = CODE.format(simcom=os.path.abspath(__file__), root=ROOT, names=names)
+        return [float(v) for v in subprocess.check_output([sys.executable, '-c', code], env=env).split()]
+
+    # compiles the .pyc files
+    _run([], {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'})
+    for label, names in (('import', []), ('+ player interfaces', USED), ('+ all interfaces', None)):
+        runs = [_run(names) for i in range(15)]
+        print(f'{label:>20}: {1000 * min(r[1] for r in runs):5.1f} ms '
+              f'({int(runs[0][2])} interfaces created)')
+
+    install()
+    sys.path.insert(0, ROOT)
+    import dshow.comtypes, dshow.lib
+    from dshow.comtypes._descriptors import DescriptorCache
+
+    lazy = [(itf, itf.__dict__['_lazy_methods_']) for itf in vars(dshow.lib).values()
+            if isinstance(itf, type) and '_lazy_methods_' in itf.__dict__]
+
+    def _source():
+        for itf, func in lazy:
+            itf._make_layout(func())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = dshow.comtypes.use_descriptor_cache(os.path.join(tmp_dir, 'com_descriptors.cache'))
+        for itf, func in lazy:
+            itf._materialize()
+        cache.save()
+
+        def _cached():
+            cache = DescriptorCache(os.path.join(tmp_dir, 'com_descriptors.cache'))
+            for itf, func in lazy:
+                cache.get(itf, func)
+
+        res = {}
+        for func in (_source, _cached) * 2:
+            for i in range(20):
+                t = time.perf_counter()
+                func()
+                res[func] = min(res.get(func, 1), time.perf_counter() - t)
+        print(f'method tables + metadata of {len(lazy)} interfaces: {1000 * res[_source]:.2f} ms from source, '
+              f'{1000 * res[_cached]:.2f} ms from {os.path.getsize(cache.path) // 1024} KB descriptor cache')
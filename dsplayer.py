@@ -3,20 +3,21 @@ import os
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QWidget
 
-from dshow import Player
+from dshow import Player, IAMMediaContent
+from metadatawatch import MetadataWatcher
 
 # completely optional
 SUPPORT_LNK_FILES = True
 if SUPPORT_LNK_FILES:
     from dshow.lnk import get_lnk_target_path
 
-
 class VideoWidget(QWidget):
 
     mediaReady = pyqtSignal(bool)
     mousePressed = pyqtSignal()
     doubleClicked = pyqtSignal()
     metadataChanged = pyqtSignal(dict)
+    seekFinished = pyqtSignal()
 
     ########################################
     #
@@ -29,7 +30,6 @@ class VideoWidget(QWidget):
 
         self._media_loaded = False
         self._muted = False
-        self._metadata = None
 
         # make window background black
         self.setAutoFillBackground(True)
@@ -46,18 +46,21 @@ class VideoWidget(QWidget):
 
         self._volume = self._player.get_volume()
 
+        self._metadata_watcher = MetadataWatcher(IAMMediaContent)
+
         self._timer_metadata = QTimer(self)
-        self._timer_metadata.setInterval(5000)
+        self._timer_metadata.setSingleShot(True)
         self._timer_metadata.timeout.connect(self.__check_metadata)
 
     ########################################
-    #
+    # polled with adaptive interval, only streams can change their metadata
     ########################################
     def __check_metadata(self):
-        metadata = self.get_metadata()
-        if metadata != self._metadata:
-            self._metadata = metadata
+        metadata = self._metadata_watcher.poll()
+        if metadata is not None:
             self.metadataChanged.emit(metadata)
+        if self.is_url and not self.has_video() and self._metadata_watcher.interval:
+            self._timer_metadata.start(self._metadata_watcher.interval)
 
     ########################################
     #
@@ -75,9 +78,8 @@ class VideoWidget(QWidget):
                 self.filename = filename
                 self.is_url = filename.startswith('http:') or filename.startswith('https:')
                 self._media_loaded = True
+                self._metadata_watcher.attach(self._player.get_filter_graph())
                 self.__check_metadata()
-                if self.is_url and not self.has_video():
-                    self._timer_metadata.start()
         except Exception as e:
             print(e)
         self.mediaReady.emit(self._media_loaded)
@@ -92,6 +94,7 @@ class VideoWidget(QWidget):
             self._media_loaded = False
             self.repaint()
             self._timer_metadata.stop()
+            self._metadata_watcher.detach()
 
     ########################################
     #
@@ -157,11 +160,14 @@ class VideoWidget(QWidget):
         self._player.set_volume(0 if flag else self._volume)
 
     ########################################
-    # as seconds (float)
+    # as seconds (float), fast seeks go to the nearest keyframe. SetPositions
+    # returns once the graph was flushed, seekFinished is emitted on the next
+    # event loop turn
     ########################################
-    def seek_to_time(self, sec: float):
+    def seek_to_time(self, sec: float, fast: bool=False):
         if self._media_loaded:
-            self._player.set_time(sec * 1000)
+            self._player.set_time(sec * 1000, keyframe=fast)
+        QTimer.singleShot(0, self.seekFinished.emit)
 
     ########################################
     # as seconds (float)
@@ -197,7 +203,7 @@ class VideoWidget(QWidget):
     ########################################
     def get_metadata(self):
         if self._media_loaded:
-            return self._player.get_metadata()
+            return self._metadata_watcher.get_metadata()
 
     ########################################
     #
@@ -0,0 +1,261 @@
+'''
+Program guide of the TV livestream channels.
+
+EpgCache fetches the current and next shows of all channels in the background,
+at most max_pending requests at a time, and keeps them in memory, so tooltips
+and status bar texts are available without a request. An entry doesn't expire
+after a fixed TTL but when its current show ends: the next show (if known) takes
+over right away and the channel is fetched again in the background. Responses
+are decoded on the parser worker thread ('zapp_shows' decoder).
+'''
+
+from collections import deque
+import datetime
+from functools import partial
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from populate import JsonRecordParser, register_decoder
+
+__all__ = ['EpgCache']
+
+SHOWS_URL = 'https://api.zapp.mediathekview.de/v1/shows/'
+
+MAX_PENDING = 4
+
+# seconds, channels without program information are fetched again after this
+RETRY_INTERVAL = 600
+
+# times are shown in german time
+TIMEZONE = datetime.timezone(datetime.timedelta(hours=2))
+
+
+########################################
+# returns show dict with start and end as timestamps
+########################################
+def _parse_show(show):
+    title = f"{show['title']} - {show['subtitle']}" if show.get('subtitle') else show['title']
+    return {
+        'title': title,
+        'description': show.get('description') or '',
+        'start': datetime.datetime.fromisoformat(show['startTime']).timestamp(),
+        'end': datetime.datetime.fromisoformat(show['endTime']).timestamp(),
+    }
+
+
+########################################
+# returns list of show dicts of decoded response
+########################################
+def _extract_shows(res):
+    return [_parse_show(show) for show in res.get('shows', [])]
+
+
+register_decoder('zapp_shows', partial(JsonRecordParser, _extract_shows))
+
+
+########################################
+#
+########################################
+def _format_time(t):
+    return datetime.datetime.fromtimestamp(t, TIMEZONE).strftime('%H:%M')
+
+
+class EpgCache(QObject):
+
+    # channel_id, emitted when the shows of a channel were fetched or the current show ended
+    updated = pyqtSignal(str)
+
+    ########################################
+    # fetch(url, callback, provider=...) must call callback with (records, final),
+    # like Main._http_get
+    ########################################
+    def __init__(self, fetch, max_pending=MAX_PENDING, parent=None):
+        super().__init__(parent)
+        self._fetch = fetch
+        self._max_pending = max_pending
+        self._queue = deque()
+        self._pending = set()
+
+        # channel_id: list of show dicts, sorted by start
+        self._shows = {}
+        # channel_id: time the channel has to be fetched again
+        self._expires = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.__expire)
+
+        self.requests = 0
+
+    ########################################
+    # fetches channels that are not known or expired, already queued or
+    # running ones are skipped
+    ########################################
+    def fetch(self, channel_ids):
+        now = time.time()
+        for channel_id in channel_ids:
+            if channel_id in self._pending or channel_id in self._queue or self._expires.get(channel_id, 0) > now:
+                continue
+            self._queue.append(channel_id)
+        self.__next()
+
+    ########################################
+    # returns show dict (title, description, start, end) or None
+    ########################################
+    def current(self, channel_id):
+        now = time.time()
+        for show in self._shows.get(channel_id, ()):
+            if show['end'] > now:
+                return show if show['start'] <= now else None
+        return None
+
+    ########################################
+    # returns show dict or None
+    ########################################
+    def next(self, channel_id):
+        current = self.current(channel_id)
+        if current is None:
+            return None
+        for show in self._shows[channel_id]:
+            if show['start'] >= current['end']:
+                return show
+        return None
+
+    ########################################
+    # returns title of current show or None
+    ########################################
+    def title(self, channel_id):
+        show = self.current(channel_id)
+        return show['title'] if show else None
+
+    ########################################
+    # returns HTML or None
+    ########################################
+    def tooltip(self, channel_id):
+        show = self.current(channel_id)
+        if show is None:
+            return None
+        html = (f"<p>{_format_time(show['start'])} - {_format_time(show['end'])}<br><b>{show['title']}</b>"
+                f"<br><br>{show['description']}")
+        show = self.next(channel_id)
+        if show:
+            html += f"<br><br>{_format_time(show['start'])} {show['title']}"
+        return html
+
+    ########################################
+    #
+    ########################################
+    def __next(self):
+        while self._queue and len(self._pending) < self._max_pending:
+            channel_id = self._queue.popleft()
+            self._pending.add(channel_id)
+            self.requests += 1
+            self._fetch(SHOWS_URL + channel_id, partial(self.__loaded, channel_id), provider='zapp_shows')
+
+    ########################################
+    #
+    ########################################
+    def __loaded(self, channel_id, shows, final):
+        if not final:
+            return
+        self._pending.discard(channel_id)
+        # nothing is returned if request or decoding failed, known shows are kept then
+        if shows:
+            self._shows[channel_id] = sorted(shows, key=lambda show: show['start'])
+        show = self.current(channel_id)
+        self._expires[channel_id] = show['end'] if show else time.time() + RETRY_INTERVAL
+        self.__schedule()
+        self.updated.emit(channel_id)
+        self.__next()
+
+    ########################################
+    # current shows ended, next ones take over while channels are fetched again
+    ########################################
+    def __expire(self):
+        now = time.time()
+        expired = [channel_id for channel_id, t in self._expires.items() if t <= now]
+        for channel_id in expired:
+            del self._expires[channel_id]
+            self.updated.emit(channel_id)
+        self.fetch(expired)
+        self.__schedule()
+
+    ########################################
+    # timer fires when the first entry expires
+    ########################################
+    def __schedule(self):
+        if not self._expires:
+            self._timer.stop()
+            return
+        t = min(self._expires.values()) - time.time()
+        self._timer.start(max(0, min(int(1000 * t), 2**31 - 1)))
+
+
+if __name__ == '__main__':
+    # demo against a local stand-in for the zapp API: 40 channels, shows ending soon
+    import http.server, json, os, sys, threading
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+    from network import Network
+    from populate import BackgroundParser, decoder
+
+    N = 40
+    running = [0, 0]
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+            time.sleep(0.05)
+            now = datetime.datetime.now(datetime.timezone.utc)
+            end = now + datetime.timedelta(seconds=1 + int(self.path.rsplit('ch', 1)[1]) % 2)
+            body = json.dumps({'shows': [
+                {'title': 'Now ' + self.path, 'startTime': (now - datetime.timedelta(minutes=5)).isoformat(),
+                        'endTime': end.isoformat(), 'description': '...'},
+                {'title': 'Next ' + self.path, 'subtitle': 'Part 2', 'startTime': end.isoformat(),
+                        'endTime': (end + datetime.timedelta(minutes=30)).isoformat()},
+            ]}).encode()
+            running[0] -= 1
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    SHOWS_URL = f'http://127.0.0.1:{server.server_port}/shows/'
+
+    app = QCoreApplication(sys.argv)
+    network = Network()
+    bg_parser = BackgroundParser()
+
+    def _fetch(url, callback, provider):
+        finished, on_data, on_cancel = bg_parser.callbacks(decoder(provider), callback, provider)
+        network.get(url, finished, on_data=on_data, on_cancel=on_cancel)
+
+    epg = EpgCache(_fetch)
+    channel_ids = [f'ch{i}' for i in range(N)]
+    loop = QEventLoop()
+    epg.updated.connect(lambda channel_id: loop.quit() if all(epg.title(c) for c in channel_ids) else None)
+    t = time.perf_counter()
+    epg.fetch(channel_ids)
+    loop.exec_()
+    print(f'{N} channels in {1000 * (time.perf_counter() - t):.0f} ms, {epg.requests} requests, '
+          f'at most {running[1]} at a time')
+
+    t = time.perf_counter()
+    for i in range(1000):
+        for channel_id in channel_ids:
+            epg.tooltip(channel_id)
+    print(f'tooltip lookup: {1e6 * (time.perf_counter() - t) / (1000 * N):.1f} us')
+
+    epg.updated.disconnect()
+    QTimer.singleShot(2500, loop.quit)
+    loop.exec_()
+    print(f'after current shows ended: {epg.title("ch0")!r}, {epg.title("ch1")!r}, {epg.requests} requests')
+    print('decoded off the GUI thread:', {name: f'{n} payloads, {ms:.1f} ms'
+            for name, (n, size, ms) in bg_parser.stats().items()})
+    bg_parser.shutdown()
@@ -0,0 +1,388 @@
+'''
+Two-level HTTP response cache (in-memory LRU in front of a size-bounded disk cache).
+
+Each disk entry is stored in its own file (JSON header line followed by the raw
+body), so a lookup is a single read, recently used entries are kept in memory.
+Freshness follows the response's Cache-Control max-age (or Expires), responses
+with no-store are not cached. Without explicit freshness information a heuristic
+per-provider TTL is used. Stale entries are kept (and may be served while being
+revalidated) until max_stale is reached, revalidation uses the stored
+ETag/Last-Modified validators.
+'''
+
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
+import os
+import time
+
+__all__ = ['HttpCache', 'CacheEntry', 'parse_cache_control']
+
+# seconds, heuristic freshness if response has no Cache-Control/Expires
+DEFAULT_TTLS = {
+    'shoutcast': 86400,
+    'shoutcast_stations': 3600,
+    'somafm': 86400,
+    'tunein': 86400,
+    'zapp': 86400,
+}
+DEFAULT_TTL = 0
+MAX_STALE = 30 * 86400
+
+# bytes
+MAX_DISK_SIZE = 64 * 2**20
+MAX_MEMORY_SIZE = 8 * 2**20
+# header lines are padded, so a 304 can update them in place without rewriting the body
+HEADER_PADDING = 32
+
+
+class CacheEntry():
+
+    __slots__ = ('url', 'body', 'etag', 'last_modified', 'provider', 'fetched', 'max_age')
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, url, body, etag=None, last_modified=None, provider=None, fetched=None, max_age=None):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.provider = provider
+        self.fetched = time.time() if fetched is None else fetched
+        self.max_age = max_age
+
+
+########################################
+# returns dict, directives without value are mapped to True
+########################################
+def parse_cache_control(value):
+    res = {}
+    for part in value.split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            res[name.lower()] = arg.strip('"') if arg else True
+    return res
+
+
+########################################
+# header is a callable that returns a response header or None,
+# returns (storable, max_age in seconds or None)
+########################################
+def _freshness(header):
+    cc = parse_cache_control(header('Cache-Control') or '')
+    if 'no-store' in cc:
+        return False, None
+    if 'no-cache' in cc:
+        return True, 0
+    if 'max-age' in cc:
+        try:
+            return True, max(0, int(cc['max-age']) - int(header('Age') or 0))
+        except ValueError:
+            return True, 0
+    if header('Expires'):
+        try:
+            expires = parsedate_to_datetime(header('Expires')).timestamp()
+            date = parsedate_to_datetime(header('Date')).timestamp() if header('Date') else time.time()
+            return True, max(0, int(expires - date))
+        except (TypeError, ValueError):
+            # invalid Expires means already expired
+            return True, 0
+    return True, None
+
+
+class HttpCache():
+
+    ########################################
+    # without cache_dir, entries are only kept in memory
+    ########################################
+    def __init__(self, cache_dir=None, ttls=None, default_ttl=DEFAULT_TTL, max_stale=MAX_STALE,
+            max_disk_size=MAX_DISK_SIZE, max_memory_size=MAX_MEMORY_SIZE):
+        self._cache_dir = cache_dir
+        self._ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self._ttls.update(ttls)
+        self._default_ttl = default_ttl
+        self._max_stale = max_stale
+        self._max_disk_size = max_disk_size
+        self._max_memory_size = max_memory_size
+
+        # url: CacheEntry, least recently used first
+        self._memory = OrderedDict()
+        self._memory_size = 0
+
+        # filename: size, least recently used first
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            files = []
+            for f in os.scandir(cache_dir):
+                if f.name.endswith('.cache'):
+                    st = f.stat()
+                    files.append((st.st_mtime, f.name, st.st_size))
+            for mtime, fn, size in sorted(files):
+                self._disk[fn] = size
+                self._disk_size += size
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    ########################################
+    #
+    ########################################
+    def _filename(self, url):
+        return hashlib.sha1(url.encode()).hexdigest() + '.cache'
+
+    ########################################
+    #
+    ########################################
+    def _load(self, url):
+        fn = self._filename(url)
+        if fn not in self._disk:
+            return None
+        path = os.path.join(self._cache_dir, fn)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                body = f.read()
+            # mtime is used for LRU order on next start
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if header.get('url') != url:
+            return None
+        self._disk.move_to_end(fn)
+        return CacheEntry(url, body, header.get('etag'), header.get('last_modified'),
+                header.get('provider'), header.get('fetched', 0), header.get('max_age'))
+
+    ########################################
+    # returns header line of entry, padded with spaces to at least size bytes
+    ########################################
+    def _header_line(self, entry, size=0):
+        line = json.dumps({
+            'url': entry.url,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'provider': entry.provider,
+            'fetched': entry.fetched,
+            'max_age': entry.max_age,
+        }).encode()
+        return line.ljust(size - 1 if size else len(line) + HEADER_PADDING) + b'\n'
+
+    ########################################
+    #
+    ########################################
+    def _save(self, entry):
+        self._remember(entry)
+        if not self._cache_dir:
+            return
+        fn = self._filename(entry.url)
+        path = os.path.join(self._cache_dir, fn)
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                f.write(self._header_line(entry))
+                f.write(entry.body)
+                size = f.tell()
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print('httpcache: writing entry failed:', e)
+            return
+        self._disk_size += size - self._disk.pop(fn, 0)
+        self._disk[fn] = size
+        while self._disk_size > self._max_disk_size and len(self._disk) > 1:
+            fn, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self._cache_dir, fn))
+            except OSError:
+                pass
+
+    ########################################
+    # rewrites only the header line of the entry's file, falls back to _save if
+    # the new header doesn't fit into the old one's padding
+    ########################################
+    def _save_header(self, entry):
+        self._remember(entry)
+        if not self._cache_dir:
+            return
+        fn = self._filename(entry.url)
+        if fn not in self._disk:
+            self._save(entry)
+            return
+        path = os.path.join(self._cache_dir, fn)
+        try:
+            with open(path, 'r+b') as f:
+                size = len(f.readline())
+                line = self._header_line(entry, size)
+                if len(line) == size:
+                    f.seek(0)
+                    f.write(line)
+                    self._disk.move_to_end(fn)
+                    return
+        except OSError as e:
+            print('httpcache: updating entry failed:', e)
+        self._save(entry)
+
+    ########################################
+    #
+    ########################################
+    def _drop(self, url):
+        old = self._memory.pop(url, None)
+        if old is not None:
+            self._memory_size -= len(old.body)
+        fn = self._filename(url)
+        if fn in self._disk:
+            self._disk_size -= self._disk.pop(fn)
+            try:
+                os.remove(os.path.join(self._cache_dir, fn))
+            except OSError:
+                pass
+
+    ########################################
+    # adds entry to memory LRU
+    ########################################
+    def _remember(self, entry):
+        old = self._memory.pop(entry.url, None)
+        if old is not None:
+            self._memory_size -= len(old.body)
+        if len(entry.body) > self._max_memory_size // 4:
+            return
+        self._memory[entry.url] = entry
+        self._memory_size += len(entry.body)
+        while self._memory_size > self._max_memory_size:
+            url, old = self._memory.popitem(last=False)
+            self._memory_size -= len(old.body)
+
+    ########################################
+    #
+    ########################################
+    def ttl(self, provider):
+        return self._ttls.get(provider, self._default_ttl)
+
+    ########################################
+    # seconds
+    ########################################
+    def age(self, entry):
+        return time.time() - entry.fetched
+
+    ########################################
+    #
+    ########################################
+    def is_fresh(self, entry):
+        return self.age(entry) < (entry.max_age if entry.max_age is not None else self.ttl(entry.provider))
+
+    ########################################
+    # returns CacheEntry (possibly stale) or None
+    ########################################
+    def get(self, url):
+        entry = self._memory.get(url)
+        if entry is not None:
+            self._memory.move_to_end(url)
+            self.memory_hits += 1
+        elif self._cache_dir:
+            entry = self._load(url)
+            if entry is not None:
+                self._remember(entry)
+        if entry is None or self.age(entry) > self._max_stale:
+            self.misses += 1
+            return None
+        if self.is_fresh(entry):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    ########################################
+    # returns CacheEntry or None if the response must not be stored, header is a
+    # callable that returns a response header or None
+    ########################################
+    def store(self, url, body, header, provider=None):
+        storable, max_age = _freshness(header)
+        if not storable:
+            return None
+        entry = CacheEntry(url, body, header('ETag'), header('Last-Modified'), provider, max_age=max_age)
+        self._save(entry)
+        return entry
+
+    ########################################
+    #
+    ########################################
+    def put(self, url, body, etag=None, last_modified=None, provider=None, max_age=None):
+        entry = CacheEntry(url, body, etag, last_modified, provider, max_age=max_age)
+        self._save(entry)
+        return entry
+
+    ########################################
+    # server answered 304 Not Modified, so entry is fresh again. If the new headers
+    # forbid storing it, the entry is dropped. Only its metadata is written.
+    ########################################
+    def touch(self, entry, header=None):
+        self.not_modified += 1
+        entry.fetched = time.time()
+        if header is not None:
+            storable, max_age = _freshness(header)
+            if not storable:
+                self._drop(entry.url)
+                return
+            if header('Cache-Control') or header('Expires'):
+                entry.max_age = max_age
+        self._save_header(entry)
+
+    ########################################
+    # returns dict describing the cached entry, or None
+    ########################################
+    def inspect(self, url):
+        in_memory = url in self._memory
+        entry = self._memory[url] if in_memory else (self._load(url) if self._cache_dir else None)
+        if entry is None:
+            return None
+        return {
+            'url': url,
+            'provider': entry.provider,
+            'size': len(entry.body),
+            'age': self.age(entry),
+            'max_age': entry.max_age,
+            'fresh': self.is_fresh(entry),
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'in_memory': in_memory,
+            'on_disk': self._filename(url) in self._disk,
+        }
+
+    ########################################
+    #
+    ########################################
+    def clear(self):
+        self._memory.clear()
+        self._memory_size = 0
+        for fn in self._disk:
+            try:
+                os.remove(os.path.join(self._cache_dir, fn))
+            except OSError:
+                pass
+        self._disk.clear()
+        self._disk_size = 0
+
+    ########################################
+    #
+    ########################################
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'evictions': self.evictions,
+            'memory_entries': len(self._memory),
+            'memory_size': self._memory_size,
+            'disk_entries': len(self._disk),
+            'disk_size': self._disk_size,
+        }
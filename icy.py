@@ -0,0 +1,171 @@
+'''
+Platform-neutral incremental demuxer for SHOUTcast/Icecast (ICY) streams.
+
+An ICY stream interleaves <metaint> bytes of audio with a metadata block, whose
+first byte is its length divided by 16. The demuxer accepts chunks with arbitrary
+boundaries, hands audio payload on as memoryview slices (no copies) and only
+buffers the (small) metadata blocks.
+'''
+
+import re
+
+__all__ = ['IcyDemuxer', 'parse_metadata']
+
+# the terminating ';' of the last field is optional, some servers omit it
+_RE_FIELD = re.compile(r"([A-Za-z_]+)=(?:'(.*?)'|([^;]*))(?:;(?=\s*[A-Za-z_]+=)|;?\s*$)", re.S)
+
+
+########################################
+# returns metadata as dict, e.g. {'title': 'Artist - Song', 'url': ''}
+########################################
+def parse_metadata(data):
+    data = bytes(data).rstrip(b'\0').strip()
+    for encoding in ('utf-8', 'cp1252'):
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            pass
+    else:
+        text = data.decode('latin-1')
+    metadata = {}
+    for k, quoted, plain in _RE_FIELD.findall(text):
+        k = k.lower()
+        if k.startswith('stream'):
+            k = k[6:]
+        metadata[k] = quoted if plain == '' else plain.strip()
+    return metadata
+
+
+class IcyDemuxer():
+
+    ########################################
+    # on_audio (optional) is called with memoryview slices of the audio payload
+    ########################################
+    def __init__(self, metaint, on_audio=None):
+        if metaint <= 0:
+            raise ValueError('metaint must be positive')
+        self._metaint = metaint
+        self._on_audio = on_audio
+        self._audio_left = metaint
+        self._meta_left = None
+        self._meta = bytearray()
+
+        self.bytes_processed = 0
+
+    ########################################
+    # returns list of parsed metadata dicts completed by this chunk
+    ########################################
+    def feed(self, data):
+        view = memoryview(data).cast('B')
+        size = len(view)
+        self.bytes_processed += size
+        res = []
+        pos = 0
+        while pos < size:
+            if self._meta_left is None:
+                if self._audio_left:
+                    n = min(self._audio_left, size - pos)
+                    if self._on_audio:
+                        self._on_audio(view[pos:pos + n])
+                    pos += n
+                    self._audio_left -= n
+                    continue
+                self._meta_left = view[pos] << 4
+                pos += 1
+            else:
+                n = min(self._meta_left, size - pos)
+                self._meta += view[pos:pos + n]
+                pos += n
+                self._meta_left -= n
+            if self._meta_left == 0:
+                if self._meta:
+                    metadata = parse_metadata(self._meta)
+                    if metadata:
+                        res.append(metadata)
+                    self._meta = bytearray()
+                self._meta_left = None
+                self._audio_left = self._metaint
+        return res
+
+
+if __name__ == '__main__':
+    # self-check: random chunk splits (incl. 1-byte chunks, empty metadata blocks and
+    # metadata split across chunks) must give the same result as a reference split,
+    # then a throughput benchmark with randomly sized chunks
+    import random, time
+
+    def _reference(stream, metaint):
+        audio, blocks = bytearray(), []
+        pos = 0
+        while pos < len(stream):
+            audio += stream[pos:pos + metaint]
+            pos += metaint
+            if pos >= len(stream):
+                break
+            size = stream[pos] << 4
+            meta = stream[pos + 1:pos + 1 + size]
+            pos += 1 + size
+            # a truncated trailing block is never completed
+            if meta and pos <= len(stream) and parse_metadata(meta):
+                blocks.append(parse_metadata(meta))
+        return bytes(audio), blocks
+
+    for block, expected in (
+            (b"StreamTitle='x'", {'title': 'x'}),
+            (b"StreamTitle='x';\0\0", {'title': 'x'}),
+            (b"StreamTitle='a;b';StreamUrl='';", {'title': 'a;b', 'url': ''}),
+            (b"StreamTitle=plain", {'title': 'plain'})):
+        assert parse_metadata(block) == expected, block
+
+    random.seed(1)
+    for run in range(300):
+        metaint = random.choice((1, 2, 16, 255, 1000))
+        stream = bytearray()
+        for i in range(random.randint(0, 20)):
+            stream += bytes(random.getrandbits(8) for _ in range(metaint))
+            if random.random() < 0.4:
+                stream += b'\0'
+            else:
+                meta = f"StreamTitle='Song {i}; it''s {'x' * random.randint(0, 40)}';".encode()
+                meta += b'\0' * (-len(meta) % 16)
+                stream += bytes([len(meta) >> 4]) + meta
+        stream = bytes(stream[:len(stream) - random.randint(0, 3)])
+        max_chunk = random.choice((1, 2, 7, 64, len(stream) + 1))
+        audio = bytearray()
+        demuxer = IcyDemuxer(metaint, audio.extend)
+        blocks = []
+        pos = 0
+        while pos < len(stream):
+            n = random.randint(0, max_chunk)
+            blocks += demuxer.feed(stream[pos:pos + n])
+            pos += n
+        assert (bytes(audio), blocks) == _reference(stream, metaint), (run, metaint, max_chunk)
+        assert demuxer.bytes_processed == len(stream)
+    print(f'self-check: {run + 1} random chunk splits OK')
+
+    METAINT = 16000
+    MB = 64
+    random.seed(0)
+    audio = bytes(random.getrandbits(8) for _ in range(METAINT))
+    stream = bytearray()
+    for i in range(MB * 2**20 // METAINT):
+        stream += audio
+        if i % 10:
+            stream += b'\0'
+        else:
+            meta = f"StreamTitle='Artist {i} - Song; Don't {i}';StreamUrl='';".encode()
+            meta += b'\0' * (-len(meta) % 16)
+            stream += bytes([len(meta) >> 4]) + meta
+    view = memoryview(stream)
+    for chunk_size in (1024, 16384, 65536):
+        demuxer = IcyDemuxer(METAINT)
+        blocks = 0
+        pos = 0
+        t = time.perf_counter()
+        while pos < len(view):
+            n = random.randint(1, 2 * chunk_size)
+            blocks += len(demuxer.feed(view[pos:pos + n]))
+            pos += n
+        t = time.perf_counter() - t
+        print(f'chunks ~{chunk_size:>6} bytes: {len(stream) / 2**20 / t:8.1f} MB/s, {blocks} metadata blocks')
@@ -0,0 +1,209 @@
+'''
+Reads SHOUTcast/Icecast (ICY) metadata over a single long-lived HTTP connection.
+
+Instead of re-requesting the stream periodically, the connection is kept open and
+metadata blocks are demuxed incrementally as bytes arrive, so metadataChanged is
+emitted as soon as the server announces a new title.
+'''
+
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QUrl
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest
+
+from icy import IcyDemuxer
+
+RECONNECT_DELAY = 5000
+MAX_RECONNECTS = 3
+
+
+class IcyReader(QObject):
+
+    # True if server sent icy-metaint, False otherwise (or on error)
+    ready = pyqtSignal(bool)
+    metadataChanged = pyqtSignal(dict)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, parent=None, net_manager=None):
+        super().__init__(parent)
+        self._net_manager = net_manager if net_manager else QNetworkAccessManager(self)
+        self._url = None
+        self._reply = None
+        self._demuxer = None
+        self._metaint = 0
+        self._metadata = None
+        self._got_headers = False
+        self._reconnects = 0
+
+        self._timer_reconnect = QTimer(self)
+        self._timer_reconnect.setSingleShot(True)
+        self._timer_reconnect.setInterval(RECONNECT_DELAY)
+        self._timer_reconnect.timeout.connect(self.__connect)
+
+    ########################################
+    #
+    ########################################
+    def start(self, url: str):
+        self.stop()
+        self._url = url
+        self._metadata = None
+        self._reconnects = 0
+        self._got_headers = False
+        self.__connect()
+
+    ########################################
+    #
+    ########################################
+    def stop(self):
+        self._url = None
+        self._timer_reconnect.stop()
+        self.__close_reply()
+
+    ########################################
+    #
+    ########################################
+    def __close_reply(self):
+        if self._reply:
+            reply, self._reply = self._reply, None
+            reply.abort()
+            reply.deleteLater()
+        self._demuxer = None
+
+    ########################################
+    #
+    ########################################
+    def __connect(self):
+        if self._url is None:
+            return
+        req = QNetworkRequest(QUrl(self._url))
+        req.setRawHeader(b'Icy-MetaData', b'1')
+        req.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        self._reply = self._net_manager.get(req)
+        self._reply.metaDataChanged.connect(self.__headers_received)
+        self._reply.readyRead.connect(self.__data_received)
+        self._reply.finished.connect(self.__finished)
+
+    ########################################
+    #
+    ########################################
+    def __headers_received(self):
+        reply = self.sender()
+        if reply is not self._reply or self._demuxer is not None:
+            return
+        try:
+            metaint = int(reply.rawHeader(b'icy-metaint').data() or 0)
+        except ValueError:
+            metaint = 0
+        if metaint <= 0:
+            # no redirect target left and still no ICY headers, so not an ICY stream
+            if not reply.attribute(QNetworkRequest.RedirectionTargetAttribute):
+                self.__close_reply()
+                self._url = None
+                self.__set_ready(False)
+            return
+        self._metaint = metaint
+        self._demuxer = IcyDemuxer(metaint)
+        self.__set_ready(True)
+
+    ########################################
+    #
+    ########################################
+    def __data_received(self):
+        reply = self.sender()
+        if reply is not self._reply:
+            return
+        data = reply.readAll()
+        if self._demuxer is None:
+            return
+        for metadata in self._demuxer.feed(data):
+            if metadata != self._metadata:
+                self._metadata = metadata
+                self.metadataChanged.emit(metadata)
+        # only a connection that delivered at least one full audio block counts as
+        # working, so a server that answers and then drops is not retried forever
+        if self._reconnects and self._demuxer.bytes_processed > self._metaint:
+            self._reconnects = 0
+
+    ########################################
+    # server closed the connection, try to reconnect
+    ########################################
+    def __finished(self):
+        reply = self.sender()
+        if reply is not self._reply:
+            return
+        self.__close_reply()
+        if not self._got_headers:
+            self._url = None
+            self.__set_ready(False)
+        elif self._reconnects < MAX_RECONNECTS:
+            self._reconnects += 1
+            self._timer_reconnect.start()
+
+    ########################################
+    #
+    ########################################
+    def __set_ready(self, is_icy):
+        if not self._got_headers:
+            self._got_headers = True
+            self.ready.emit(is_icy)
+
+
+if __name__ == '__main__':
+    # demo against a local stand-in ICY server: a few titles on one connection, and
+    # a server with a broken icy-metaint header
+    import http.server, os, sys, threading, time
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+    METAINT = 8192
+    TITLES = 3
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.0'
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/mpeg')
+            self.send_header('icy-metaint', 'abc' if self.path == '/broken' else str(METAINT))
+            self.end_headers()
+            if self.path == '/broken':
+                return
+            for i in range(TITLES):
+                meta = f"StreamTitle='Song {i}';StreamUrl='';".encode()
+                meta += b'\0' * (-len(meta) % 16)
+                # the same title in two blocks, then an empty block
+                for block in (meta, meta, b''):
+                    self.wfile.write(b'\xff' * METAINT + bytes([len(block) >> 4]) + block)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            time.sleep(1)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    URL = f'http://127.0.0.1:{server.server_port}'
+
+    app = QCoreApplication(sys.argv)
+    reader = IcyReader()
+    loop = QEventLoop()
+    titles = []
+
+    def _metadata_changed(metadata):
+        titles.append(metadata['title'])
+        print('title:', metadata['title'])
+        if len(titles) == TITLES:
+            loop.quit()
+
+    reader.ready.connect(lambda is_icy: print('ready:', is_icy))
+    reader.metadataChanged.connect(_metadata_changed)
+    QTimer.singleShot(5000, loop.quit)
+    reader.start(URL + '/stream')
+    loop.exec_()
+    reader.stop()
+    assert titles == [f'Song {i}' for i in range(TITLES)], titles
+
+    reader.ready.disconnect()
+    reader.ready.connect(lambda is_icy: (print('ready (broken icy-metaint):', is_icy), loop.quit()))
+    reader.start(URL + '/broken')
+    loop.exec_()
+    reader.stop()
@@ -0,0 +1,285 @@
+'''
+Keyframe and frame index of local video files.
+
+KeyframeIndex holds the presentation times of a file's keyframes and frames,
+built by containerprobe.read_index() from the MP4 sample tables or the Matroska
+Cues, which only touches container metadata. It snaps seek targets to keyframes
+(a seek to a keyframe needs no decoding from the start of the GOP) and returns
+exact frame timestamps for frame stepping.
+
+KeyframeIndexer builds indexes on a worker thread and keeps them in a disk
+cache keyed by path, size and mtime, so reopening a file loads its index in
+about a millisecond.
+'''
+
+from array import array
+from bisect import bisect_left, bisect_right
+import hashlib
+import os
+import struct
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+import containerprobe
+
+__all__ = ['KeyframeIndex', 'KeyframeIndexer']
+
+MAX_CACHED = 500
+CACHE_VERSION = 1
+
+# seconds, tolerance for timestamps
+EPSILON = 1e-6
+
+HEADER = struct.Struct('<4sIId')
+MAGIC = b'KFI1'
+
+
+class KeyframeIndex():
+
+    ########################################
+    # keyframes and frames are sorted arrays of seconds, if frames is empty, the
+    # frame rate is assumed to be constant (frame_duration in seconds)
+    ########################################
+    def __init__(self, keyframes, frames=None, frame_duration=0):
+        self.keyframes = keyframes
+        self.frames = frames if frames is not None else array('d')
+        self.frame_duration = frame_duration
+
+    ########################################
+    # returns time (seconds) of keyframe closest to t, or t if there are none
+    ########################################
+    def keyframe(self, t):
+        i = bisect_left(self.keyframes, t)
+        candidates = self.keyframes[max(0, i - 1):i + 1]
+        return min(candidates, key=lambda k: abs(k - t)) if candidates else t
+
+    ########################################
+    # returns time (seconds) of the frame steps frames away from the one shown at
+    # t, or None if frame times are unknown
+    ########################################
+    def step(self, t, steps):
+        if self.frames:
+            i = bisect_right(self.frames, t + EPSILON) - 1
+            return self.frames[min(max(0, i + steps), len(self.frames) - 1)]
+        if self.frame_duration > 0:
+            return max(0, int(t / self.frame_duration + EPSILON) + steps) * self.frame_duration
+        return None
+
+    ########################################
+    #
+    ########################################
+    def to_bytes(self):
+        return (HEADER.pack(MAGIC, len(self.keyframes), len(self.frames), self.frame_duration) +
+                self.keyframes.tobytes() + self.frames.tobytes())
+
+    ########################################
+    #
+    ########################################
+    @classmethod
+    def from_bytes(cls, data):
+        magic, keyframe_count, frame_count, frame_duration = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('invalid index')
+        keyframes, frames = array('d'), array('d')
+        pos = HEADER.size
+        keyframes.frombytes(data[pos:pos + 8 * keyframe_count])
+        pos += 8 * keyframe_count
+        frames.frombytes(data[pos:pos + 8 * frame_count])
+        return cls(keyframes, frames, frame_duration)
+
+    ########################################
+    # returns index of video file at path or None
+    ########################################
+    @classmethod
+    def build(cls, path):
+        res = containerprobe.read_index(path)
+        if res is None:
+            return None
+        return cls(res['keyframes'], res.get('frames'), res.get('frame_duration', 0))
+
+
+class _IndexWorker(QObject):
+
+    built = pyqtSignal(str, object)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, indexer):
+        super().__init__()
+        self._indexer = indexer
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(str, str)
+    def build(self, path, key):
+        # superseded by another file
+        if path != self._indexer._path:
+            return
+        index = KeyframeIndex.build(path)
+        if index is not None:
+            self._indexer._store(key, index)
+        self.built.emit(path, index)
+
+
+class KeyframeIndexer(QObject):
+
+    # path, KeyframeIndex or None
+    ready = pyqtSignal(str, object)
+
+    _build = pyqtSignal(str, str)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self._cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._path = None
+        self._thread = QThread(self)
+        self._worker = _IndexWorker(self)
+        self._worker.moveToThread(self._thread)
+        self._build.connect(self._worker.build)
+        self._worker.built.connect(self.__built)
+        self._thread.start()
+
+    ########################################
+    # returns cache key of file or None if it doesn't exist
+    ########################################
+    def key(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return hashlib.sha1(f'{CACHE_VERSION}\0{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}'
+                .encode()).hexdigest()
+
+    ########################################
+    # ready is emitted at once if the index is cached, otherwise once it's built
+    ########################################
+    def request(self, path):
+        self._path = path
+        key = self.key(path)
+        if key is None:
+            return
+        fn = os.path.join(self._cache_dir, key + '.idx')
+        try:
+            with open(fn, 'rb') as f:
+                index = KeyframeIndex.from_bytes(f.read())
+            os.utime(fn)
+        except (OSError, ValueError, struct.error):
+            self._build.emit(path, key)
+            return
+        self.ready.emit(path, index)
+
+    ########################################
+    # index of the last requested file isn't needed anymore
+    ########################################
+    def clear(self):
+        self._path = None
+
+    ########################################
+    #
+    ########################################
+    def shutdown(self):
+        self.clear()
+        self._thread.quit()
+        self._thread.wait()
+
+    ########################################
+    # called on the worker thread
+    ########################################
+    def _store(self, key, index):
+        try:
+            with open(os.path.join(self._cache_dir, key + '.idx'), 'wb') as f:
+                f.write(index.to_bytes())
+            files = sorted((f.stat().st_mtime, f.path) for f in os.scandir(self._cache_dir) if f.name.endswith('.idx'))
+            for mtime, fn in files[:max(0, len(files) - MAX_CACHED)]:
+                os.remove(fn)
+        except OSError as e:
+            print('keyframes: writing cache failed:', e)
+
+    ########################################
+    #
+    ########################################
+    def __built(self, path, index):
+        if path == self._path:
+            self.ready.emit(path, index)
+
+
+if __name__ == '__main__':
+    # benchmark: index of a (generated, or passed) 2 h 25 fps MP4 with B-frames and a
+    # keyframe about every 2 s: build and cached load time, and frames the backend has to
+    # decode for precise seeks while scrubbing, at the requested positions vs.
+    # snapped to keyframes
+    import random, sys, tempfile, time
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+    app = QCoreApplication(sys.argv)
+
+    def _box(box_type, *payloads):
+        data = b''.join(payloads)
+        return struct.pack('>I4s', 8 + len(data), box_type.encode()) + data
+
+    def _write_mp4(path, frames, timescale=90000, fps=25, gop=49):
+        delta = timescale // fps
+        # decode order I P B B P B B ..., B-frames are shown before the preceding P-frame
+        offsets = [delta if i % gop == 0 else (3 * delta if i % gop % 3 == 1 else 0) for i in range(frames)]
+        stbl = _box('stbl',
+            _box('stsd', struct.pack('>II', 0, 1), _box('avc1', bytes(24), struct.pack('>HH', 1920, 1080), bytes(50))),
+            _box('stts', struct.pack('>III', 0, 1, frames), struct.pack('>I', delta)),
+            _box('ctts', struct.pack('>II', 0, frames), b''.join(struct.pack('>II', 1, o) for o in offsets)),
+            _box('stss', struct.pack('>II', 0, frames // gop), b''.join(struct.pack('>I', i + 1) for i in range(0, frames, gop))))
+        trak = _box('trak',
+            _box('tkhd', bytes(84)),
+            _box('edts', _box('elst', struct.pack('>IIIiI', 0, 1, frames * delta, delta, 1 << 16))),
+            _box('mdia',
+                _box('mdhd', struct.pack('>I8xIIH2x', 0, timescale, frames * delta, 0x15C7)),
+                _box('hdlr', struct.pack('>I4s4s12x', 0, b'\0\0\0\0', b'vide'), b'Video\0'),
+                _box('minf', stbl)))
+        with open(path, 'wb') as f:
+            f.write(_box('ftyp', b'isom\0\0\0\0isomavc1'))
+            f.write(struct.pack('>I4s', 8, b'mdat'))
+            f.write(_box('moov', _box('mvhd', struct.pack('>I8xII', 0, 1000, frames * 40), bytes(80)), trak))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            path = sys.argv[1]
+        else:
+            path = os.path.join(tmp_dir, 'sample.mp4')
+            _write_mp4(path, 2 * 3600 * 25)
+
+        for run in ('first open', 'second open'):
+            indexer = KeyframeIndexer(os.path.join(tmp_dir, 'cache'))
+            loop = QEventLoop()
+            res = []
+            indexer.ready.connect(lambda p, index: res.append(index) or loop.quit())
+            t = time.perf_counter()
+            indexer.request(path)
+            if not res:
+                loop.exec_()
+            print(f'{run:>11}: index ready after {1000 * (time.perf_counter() - t):6.1f} ms')
+            indexer.shutdown()
+        index = res[0]
+        print(f'{len(index.keyframes)} keyframes, {len(index.frames)} frames, '
+              f'first frames {[round(t, 3) for t in index.frames[:4]]}')
+
+        # precise seek decodes from the preceding keyframe up to the target
+        fps = 1 / (index.frames[1] - index.frames[0]) if len(index.frames) > 1 else 25
+        targets = [random.uniform(0, index.frames[-1]) for i in range(1000)]
+        def _decoded(t):
+            return (t - index.keyframes[max(0, bisect_right(index.keyframes, t + EPSILON) - 1)]) * fps
+        naive = sum(_decoded(t) for t in targets) / len(targets)
+        snapped = sum(_decoded(index.keyframe(t)) for t in targets) / len(targets)
+        t = time.perf_counter()
+        for target in targets:
+            index.keyframe(target)
+            index.step(target, -1)
+        t_lookup = (time.perf_counter() - t) / len(targets)
+        print(f'scrubbing: {naive:.1f} frames decoded per seek at requested positions, {snapped:.1f} snapped '
+              f'to keyframes; snap + step lookup {1e6 * t_lookup:.1f} us')
+        t = 1234.5678
+        print(f'stepping from {t}: back {index.step(t, -1):.3f}, forward {index.step(t, 1):.3f} '
+              f'(fixed 100 ms guess: {t - .1:.3f}, {t + .1:.3f})')
@@ -1,23 +1,38 @@
-import datetime
+from functools import partial
+from operator import itemgetter
 import json
 import os
-import subprocess
 import sys
 import time
 import traceback
 import urllib.parse
-from xml.dom import minidom
 
-from PyQt5.QtCore import Qt, QResource, QTimer, QTime, QEvent, pyqtSignal, QUrl, QSettings, QRect
-from PyQt5.QtGui import QColor, QKeySequence, QCursor
+from PyQt5.QtCore import (Qt, QResource, QTimer, QTime, QEvent, pyqtSignal, QSettings, QRect,
+        QStandardPaths)
+from PyQt5.QtGui import QColor, QKeySequence, QCursor, QTextCursor
 from PyQt5.QtWidgets import (qApp, QMainWindow, QApplication, QWidget, QLabel, QDialog,
         QSizePolicy, QActionGroup, QMessageBox, QFileDialog, QInputDialog,
-        QListWidgetItem, QTreeWidgetItem, QMenu, QAction)
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest
+        QTreeWidgetItem, QMenu, QAction)
 from PyQt5 import uic
 
 from dark import palette
 from clickableslider import ClickableSlider
+from dirparse import RecordParser, TuneInParser
+from populate import BackgroundParser, ChunkedInserter, JsonRecordParser, decoder, register_decoder
+from models import RecordListModel, PagedRecordListModel
+from stationindex import StationIndex, StationCrawler
+from network import shared_network
+from playlist import PlaylistResolver, is_playlist_url
+from prefetch import Prefetcher
+from streamprobe import StreamProber
+from epg import EpgCache
+import tvsearch
+from playclock import PlaybackClock, next_change
+from seekscheduler import SeekScheduler
+from resume import ResumeStore
+from mediainfo import MediaInfoProbe
+from keyframes import KeyframeIndexer
+from thumbnails import FfmpegDecoder, ThumbnailGenerator, ThumbnailPreview
 
 APP_NAME = 'MediaPlayerSE'
 APP_VERSION = '0.1'
@@ -43,13 +58,35 @@ if IS_WIN:
     windll.dwmapi.DwmSetWindowAttribute.argtypes = (HWND, DWORD, LPCVOID, DWORD)
     DWMWA_USE_IMMERSIVE_DARK_MODE = 20
 
-TIME_DISPLAY_UPDATE_PERIOD = 250
+    from dshow.comtypes import use_descriptor_cache
+
+# ms, playback position of files and VOD URLs is remembered for resuming
+RESUME_CHECKPOINT_INTERVAL = 10000
+
+# ms, time display is updated when the shown second or slider position changes, but not more often
+TIME_DISPLAY_MIN_INTERVAL = 40
+SEARCH_MIN_LENGTH = 2
+# number of search results/favorites whose streams are health checked
+MAX_PROBED_ROWS = 20
+# ms, search results are only health checked once typing settled
+PROBE_DELAY = 500
+OFFLINE_COLOR = QColor('#808080')
 
 
 NETRADIO_SHOUTCAST = 0
 NETRADIO_SOMAFM = 1
 NETRADIO_TUNEIN = 2
 
+# decoders for the responses of each provider, run on the parser worker thread
+register_decoder('shoutcast', partial(RecordParser, 'genre'))
+register_decoder('shoutcast_stations', partial(RecordParser, 'station'))
+register_decoder('somafm', partial(RecordParser, 'channel'))
+register_decoder('tunein', TuneInParser)
+register_decoder('tunein_search', partial(JsonRecordParser, lambda res: [(row['text'], row['URL'])
+        for row in res['body'] if row.get('type') == 'audio' and 'URL' in row]))
+register_decoder('zapp', partial(JsonRecordParser, lambda res:
+        sorted((track['name'], track['streamUrl'], track_id) for track_id, track in res.items())))
+
 
 class Main(QMainWindow):
 
@@ -67,6 +104,8 @@ class Main(QMainWindow):
         self._duration = 0
         self._duration_str = ''
         self._time_format = 'hh:mm:ss'
+        self._shown_second = None
+        self._shown_pixel = None
         self._fullscreen = False
         self._active_item = None
         self._caption = None
@@ -80,6 +119,15 @@ class Main(QMainWindow):
         with open(os.path.join(RES_DIR, 'style.css'), 'r') as f:
             qApp.setStyleSheet(f.read())
 
+        # shared with video widget, so has to exist before the UI is loaded
+        cache_dir = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), APP_NAME)
+        self._network = shared_network(os.path.join(cache_dir, 'http'))
+        if IS_WIN:
+            # precompiled COM interface descriptors, bundled by make_dist_windows.cmd and
+            # only read, entries of changed interface definitions go to the user's copy
+            use_descriptor_cache(os.path.join(RES_DIR, 'com_descriptors.cache'),
+                    os.path.join(cache_dir, 'com_descriptors.cache'))
+
         QResource.registerResource(os.path.join(RES_DIR, 'main.rcc'))
         uic.loadUi(os.path.join(RES_DIR, 'main.ui'), self)
 
@@ -89,6 +137,14 @@ class Main(QMainWindow):
             windll.dwmapi.DwmSetWindowAttribute(int(self.dialog_media_infos.winId()),
                     DWMWA_USE_IMMERSIVE_DARK_MODE, byref(c_int(1)), 4)
             windll.uxtheme[135](2)  # SetPreferredAppMode, ForceDark = 2
+        self._media_info = MediaInfoProbe(os.path.join(RES_DIR, 'mediainfo.exe' if IS_WIN else 'mediainfo'),
+                os.path.join(cache_dir, 'mediainfo'), parent=self)
+        self._media_info.preliminary.connect(self.slot_media_infos_preliminary)
+        self._media_info.received.connect(self.slot_media_infos_received)
+        self._media_info.finished.connect(self.slot_media_infos_finished)
+        self._media_infos_preliminary = False
+        # closing the dialog cancels a running probe
+        self.dialog_media_infos.finished.connect(self._media_info.cancel)
 
         # menu
         self.action_open.triggered.connect(self.slot_open)
@@ -98,12 +154,10 @@ class Main(QMainWindow):
         self.action_add_to_favorites.triggered.connect(self.slot_add_to_favorites)
         self.action_toggle_fullscreen.triggered.connect(self.slot_toggle_fullscreen)
         self.action_toggle_play.triggered.connect(self.slot_toggle_playback)
-        self.action_step_forward.triggered.connect(lambda: self.video_widget.step(1))
-        self.action_step_back.triggered.connect(lambda: self.video_widget.step(-1))
-        self.action_skip_forward.triggered.connect(lambda:
-            self.video_widget.seek_to_time(self.video_widget.get_time() + 1))
-        self.action_skip_back.triggered.connect(lambda:
-            self.video_widget.seek_to_time(self.video_widget.get_time() - 1))
+        self.action_step_forward.triggered.connect(lambda: self._step(1))
+        self.action_step_back.triggered.connect(lambda: self._step(-1))
+        self.action_skip_forward.triggered.connect(lambda: self._clock.seek(self._seeker.skip(1)))
+        self.action_skip_back.triggered.connect(lambda: self._clock.seek(self._seeker.skip(-1)))
         self.action_volume_up.triggered.connect(lambda:
             self.slider_volume.setValue(self.slider_volume.value() + 1))
         self.action_volume_down.triggered.connect(lambda:
@@ -137,21 +191,44 @@ class Main(QMainWindow):
         ag.addAction(self.action_pause)
         ag.addAction(self.action_stop)
 
-        self.action_play.triggered.connect(self.video_widget.play)
-        self.action_pause.triggered.connect(self.video_widget.pause)
+        self.action_play.triggered.connect(lambda:
+            self.video_widget.play() or self._clock.set_playing(True))
+        self.action_pause.triggered.connect(lambda:
+            self.video_widget.pause() or self._clock.set_playing(False))
         self.action_stop.triggered.connect(lambda:
-            self.video_widget.pause() or self.video_widget.seek_to_time(0))
+            self.video_widget.pause() or self._clock.set_playing(False) or self._seek(0))
 
         self.video_widget.mediaReady.connect(self.slot_ready)
         self.video_widget.mousePressed.connect(self.slot_toggle_playback)
         self.video_widget.doubleClicked.connect(self.slot_double_clicked)
         self.video_widget.metadataChanged.connect(self.slot_metadata_changed)
 
-        self.slider_time.sliderMoved.connect(lambda value:
-                self.video_widget.seek_to_time(value / 10000 * self._duration) if self._duration else None)
+        # fast seeks while dragging, a precise one on release to where the slider was dragged
+        self._slider_value = 0
+        self.slider_time.sliderPressed.connect(self.slot_slider_pressed)
+        self.slider_time.sliderMoved.connect(self.slot_slider_moved)
+        self.slider_time.sliderReleased.connect(self.slot_slider_released)
+
+        # backend position is only read on state changes and occasional resyncs
+        self._clock = PlaybackClock(self.video_widget.get_time, parent=self)
+        self._clock.changed.connect(self.slot_update_time)
+        self._seeker = SeekScheduler(self.video_widget, self._clock.time, parent=self)
+        # keyframes and frame times of local files, for snapping seeks and frame stepping
+        self._keyframes = None
+        self._keyframe_indexer = KeyframeIndexer(os.path.join(cache_dir, 'keyframes'), parent=self)
+        self._keyframe_indexer.ready.connect(self.slot_keyframes_ready)
+
+        # seek previews, generated with ffmpeg if available, otherwise only cached ones are shown
+        ffmpeg = FfmpegDecoder.find(RES_DIR)
+        self._thumbnails = ThumbnailGenerator(os.path.join(cache_dir, 'thumbnails'),
+                FfmpegDecoder(ffmpeg) if ffmpeg else None, parent=self)
+        self._thumbnail_preview = ThumbnailPreview(self)
+        self.slider_time.hoverMoved.connect(self.slot_slider_hover)
+        self.slider_time.hoverLeft.connect(self._thumbnail_preview.hide)
+        self.slider_time.sliderReleased.connect(self._thumbnail_preview.hide)
 
         self._timer = QTimer(self)
-        self._timer.setInterval(TIME_DISPLAY_UPDATE_PERIOD)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self.slot_update_time)
 
         self.slider_volume.setValue(int(100 * self.video_widget.get_volume()))
@@ -169,7 +246,25 @@ class Main(QMainWindow):
 
         self.setMinimumHeight(self.height() - self.video_widget.height())
 
-        self._net_manager = QNetworkAccessManager(self)
+        self._bg_parser = BackgroundParser(self)
+        self._prober = StreamProber(self._network.manager, parent=self)
+        self._resolver = PlaylistResolver(self._network, self._prober, parent=self)
+        self._prefetcher = Prefetcher(self._resolver, self._network, parent=self)
+        self._resolve_id = 0
+        # (candidate stream urls, callback) of last resolved playlist, for trying fallbacks
+        self._stream_candidates = None
+        self._media_url = None
+        # url passed to the backend whose mediaReady is still outstanding
+        self._pending_url = None
+        self._station_index = StationIndex(os.path.join(cache_dir, 'stations.sqlite'))
+
+        self._resume = ResumeStore(os.path.join(cache_dir, 'resume.sqlite'))
+        # path or url whose position is checkpointed
+        self._resume_key = None
+        self._timer_checkpoint = QTimer(self)
+        self._timer_checkpoint.setInterval(RESUME_CHECKPOINT_INTERVAL)
+        self._timer_checkpoint.timeout.connect(self._checkpoint)
+        self._station_crawler = StationCrawler(self._station_index, self._http_get_cached, parent=self)
 
         self._setup_radio()
         self._setup_tv()
@@ -178,6 +273,9 @@ class Main(QMainWindow):
         if len(sys.argv) > 1:
             self.video_widget.load_media(sys.argv[1])
 
+        # (re)build offline search index in the background
+        QTimer.singleShot(0, self._station_crawler.start)
+
     ########################################
     #
     ########################################
@@ -190,11 +288,38 @@ class Main(QMainWindow):
                 self.dockWidgetRadio.setVisible(flag) or (self.dockWidgetRadio.raise_() if flag else None))
 
         self.treeWidgetRadioDirectories.itemDoubleClicked.connect(self.slot_radio_directories_item_clicked)
+        self.treeWidgetRadioDirectories.currentItemChanged.connect(lambda current, previous:
+                self._prefetch_tree_item(current))
+        self.treeWidgetRadioDirectories.setMouseTracking(True)
+        self.treeWidgetRadioDirectories.itemEntered.connect(lambda tree_item, column:
+                self._prefetcher.hover(self._tree_item_playlist_url(tree_item)))
 
         self.treeWidgetRadioDirectories.sortItems(0, Qt.AscendingOrder)
-
+        # children are merged into place by ChunkedInserter, the view's own sorting
+        # would re-sort the whole tree when switched back on after populating
+        self.treeWidgetRadioDirectories.setSortingEnabled(False)
+        self.treeWidgetRadioDirectories.setUniformRowHeights(True)
+
+        # (text, url)
+        self._model_radio_search = RecordListModel(itemgetter(0), itemgetter(1),
+                lambda record: self._stream_health(record[1]), sort_key=itemgetter(0),
+                foreground=lambda record: self._stream_color(record[1]), parent=self)
+        self._prober.probed.connect(self._model_radio_search.refresh)
+        self.listViewRadioSearchResults.setModel(self._model_radio_search)
+        self.listViewRadioSearchResults.selectionModel().currentChanged.connect(lambda current, previous:
+                self._prefetch_rows(self._model_radio_search, current.row()))
+        self.listViewRadioSearchResults.setMouseTracking(True)
+        self.listViewRadioSearchResults.entered.connect(lambda index:
+                self._prefetcher.hover(index.data(Qt.UserRole)))
+
+        self._timer_radio_probe = QTimer(self)
+        self._timer_radio_probe.setSingleShot(True)
+        self._timer_radio_probe.setInterval(PROBE_DELAY)
+        self._timer_radio_probe.timeout.connect(lambda: self._probe_rows(self._model_radio_search, 'radio_search'))
+
+        self.lineEditRadioSearch.textChanged.connect(self.slot_radio_search_text_changed)
         self.lineEditRadioSearch.returnPressed.connect(self.slot_radio_search_return_pressed)
-        self.listWidgetRadioSearchResults.itemDoubleClicked.connect(self.slot_radio_search_result_double_clicked)
+        self.listViewRadioSearchResults.doubleClicked.connect(self.slot_radio_search_result_double_clicked)
 
         tree_item = QTreeWidgetItem(['SHOUTcast'])
         tree_item.setData(0, Qt.UserRole, NETRADIO_SHOUTCAST)
@@ -217,22 +342,33 @@ class Main(QMainWindow):
         self.dockWidgetTV.visibilityChanged.connect(self.action_tv.setChecked)
         self.action_tv.triggered.connect(lambda flag:
                 self.dockWidgetTV.setVisible(flag) or (self.dockWidgetTV.raise_() if flag else None))
-        self.listWidgetTVLivestreams.itemDoubleClicked.connect(self.slot_tv_livestreams_item_double_clicked)
 
+        # current and next shows of all channels, fetched in the background
+        self._epg = EpgCache(self._http_get, parent=self)
+        self._epg.updated.connect(self.slot_epg_updated)
+        # channel_id of livestream that is currently playing
+        self._tv_channel = None
+
+        # (name, stream_url, channel_id)
+        self._model_tv_livestreams = RecordListModel(itemgetter(0), itemgetter(1),
+                lambda record: self._epg.tooltip(record[2]), sort_key=itemgetter(0), parent=self)
+        self.listViewTVLivestreams.setModel(self._model_tv_livestreams)
+        self.listViewTVLivestreams.doubleClicked.connect(self.slot_tv_livestreams_item_double_clicked)
+
+        # (channel, title, url, description), newest first, more pages are loaded while scrolling
+        self._model_tv_search = PagedRecordListModel(lambda record: f'[{record[0]}] {record[1]}', itemgetter(2),
+                self._fetch_tv_search_page, lambda record: f'<p>{record[3]}</p>', parent=self)
+        self.listViewTVSearchResults.setModel(self._model_tv_search)
+
+        self.lineEditTVSearch.textChanged.connect(self.slot_tv_search_text_changed)
         self.lineEditTVSearch.returnPressed.connect(self.slot_tv_search_return_pressed)
-        self.listWidgetTVSearchResults.itemDoubleClicked.connect(self.slot_tv_search_result_double_clicked)
+        self.listViewTVSearchResults.doubleClicked.connect(self.slot_tv_search_result_double_clicked)
 
-        def _loaded(res):
-            try:
-                for track_id, track in json.loads(res).items():
-                	list_item = QListWidgetItem(track['name'])
-                	list_item.setData(Qt.UserRole, track['streamUrl'])
-                	list_item.setData(Qt.UserRole + 1, track_id)
-                	self.listWidgetTVLivestreams.addItem(list_item)
-            except:
-                pass
+        def _loaded(records, final):
+            self._model_tv_livestreams.set_records(records)
+            self._epg.fetch([record[2] for record in records])
 
-        self._http_get('https://api.zapp.mediathekview.de/v1/channelInfoList', _loaded)
+        self._http_get_cached('https://api.zapp.mediathekview.de/v1/channelInfoList', _loaded, 'zapp', refresh=True)
 
     ########################################
     #
@@ -241,59 +377,244 @@ class Main(QMainWindow):
         self.dockWidgetFavorites.visibilityChanged.connect(self.action_favorites.setChecked)
         self.action_favorites.triggered.connect(lambda flag:
                 self.dockWidgetFavorites.setVisible(flag) or (self.dockWidgetFavorites.raise_() if flag else None))
-        self.listWidgetFavorites.itemDoubleClicked.connect(self.slot_favorite_double_clicked)
+
+        # (title, url)
+        self._model_favorites = RecordListModel(itemgetter(0), itemgetter(1),
+                lambda record: self._stream_health(record[1]), sort_key=itemgetter(0),
+                rename=lambda record, title: (title, record[1]),
+                foreground=lambda record: self._stream_color(record[1]), parent=self)
+        self._prober.probed.connect(self._model_favorites.refresh)
+        self.listViewFavorites.setModel(self._model_favorites)
+        self.listViewFavorites.selectionModel().currentChanged.connect(lambda current, previous:
+                self._prefetch_rows(self._model_favorites, current.row()))
+        self.listViewFavorites.doubleClicked.connect(self.slot_favorite_double_clicked)
 
         def _favs_context_menu(pos):
-            list_item = self.listWidgetFavorites.currentItem()
-            if not list_item:
+            index = self.listViewFavorites.currentIndex()
+            if not index.isValid():
                 return
             m = QMenu()
             a = QAction('Delete', m)
-            a.triggered.connect(lambda list_item=list_item:
-                    self.listWidgetFavorites.takeItem(list_item))
+            a.triggered.connect(lambda checked, row=index.row():
+                    self._model_favorites.remove_row(row))
             m.addAction(a)
             m.exec(QCursor.pos())
-        self.listWidgetFavorites.customContextMenuRequested.connect(_favs_context_menu)
+        self.listViewFavorites.customContextMenuRequested.connect(_favs_context_menu)
 
         favs = self._settings.value('Favorites', None)
         if not favs:
             return
-        favs = json.loads(favs)
-        for title, url in favs:
-            list_item = QListWidgetItem(title)
-            list_item.setData(Qt.UserRole, url)
-            list_item.setFlags(list_item.flags() | Qt.ItemIsEditable)
-            self.listWidgetFavorites.addItem(list_item)
+        self._model_favorites.add_records([(title, url) for title, url in json.loads(favs)])
+        self._probe_rows(self._model_favorites)
+
+    ########################################
+    # Responses are cached according to Cache-Control, stale ones are revalidated
+    # before being delivered. If a decoder is registered for provider (or make_parser
+    # is given), callback is called with (records, final), see _http_get_cached.
+    ########################################
+    def _http_get(self, url, callback, make_parser=None, group=None, provider=None):
+        make_parser = make_parser or decoder(provider)
+        if make_parser is None:
+            return self._network.get(url, lambda data, ok: callback(data), group=group)
+        finished, on_data, on_cancel = self._bg_parser.callbacks(make_parser, callback, provider)
+        return self._network.get(url, finished, on_data=on_data, on_cancel=on_cancel, group=group)
+
+    ########################################
+    # Serves directory listings from cache, stale entries are revalidated in
+    # the background. If refresh is True, callback is called again with the new
+    # data if the revalidated listing changed.
+    # If make_parser is given or a decoder is registered for provider, data is
+    # parsed on the worker thread and callback is called with (records, final)
+    # instead of raw data, for uncached listings already while the response is
+    # still arriving.
+    ########################################
+    def _http_get_cached(self, url, callback, provider, refresh=False, make_parser=None, group=None):
+        make_parser = make_parser or decoder(provider)
+        if make_parser is None:
+            return self._network.get(url, lambda data, ok: callback(data), provider, stale_ok=True,
+                    refresh=refresh, group=group)
+        finished, on_data, on_cancel = self._bg_parser.callbacks(make_parser, callback, provider)
+        return self._network.get(url, finished, provider, stale_ok=True, refresh=refresh,
+                on_data=on_data, on_cancel=on_cancel, group=group)
+
+    ########################################
+    # returns callback for (records, final) that adds (text, data) records as
+    # children of tree_item, chunk by chunk
+    ########################################
+    def _populate_tree(self, tree_item, provider_id):
+        def _make_item(record):
+            child_item = QTreeWidgetItem([record[0]])
+            child_item.setData(0, Qt.UserRole, provider_id)
+            child_item.setData(0, Qt.UserRole + 1, record[1])
+            return child_item
+        inserter = ChunkedInserter(self.treeWidgetRadioDirectories, _make_item, sort_key=itemgetter(0),
+                insert_items=tree_item.insertChildren)
+        inserter.finished.connect(inserter.deleteLater)
+        def _loaded(records, final):
+            inserter.append(records, final)
+            if records:
+                tree_item.setExpanded(True)
+        return _loaded
+
+    ########################################
+    # resolves url if it's a playlist and calls callback with the best candidate
+    # stream url, unless another stream was requested in the meantime. If the
+    # stream fails to load, callback is called with the next candidate.
+    ########################################
+    def _resolve_stream(self, url, callback):
+        self._resolve_id += 1
+        resolve_id = self._resolve_id
+        def _resolved(stream_urls):
+            if stream_urls and resolve_id == self._resolve_id:
+                self._stream_candidates = (stream_urls, callback)
+                callback(stream_urls[0])
+        self._resolver.resolve(url, _resolved)
+
+    ########################################
+    # returns True if a fallback stream of the last resolved playlist is loaded
+    ########################################
+    def _try_fallback_stream(self):
+        if self._stream_candidates is None:
+            return False
+        stream_urls, callback = self._stream_candidates
+        if self._media_url not in stream_urls:
+            return False
+        self._resolver.report_failure(self._media_url)
+        i = stream_urls.index(self._media_url) + 1
+        if i == len(stream_urls):
+            self._stream_candidates = None
+            return False
+        callback(stream_urls[i])
+        return True
+
+    ########################################
+    # prefetches playlists of row and its neighbours
+    ########################################
+    def _prefetch_rows(self, model, row):
+        self._prefetcher.prefetch([model.data(model.index(r), Qt.UserRole)
+                for r in (row, row + 1, row - 1, row + 2) if 0 <= r < model.rowCount()])
+
+    ########################################
+    # health checks the (best candidate) streams of the first rows in the background,
+    # in the prober group (see StreamProber.clear)
+    ########################################
+    def _probe_rows(self, model, group=None):
+        for row in range(min(model.rowCount(), MAX_PROBED_ROWS)):
+            url = model.data(model.index(row), Qt.UserRole)
+            if is_playlist_url(url):
+                # resolver probes the best candidates
+                self._resolver.resolve(url, lambda stream_urls: None, group)
+            else:
+                self._prober.probe([url], group)
+
+    ########################################
+    # returns probe result of best candidate stream of url, or None
+    ########################################
+    def _stream_result(self, url):
+        stream_urls = self._resolver.peek(url)
+        return self._prober.result(stream_urls[0]) if stream_urls else None
+
+    ########################################
+    # tooltip text
+    ########################################
+    def _stream_health(self, url):
+        res = self._stream_result(url)
+        if res is None:
+            return url
+        if not res['alive']:
+            return f"{url}\noffline (HTTP {res['status']})" if res['status'] else f"{url}\noffline ({res['error']})"
+        info = [f"{res['ttfb']:.0f} ms"]
+        if res['bitrate']:
+            info.append(f"{res['bitrate']} kbit/s")
+        if res['redirects']:
+            info.append(f"{len(res['redirects'])} redirect(s)")
+        return f"{url}\n{', '.join(info)}"
 
     ########################################
     #
     ########################################
-    def _http_get(self, url, callback):
-        reply = self._net_manager.get(QNetworkRequest(QUrl(url)))
-        reply.finished.connect(lambda: callback(reply.readAll().data()))
+    def _stream_color(self, url):
+        res = self._stream_result(url)
+        return OFFLINE_COLOR if res is not None and not res['alive'] else None
+
+    ########################################
+    # returns playlist url of station item in directory tree, or None
+    ########################################
+    def _tree_item_playlist_url(self, tree_item):
+        if tree_item is None or tree_item.parent() is None:
+            return None
+        provider_id = tree_item.data(0, Qt.UserRole)
+        if provider_id == NETRADIO_SHOUTCAST:
+            if tree_item.parent().parent() is not None and tree_item.parent().parent().parent() is not None:
+                return f"http://yp.shoutcast.com/sbin/tunein-station.pls?id={tree_item.data(0, Qt.UserRole + 1)}&type=.pls"
+        elif provider_id == NETRADIO_SOMAFM:
+            return tree_item.data(0, Qt.UserRole + 1)
+        elif provider_id == NETRADIO_TUNEIN:
+            url = tree_item.data(0, Qt.UserRole + 1)
+            if is_playlist_url(url):
+                return url
+        return None
+
+    ########################################
+    # prefetches playlists of station item and its neighbours
+    ########################################
+    def _prefetch_tree_item(self, tree_item):
+        if tree_item is None or tree_item.parent() is None:
+            return
+        parent = tree_item.parent()
+        i = parent.indexOfChild(tree_item)
+        self._prefetcher.prefetch([self._tree_item_playlist_url(parent.child(j))
+                for j in (i, i + 1, i - 1, i + 2) if 0 <= j < parent.childCount()])
+
+    ########################################
+    #
+    ########################################
+    def _play_tree_item(self, tree_item, stream_url):
+        self._reset_active_item()
+        self._active_item = tree_item
+        tree_item.setData(0, Qt.ForegroundRole, QColor('#2E9ADC'))
+        tree_item.setSelected(False)
+        self.load_media(stream_url, tree_item.text(0))
 
     ########################################
     #
     ########################################
     def _reset_active_item(self):
-        if self._active_item:
+        if self._active_item is not None:
             if type(self._active_item) == QTreeWidgetItem:
                 self._active_item.setData(0, Qt.ForegroundRole, None)
             else:
-                self._active_item.setData(Qt.ForegroundRole, None)
+                self._active_item.set_active(None)
             self._active_item = None
 
+    ########################################
+    # marks row of list view as the one currently playing, returns its record
+    ########################################
+    def _set_active_row(self, list_view, index):
+        self._reset_active_item()
+        model = list_view.model()
+        model.set_active(index.row())
+        list_view.clearSelection()
+        self._active_item = model
+        self.activateWindow()
+        list_view.repaint()
+        return model.record(index.row())
+
     ########################################
     #
     ########################################
     def closeEvent(self, e):
+        self._checkpoint(True)
+        self._resume.close()
         self.video_widget.close_media()
+        self._station_crawler.stop()
+        self._bg_parser.shutdown()
+        self._thumbnails.shutdown()
+        self._keyframe_indexer.shutdown()
+        self._media_info.shutdown()
+        self._station_index.close()
 
-        favs = []
-        for row in range(self.listWidgetFavorites.count()):
-            list_item = self.listWidgetFavorites.item(row)
-            favs.append((list_item.text(), list_item.data(Qt.UserRole)))
-        self._settings.setValue('Favorites', json.dumps(favs))
+        self._settings.setValue('Favorites', json.dumps(self._model_favorites.records()))
 
         super().closeEvent(e)
 
@@ -318,6 +639,10 @@ class Main(QMainWindow):
         if caption is None:
             self._reset_active_item()
         self._caption = caption
+        self._media_url = media_file
+        self._pending_url = media_file
+        self._tv_channel = None
+        self._checkpoint(True)
         self.video_widget.load_media(media_file)
         self.activateWindow()
 
@@ -325,6 +650,11 @@ class Main(QMainWindow):
     #
     ########################################
     def slot_ready(self, ok):
+        # only a failed load is a reason to try the next stream, not closing the media
+        pending_url, self._pending_url = self._pending_url, None
+        if not ok and pending_url is not None and self._try_fallback_stream():
+            return
+        self._checkpoint(True)
         self.slider_time.setValue(0)
         if ok:
             has_video = self.video_widget.has_video()
@@ -338,6 +668,8 @@ class Main(QMainWindow):
                 self._duration_str = ' / ' + QTime(0, 0).addMSecs(int(1000 * self._duration)).toString(self._time_format)
             else:
                 self._time_format = 'hh:mm:ss'
+                self._duration_str = ''
+            self._shown_second = self._shown_pixel = None
             self.slider_time.setEnabled(self._duration > 0)
             self.label_statusbar.setVisible(True)
             self.action_toggle_fullscreen.setEnabled(has_video)
@@ -347,8 +679,24 @@ class Main(QMainWindow):
                 action.setEnabled(True)
             for action in (self.action_skip_back, self.action_step_back, self.action_step_forward, self.action_skip_forward):
                 action.setEnabled(self._duration > 0)
-            self._timer.start()
             self.video_widget.play()
+            self._clock.reset(self._duration)
+            self._clock.set_playing(True)
+            self._seeker.reset(self._duration)
+            if self._duration > 0:
+                self._resume_key = self.video_widget.filename
+                self._timer_checkpoint.start()
+                t = self._resume.position(self._resume_key)
+                if t is not None:
+                    self._seek(t)
+                    self.statusbar.showMessage('Resumed at ' + QTime(0, 0).addSecs(int(t)).toString(self._time_format))
+            self._keyframes = None
+            if has_video and self._duration > 0 and not self.video_widget.is_url:
+                self._thumbnails.request(self.video_widget.filename, self._duration)
+                self._keyframe_indexer.request(self.video_widget.filename)
+            else:
+                self._thumbnails.clear()
+                self._keyframe_indexer.clear()
             self.action_play.setChecked(True)
             if self._caption:
                 self.setWindowTitle(f'{self._caption} - {APP_NAME}')
@@ -357,6 +705,11 @@ class Main(QMainWindow):
 
         else:
             self._timer.stop()
+            self._clock.reset()
+            self._thumbnails.clear()
+            self._thumbnail_preview.hide()
+            self._keyframe_indexer.clear()
+            self._keyframes = None
             self.slider_time.setEnabled(False)
             self.label_statusbar.setVisible(False)
             self.action_toggle_fullscreen.setEnabled(False)
@@ -401,6 +754,10 @@ class Main(QMainWindow):
     ########################################
     def slot_close_media(self):
         self._reset_active_item()
+        self._checkpoint(True)
+        self._stream_candidates = None
+        self._media_url = None
+        self._pending_url = None
         self.video_widget.close_media()
         self.slot_ready(False)
 
@@ -422,14 +779,100 @@ class Main(QMainWindow):
         dialog.exec()
 
     ########################################
-    #
+    # widgets are only updated if the shown second or slider pixel changed, while
+    # playing the next update is scheduled for the next change
     ########################################
     def slot_update_time(self):
+        if self.video_widget.filename is None:
+            return
+        t = self._clock.time()
+        pixels = self.slider_time.width()
         if self._duration > 0:
-            self.slider_time.setValue(int(10000 * self.video_widget.get_time() / self._duration))
-            self.label_statusbar.setText(QTime(0, 0).addMSecs(int(1000 * self.video_widget.get_time())).toString(self._time_format) + self._duration_str)
+            pixel = int(pixels * t / self._duration)
+            # the knob stays where the user drags it
+            if pixel != self._shown_pixel and not self.slider_time.isSliderDown():
+                self._shown_pixel = pixel
+                self.slider_time.setValue(int(10000 * t / self._duration))
+        second = int(t)
+        if second != self._shown_second:
+            self._shown_second = second
+            self.label_statusbar.setText(QTime(0, 0).addSecs(second).toString(self._time_format) + self._duration_str)
+        if self._clock.is_playing():
+            self._timer.start(max(TIME_DISPLAY_MIN_INTERVAL, int(1000 * next_change(t, self._duration, pixels)) + 1))
+
+    ########################################
+    #
+    ########################################
+    def slot_slider_pressed(self):
+        self._slider_value = self.slider_time.value()
+
+    ########################################
+    #
+    ########################################
+    def slot_slider_moved(self, value):
+        self._slider_value = value
+        if self._duration:
+            self._seek(value / 10000 * self._duration, True)
+
+    ########################################
+    #
+    ########################################
+    def slot_slider_released(self):
+        if self._duration:
+            self._seek(self._slider_value / 10000 * self._duration)
+
+    ########################################
+    # shows preview thumbnail of the position under the mouse
+    ########################################
+    def slot_slider_hover(self, value, x):
+        if not self.slider_time.isEnabled() or not self._duration:
+            return
+        t = value / 10000 * self._duration
+        image = self._thumbnails.thumbnail(t)
+        if image is None:
+            self._thumbnail_preview.hide()
+            return
+        self._thumbnail_preview.show_at(self.slider_time, x, image,
+                QTime(0, 0).addSecs(int(t)).toString(self._time_format))
+
+    ########################################
+    # records position of current file or VOD url, final when it's closed
+    ########################################
+    def _checkpoint(self, final=False):
+        if self._resume_key is None:
+            return
+        self._resume.update(self._resume_key, self._clock.time(), self._duration)
+        if final:
+            self._resume_key = None
+            self._timer_checkpoint.stop()
+            self._resume.flush()
+
+    ########################################
+    # as seconds (float), only the latest of quickly following seeks is sent to
+    # the backend
+    ########################################
+    def _seek(self, t, fast=False):
+        self._clock.seek(self._seeker.seek(t, fast))
+
+    ########################################
+    #
+    ########################################
+    def _step(self, steps):
+        t = self._keyframes.step(self._clock.time(), steps) if self._keyframes is not None else None
+        if t is None:
+            self.video_widget.step(steps)
+            self._clock.invalidate()
         else:
-            self.label_statusbar.setText(QTime(0, 0).addMSecs(int(1000 * self.video_widget.get_time())).toString(self._time_format))
+            # exact frame timestamp from the index
+            self._seek(t)
+
+    ########################################
+    #
+    ########################################
+    def slot_keyframes_ready(self, path, index):
+        if path == self.video_widget.filename:
+            self._keyframes = index
+            self._seeker.set_keyframes(index)
 
     ########################################
     #
@@ -444,6 +887,7 @@ class Main(QMainWindow):
         is_playing = self.video_widget.toggle_playback()
         if is_playing is None:
             return
+        self._clock.set_playing(is_playing)
         if is_playing:
             self.action_play.setChecked(True)
         else:
@@ -467,7 +911,7 @@ class Main(QMainWindow):
     #
     ########################################
     def slot_double_clicked(self):
-        self.video_widget.toggle_playback()
+        self._clock.set_playing(bool(self.video_widget.toggle_playback()))
         self.slot_toggle_fullscreen()
 
     ########################################
@@ -476,45 +920,105 @@ class Main(QMainWindow):
     def slot_show_media_infos(self):
         if self.video_widget.filename is None or self._duration == 0:
             return
-        infos = subprocess.run([os.path.join(RES_DIR, 'mediainfo'), self.video_widget.filename],
-                capture_output=True, shell=IS_WIN).stdout.decode().strip()
-        self.dialog_media_infos.plainTextEdit.setPlainText(infos)
+        infos = self._media_info.cached(self.video_widget.filename)
+        if infos is None:
+            self.dialog_media_infos.plainTextEdit.clear()
+            self._media_infos_preliminary = False
+            self.dialog_media_infos.setWindowTitle('Media Infos (probing...)')
+            self._media_info.probe(self.video_widget.filename)
+        else:
+            self.dialog_media_infos.plainTextEdit.setPlainText(infos)
         self.dialog_media_infos.show()
 
+    ########################################
+    # basic infos of the container are shown until mediainfo's output arrives
+    ########################################
+    def slot_media_infos_preliminary(self, path, text):
+        if path != self.video_widget.filename:
+            return
+        self.dialog_media_infos.plainTextEdit.setPlainText(text)
+        self._media_infos_preliminary = True
+
+    ########################################
+    # output of mediainfo is shown as it arrives
+    ########################################
+    def slot_media_infos_received(self, path, chunk):
+        if path != self.video_widget.filename:
+            return
+        text_edit = self.dialog_media_infos.plainTextEdit
+        if self._media_infos_preliminary:
+            self._media_infos_preliminary = False
+            text_edit.clear()
+        text_edit.moveCursor(QTextCursor.End)
+        text_edit.insertPlainText(chunk)
+
+    ########################################
+    #
+    ########################################
+    def slot_media_infos_finished(self, path, text, ok):
+        self.dialog_media_infos.setWindowTitle('Media Infos')
+        if ok and path == self.video_widget.filename:
+            self.dialog_media_infos.plainTextEdit.setPlainText(text)
+
     ########################################
     #
     ########################################
     def slot_add_to_favorites(self):
-    	list_item = QListWidgetItem(self._caption if self._caption else os.path.basename(self.video_widget.filename))
-    	list_item.setData(Qt.UserRole, self.video_widget.filename)
-    	list_item.setFlags(list_item.flags() | Qt.ItemIsEditable)
-    	self.listWidgetFavorites.addItem(list_item)
+        self._model_favorites.add_records([(self._caption if self._caption else os.path.basename(self.video_widget.filename),
+                self.video_widget.filename)])
 
     ########################################
     #
     ########################################
-    def slot_tv_livestreams_item_double_clicked(self, list_item):
-        self._reset_active_item()
-        list_item.setData(Qt.ForegroundRole, QColor('#2E9ADC'))
-        list_item.setSelected(False)
-        self._active_item = list_item
-        self.activateWindow()
-        self.listWidgetTVLivestreams.repaint()
-        self.load_media(list_item.data(Qt.UserRole), list_item.text())
-
-        def _loaded(res):
-            res = json.loads(res)
-            if 'shows' in res:
-                show = res['shows'][0]
-                tz = datetime.timezone(datetime.timedelta(hours=2))
-                t_from = datetime.datetime.fromisoformat(show['startTime']).astimezone(tz).strftime('%H:%M')
-                t_to = datetime.datetime.fromisoformat(show['endTime']).astimezone(tz).strftime('%H:%M')
-                title = f"{show['title']} - {show['subtitle']}" if 'subtitle' in show and show['subtitle'] else show['title']
+    def slot_tv_livestreams_item_double_clicked(self, index):
+        name, stream_url, channel_id = self._set_active_row(self.listViewTVLivestreams, index)
+        self.load_media(stream_url, name)
+        self._tv_channel = channel_id
+        title = self._epg.title(channel_id)
+        if title:
+            self.statusbar.showMessage(title)
+        else:
+            self._epg.fetch([channel_id])
+
+    ########################################
+    # shows of channel were fetched or current show ended
+    ########################################
+    def slot_epg_updated(self, channel_id):
+        self._model_tv_livestreams.refresh()
+        if channel_id == self._tv_channel:
+            title = self._epg.title(channel_id)
+            if title:
                 self.statusbar.showMessage(title)
-                list_item.setToolTip(f"<p>{t_from} - {t_to}<br><b>{title}</b><br><br>{show['description']}")
-            else:
-                list_item.setToolTip('')
-        self._http_get('https://api.zapp.mediathekview.de/v1/shows/' + list_item.data(Qt.UserRole + 1), _loaded)
+
+    ########################################
+    # instant search in offline index, return triggers remote search
+    ########################################
+    def slot_radio_search_text_changed(self, s):
+        self._network.requests.cancel_group('radio_search')
+        # probes of the replaced results are pointless now
+        self._prober.clear('radio_search')
+        if self._active_item is self._model_radio_search:
+            self._active_item = None
+        if len(s) < SEARCH_MIN_LENGTH:
+            self._timer_radio_probe.stop()
+            self._model_radio_search.clear()
+            return
+        self._model_radio_search.set_records(sorted((title, url)
+                for title, url, provider in self._station_index.search(s, 'radio')))
+        self._timer_radio_probe.start()
+
+    ########################################
+    # instant search for livestreams in offline index, return triggers remote search
+    ########################################
+    def slot_tv_search_text_changed(self, s):
+        self._network.requests.cancel_group('tv_search')
+        if self._active_item is self._model_tv_search:
+            self._active_item = None
+        if len(s) < SEARCH_MIN_LENGTH:
+            self._model_tv_search.clear()
+            return
+        self._model_tv_search.set_records(sorted(('Livestream', title, url, '')
+                for title, url, provider in self._station_index.search(s, 'tv')))
 
     ########################################
     #
@@ -524,20 +1028,19 @@ class Main(QMainWindow):
         if not s:
             return
 
-        if self._active_item and type(self._active_item) == QListWidgetItem and self._active_item.listWidget() == self.listWidgetRadioSearchResults:
+        if self._active_item is self._model_radio_search:
             self._active_item = None
 
-        self.listWidgetRadioSearchResults.clear()
+        self._timer_radio_probe.stop()
+        self._prober.clear('radio_search')
+        append = self._model_radio_search.appender()
+        def _loaded(records, final):
+            append(records, final)
+            if final:
+                self._probe_rows(self._model_radio_search, 'radio_search')
 
-        def _loaded(res):
-            res = json.loads(res)
-            for row in res['body']:
-                if 'type' in row and row['type'] == 'audio' and 'URL' in row:
-                	list_item = QListWidgetItem(row['text'])
-                	list_item.setData(Qt.UserRole, row['URL'])
-                	self.listWidgetRadioSearchResults.addItem(list_item)
-            self.listWidgetRadioSearchResults.scrollToItem(self.listWidgetRadioSearchResults.item(0))
-        self._http_get(f'http://opml.radiotime.com/Search.ashx?render=json&query={urllib.parse.quote(s)}', _loaded)
+        self._http_get(f'http://opml.radiotime.com/Search.ashx?render=json&query={urllib.parse.quote(s)}', _loaded,
+                group='radio_search', provider='tunein_search')
 
     ########################################
     #
@@ -546,53 +1049,32 @@ class Main(QMainWindow):
         s = self.lineEditTVSearch.text()
         if not s:
             return
-        self.listWidgetTVSearchResults.clear()
-        q = {
-        	'queries': [
-            	{'fields': ['title', 'topic', 'description'], 'query': s},  #'description' , 'topic'
-            ],
-            'future': 0,
-        	'size': 500
-        }
-        url = 'https://mediathekviewweb.de/api/query?query=' + urllib.parse.quote(json.dumps(q))
-        def _loaded(res):
-            res = json.loads(res)['result']['results']
-            for track in res:
-            	list_item = QListWidgetItem(f"[{track['channel']}] {track['title']}")
-            	list_item.setData(Qt.UserRole, track['url_video_hd'] if 'url_video_hd' in track else track['url_video'] )
-            	list_item.setToolTip('<p>' + track['description'] + '</p>')
-            	self.listWidgetTVSearchResults.addItem(list_item)
-        self._http_get(url, _loaded)
-
-    ########################################
-    #
-    ########################################
-    def slot_radio_search_result_double_clicked(self, list_item):
-        self._reset_active_item()
-        list_item.setData(Qt.ForegroundRole, QColor('#2E9ADC'))
-        list_item.setSelected(False)
-        self._active_item = list_item
-        self.activateWindow()
-        self.listWidgetRadioSearchResults.repaint()
+        if self._active_item is self._model_tv_search:
+            self._active_item = None
 
-        def _loaded(res):
-            stream_url = res.decode().split('\n')[0]
-            print(stream_url)
-            self.load_media(stream_url, list_item.text())
+        self._network.requests.cancel_group('tv_search')
+        self._model_tv_search.search(s)
 
-        self._http_get(list_item.data(Qt.UserRole), _loaded)
+    ########################################
+    # JSON is decoded on the worker thread
+    ########################################
+    def _fetch_tv_search_page(self, text, offset, size, callback):
+        self._http_get(tvsearch.query_url(text, offset, size), callback, group='tv_search', provider='tv_search')
 
     ########################################
     #
     ########################################
-    def slot_tv_search_result_double_clicked(self, list_item):
-        self._reset_active_item()
-        list_item.setData(Qt.ForegroundRole, QColor('#2E9ADC'))
-        list_item.setSelected(False)
-        self._active_item = list_item
-        self.activateWindow()
-        self.listWidgetRadioSearchResults.repaint()
-        self.load_media(list_item.data(Qt.UserRole), list_item.text())
+    def slot_radio_search_result_double_clicked(self, index):
+        text, url = self._set_active_row(self.listViewRadioSearchResults, index)
+
+        self._resolve_stream(url, lambda stream_url: self.load_media(stream_url, text))
+
+    ########################################
+    #
+    ########################################
+    def slot_tv_search_result_double_clicked(self, index):
+        channel, title, url, description = self._set_active_row(self.listViewTVSearchResults, index)
+        self.load_media(url, f'[{channel}] {title}')
 
     ########################################
     #
@@ -606,134 +1088,55 @@ class Main(QMainWindow):
         if tree_item.parent() is None:
 
             if provider_id == NETRADIO_SHOUTCAST:
-                def _loaded(res):
-                    dom = minidom.parseString(res.decode())
-                    elements = dom.getElementsByTagName('genre')
-                    for element in elements:
-                        child_item = QTreeWidgetItem([element.attributes['name'].value])
-                        child_item.setData(0, Qt.UserRole, NETRADIO_SHOUTCAST)
-                        child_item.setData(0, Qt.UserRole + 1, element.attributes['id'].value)
-                        tree_item.addChild(child_item)
-                    tree_item.setExpanded(True)
-                self._http_get("http://api.shoutcast.com/genre/primary?k=fa1669MuiRPorUBw&f=xml", _loaded)
+                self._http_get_cached("http://api.shoutcast.com/genre/primary?k=fa1669MuiRPorUBw&f=xml",
+                        self._populate_tree(tree_item, NETRADIO_SHOUTCAST), 'shoutcast')
 
             elif provider_id == NETRADIO_SOMAFM:
-                def _loaded(res):
-                    dom = minidom.parseString(res.decode())
-                    elements = dom.getElementsByTagName('channel')
-                    for channel in elements:
-                        child_item = QTreeWidgetItem([channel.getElementsByTagName('title')[0].childNodes[0].data])
-                        child_item.setData(0, Qt.UserRole, NETRADIO_SOMAFM)
-                        child_item.setData(0, Qt.UserRole + 1, channel.getElementsByTagName('fastpls')[0].childNodes[0].data)
-                        tree_item.addChild(child_item)
-                    tree_item.setExpanded(True)
-                self._http_get("http://somafm.com/channels.xml", _loaded)
+                self._http_get_cached("http://somafm.com/channels.xml",
+                        self._populate_tree(tree_item, NETRADIO_SOMAFM), 'somafm')
 
             elif provider_id == NETRADIO_TUNEIN:
-                cat_url = "http://opml.radiotime.com/"
-                def _loaded(res):
-                    dom = minidom.parseString(res.decode())
-                    elements = dom.getElementsByTagName('outline')
-                    for element in elements:
-                        child_item = QTreeWidgetItem([element.attributes['text'].value])
-                        child_item.setData(0, Qt.UserRole, NETRADIO_TUNEIN)
-                        child_item.setData(0, Qt.UserRole + 1, element.attributes['URL'].value)
-                        tree_item.addChild(child_item)
-                    tree_item.setExpanded(True)
-                self._http_get("http://opml.radiotime.com/", _loaded)
+                self._http_get_cached("http://opml.radiotime.com/",
+                        self._populate_tree(tree_item, NETRADIO_TUNEIN), 'tunein')
 
         else:
             if provider_id == NETRADIO_SHOUTCAST:
                 current_id = tree_item.data(0, Qt.UserRole + 1)
                 if tree_item.parent().parent() is None:
-                    def _loaded(res):
-                        dom = minidom.parseString(res.decode())
-                        elements = dom.getElementsByTagName('genre')
-                        for element in elements:
-                            child_item = QTreeWidgetItem([element.attributes['name'].value])
-                            child_item.setData(0, Qt.UserRole, NETRADIO_SHOUTCAST)
-                            child_item.setData(0, Qt.UserRole + 1, element.attributes['id'].value)
-                            tree_item.addChild(child_item)
-                        tree_item.setExpanded(True)
-                    self._http_get("http://api.shoutcast.com/genre/secondary?k=fa1669MuiRPorUBw&f=xml&parentid=" + current_id, _loaded)
+                    self._http_get_cached("http://api.shoutcast.com/genre/secondary?k=fa1669MuiRPorUBw&f=xml&parentid=" + current_id,
+                            self._populate_tree(tree_item, NETRADIO_SHOUTCAST), 'shoutcast')
 
                 elif tree_item.parent().parent().parent() is None:
-                    def _loaded(res):
-                        dom = minidom.parseString(res.decode())
-                        elements = dom.getElementsByTagName('station')
-                        for element in elements:
-                            child_item = QTreeWidgetItem([element.attributes['name'].value])
-                            child_item.setData(0, Qt.UserRole, NETRADIO_SHOUTCAST)
-                            child_item.setData(0, Qt.UserRole + 1, element.attributes['id'].value)
-                            tree_item.addChild(child_item)
-                        tree_item.setExpanded(True)
-                    self._http_get("http://api.shoutcast.com/station/advancedsearch?k=fa1669MuiRPorUBw&f=xml&genre_id=" + current_id, _loaded)
+                    self._http_get_cached("http://api.shoutcast.com/station/advancedsearch?k=fa1669MuiRPorUBw&f=xml&genre_id=" + current_id,
+                            self._populate_tree(tree_item, NETRADIO_SHOUTCAST), 'shoutcast_stations')
 
                 else:
-                    def _loaded(res):
-                        # parse .pls
-                        data = {}
-                        for line in res.decode().split('\n'):
-                            if '=' in line:
-                                parts = line.split('=', 2)
-                                data[parts[0]] = parts[1]
-                        if 'File1' in data:
-                            self._reset_active_item()
-                            self._active_item = tree_item
-                            tree_item.setData(0, Qt.ForegroundRole, QColor('#2E9ADC'))
-                            tree_item.setSelected(False)
-                            self.load_media(data['File1'], tree_item.text(0))
-                    self._http_get(f"http://yp.shoutcast.com/sbin/tunein-station.pls?id={current_id}&type=.pls", _loaded)
+                    self._resolve_stream(self._tree_item_playlist_url(tree_item), partial(self._play_tree_item, tree_item))
 
             elif provider_id == NETRADIO_SOMAFM:
-                def _loaded(res):
-                    # parse .pls
-                    data = {}
-                    for line in res.decode().split('\n'):
-                        if '=' in line:
-                            parts = line.split('=', 2)
-                            data[parts[0]] = parts[1]
-                    if 'File1' in data:
-                        self._reset_active_item()
-                        self._active_item = tree_item
-                        tree_item.setData(0, Qt.ForegroundRole, QColor('#2E9ADC'))
-                        tree_item.setSelected(False)
-                        self.load_media(data['File1'], tree_item.text(0))
-                self._http_get(tree_item.data(0, Qt.UserRole + 1), _loaded)
+                self._resolve_stream(self._tree_item_playlist_url(tree_item), partial(self._play_tree_item, tree_item))
 
             elif provider_id == NETRADIO_TUNEIN:
-                def _loaded(res):
-                    res = res.decode()
-                    if res.startswith('<?xml'):
-                        dom = minidom.parseString(res)
-                        elements = dom.getElementsByTagName('outline')
-                        for element in elements:
-                            if 'URL' in element.attributes:
-                                child_item = QTreeWidgetItem([element.attributes['text'].value])
-                                child_item.setData(0, Qt.UserRole, NETRADIO_TUNEIN)
-                                child_item.setData(0, Qt.UserRole + 1, element.attributes['URL'].value)
-                                tree_item.addChild(child_item)
-                        tree_item.setExpanded(True)
+                url = self._tree_item_playlist_url(tree_item)
+                if url:
+                    self._resolve_stream(url, partial(self._play_tree_item, tree_item))
+                    return
+                populate = self._populate_tree(tree_item, NETRADIO_TUNEIN)
+                def _loaded(records, final):
+                    if records and records[0][0] is None:
+                        # plain list of stream urls instead of OPML
+                        populate([], True)
+                        self._play_tree_item(tree_item, records[0][1])
                     else:
-                        self._reset_active_item()
-                        self._active_item = tree_item
-                        tree_item.setData(0, Qt.ForegroundRole, QColor('#2E9ADC'))
-                        tree_item.setSelected(False)
-                        url = res.split('\n')[0]
-                        self.load_media(url, tree_item.text(0))
-                self._http_get(tree_item.data(0, Qt.UserRole + 1), _loaded)
+                        populate(records, final)
+                self._http_get_cached(tree_item.data(0, Qt.UserRole + 1), _loaded, 'tunein')
 
     ########################################
     #
     ########################################
-    def slot_favorite_double_clicked(self, list_item):
-        self._reset_active_item()
-        list_item.setData(Qt.ForegroundRole, QColor('#2E9ADC'))
-        list_item.setSelected(False)
-        self._active_item = list_item
-        self.activateWindow()
-        self.listWidgetFavorites.repaint()
-        self.load_media(list_item.data(Qt.UserRole), list_item.text())
+    def slot_favorite_double_clicked(self, index):
+        title, url = self._set_active_row(self.listViewFavorites, index)
+        self.load_media(url, title)
 
     ########################################
     # macos: title, artist/author, description, albumname, type
@@ -43,6 +43,13 @@ copy resources\mediainfos.ui "dist\%APP_NAME%\_internal\resources\"
 copy resources\mediainfo.exe "dist\%APP_NAME%\_internal\resources\"
 xcopy /e resources\filters "dist\%APP_NAME%\_internal\resources\filters\"
 
+echo.
+echo ****************************************
+echo Precompiling COM interface descriptors...
+echo ****************************************
+
+python -m dshow.comtypes._descriptors "dist\%APP_NAME%\_internal\resources\com_descriptors.cache"
+
 echo.
 echo ****************************************
 echo Optimizing application...
@@ -0,0 +1,273 @@
+'''
+Asynchronous, cached mediainfo probes.
+
+MediaInfoProbe runs the mediainfo CLI in a QProcess, so slow probes (network
+shares, huge MXF files) don't block the GUI. Output is passed on as it arrives
+(received signal), a running probe is killed if another file is probed or it's
+cancelled. Results are cached by path, size and mtime, in memory and as text
+files on disk, so showing the infos of an already probed file again doesn't
+start a process at all.
+
+While mediainfo runs, the container is probed in-process on a worker thread
+(containerprobe, metadata only) and its basic infos are passed on as
+preliminary text.
+'''
+
+from collections import OrderedDict
+import codecs
+import hashlib
+import os
+
+from PyQt5.QtCore import QObject, QProcess, QThread, QTimer, pyqtSignal, pyqtSlot
+
+import containerprobe
+
+__all__ = ['MediaInfoProbe']
+
+MAX_MEMORY_ENTRIES = 50
+MAX_DISK_ENTRIES = 1000
+CACHE_VERSION = 1
+
+# ms
+PROBE_TIMEOUT = 60000
+
+
+class _ContainerWorker(QObject):
+
+    probed = pyqtSignal(str, str)
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(str)
+    def probe(self, path):
+        infos = containerprobe.probe(path, cues=False)
+        if infos is not None:
+            self.probed.emit(path, containerprobe.format_infos(infos))
+
+
+class MediaInfoProbe(QObject):
+
+    # path, basic infos of the container, emitted before received if the file could be probed in-process
+    preliminary = pyqtSignal(str, str)
+    # path, decoded output chunk
+    received = pyqtSignal(str, str)
+    # path, complete output, ok
+    finished = pyqtSignal(str, str, bool)
+
+    _probe_container = pyqtSignal(str)
+
+    ########################################
+    # program is the path of the mediainfo binary
+    ########################################
+    def __init__(self, program, cache_dir, parent=None):
+        super().__init__(parent)
+        self._program = program
+        self._cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        # key: text
+        self._memory = OrderedDict()
+        self._process = None
+        self._path = None
+        self._key = None
+        self._chunks = []
+        self._decoder = None
+
+        self._timer_timeout = QTimer(self)
+        self._timer_timeout.setSingleShot(True)
+        self._timer_timeout.setInterval(PROBE_TIMEOUT)
+        self._timer_timeout.timeout.connect(self.cancel)
+
+        self._thread = QThread(self)
+        self._worker = _ContainerWorker()
+        self._worker.moveToThread(self._thread)
+        self._probe_container.connect(self._worker.probe)
+        self._worker.probed.connect(self.__probed)
+        self._thread.start()
+
+    ########################################
+    # returns cache key of file or None if it doesn't exist
+    ########################################
+    def key(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return hashlib.sha1(f'{CACHE_VERSION}\0{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}'
+                .encode()).hexdigest()
+
+    ########################################
+    # returns cached infos of path or None
+    ########################################
+    def cached(self, path):
+        key = self.key(path)
+        if key is None:
+            return None
+        text = self._memory.get(key)
+        if text is not None:
+            self._memory.move_to_end(key)
+            return text
+        fn = os.path.join(self._cache_dir, key + '.txt')
+        try:
+            with open(fn, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(fn)
+        except OSError:
+            return None
+        self.__remember(key, text)
+        return text
+
+    ########################################
+    # returns True if path is being probed
+    ########################################
+    def is_running(self, path=None):
+        return self._process is not None and (path is None or path == self._path)
+
+    ########################################
+    # starts probing path, cancels a running probe of another file
+    ########################################
+    def probe(self, path):
+        if self.is_running(path):
+            return
+        self.cancel()
+        self._path = path
+        self._key = self.key(path)
+        self._chunks = []
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self._process = QProcess(self)
+        self._process.readyReadStandardOutput.connect(self.__read)
+        self._process.finished.connect(self.__finished)
+        self._process.errorOccurred.connect(self.__error)
+        self._timer_timeout.start()
+        self._process.start(self._program, [path])
+        self._probe_container.emit(path)
+
+    ########################################
+    #
+    ########################################
+    def cancel(self):
+        self._timer_timeout.stop()
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        process.blockSignals(True)
+        process.kill()
+        process.waitForFinished(1000)
+        process.deleteLater()
+        self.finished.emit(self._path, ''.join(self._chunks), False)
+
+    ########################################
+    #
+    ########################################
+    def shutdown(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
+
+    ########################################
+    # container infos are only of use until mediainfo's output arrives
+    ########################################
+    def __probed(self, path, text):
+        if self.is_running(path) and not self._chunks:
+            self.preliminary.emit(path, text)
+
+    ########################################
+    #
+    ########################################
+    def __read(self):
+        chunk = self._decoder.decode(bytes(self._process.readAllStandardOutput()))
+        if chunk:
+            self._chunks.append(chunk)
+            self.received.emit(self._path, chunk)
+
+    ########################################
+    #
+    ########################################
+    def __finished(self, exit_code, exit_status):
+        self.__read()
+        self._timer_timeout.stop()
+        self._process.deleteLater()
+        self._process = None
+        text = ''.join(self._chunks).strip()
+        ok = exit_status == QProcess.NormalExit and exit_code == 0 and bool(text)
+        if ok and self._key is not None:
+            self.__remember(self._key, text)
+            self.__store(self._key, text)
+        self.finished.emit(self._path, text, ok)
+
+    ########################################
+    #
+    ########################################
+    def __error(self, error):
+        if error == QProcess.FailedToStart:
+            print('mediainfo: starting failed:', self._process.errorString())
+            self._timer_timeout.stop()
+            self._process.deleteLater()
+            self._process = None
+            self.finished.emit(self._path, '', False)
+
+    ########################################
+    #
+    ########################################
+    def __remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > MAX_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    ########################################
+    #
+    ########################################
+    def __store(self, key, text):
+        try:
+            with open(os.path.join(self._cache_dir, key + '.txt'), 'w', encoding='utf-8') as f:
+                f.write(text)
+            files = sorted((f.stat().st_mtime, f.path) for f in os.scandir(self._cache_dir) if f.name.endswith('.txt'))
+            for mtime, fn in files[:max(0, len(files) - MAX_DISK_ENTRIES)]:
+                os.remove(fn)
+        except OSError as e:
+            print('mediainfo: writing cache failed:', e)
+
+
+if __name__ == '__main__':
+    # benchmark: showing the infos of a file, with a stand-in for mediainfo that needs
+    # 1.5 s (e.g. a file on a network share) and prints its report in parts, first
+    # (probed) vs. second (cached) time, and how long the event loop was blocked
+    import stat, sys, tempfile, time
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+    app = QCoreApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        program = os.path.join(tmp_dir, 'mediainfo')
+        with open(program, 'w') as f:
+            f.write(f'#!{sys.executable}\n'
+                    'import sys, time\n'
+                    'for section in ("General", "Video", "Audio"):\n'
+                    '    time.sleep(.5)\n'
+                    '    print(section + "\\n" + "Complete name : " + sys.argv[1] + "\\n" * 20, flush=True)\n')
+        os.chmod(program, os.stat(program).st_mode | stat.S_IEXEC)
+
+        for run in ('first', 'second'):
+            probe = MediaInfoProbe(program, os.path.join(tmp_dir, 'cache'))
+            chunks = []
+            probe.received.connect(lambda path, chunk: chunks.append(time.perf_counter() - t))
+            max_block = 0
+            t = time.perf_counter()
+            text = probe.cached(__file__)
+            t_cached = time.perf_counter() - t
+            if text is None:
+                probe.probe(__file__)
+                t_start = time.perf_counter() - t
+                # the event loop keeps running while probing
+                tick = time.perf_counter()
+                while probe.is_running():
+                    app.processEvents(QEventLoop.WaitForMoreEvents, 10)
+                    max_block = max(max_block, time.perf_counter() - tick)
+                    tick = time.perf_counter()
+                print(f'{run:>6}: started in {1000 * t_start:.1f} ms, first output after {1000 * chunks[0]:.0f} ms, '
+                      f'complete after {1000 * (time.perf_counter() - t):.0f} ms, '
+                      f'event loop blocked max. {1000 * max_block:.0f} ms')
+            else:
+                print(f'{run:>6}: from cache in {1000 * t_cached:.2f} ms ({len(text)} characters)')
+            probe.shutdown()
@@ -0,0 +1,164 @@
+'''
+Watches stream metadata (author, title, description) of a DirectShow filter graph.
+
+The metadata-capable filter is located once per graph and its interface is cached,
+so later polls are a single COM call. Polls are scheduled adaptively: fast right
+after a new graph was attached or the metadata changed, backing off while nothing
+changes. Only depends on the duck-typed EnumFilters/QueryInterface protocol, so it
+can be driven by fake filter objects.
+'''
+
+__all__ = ['find_filter_interface', 'MetadataWatcher']
+
+MIN_INTERVAL = 1000
+MAX_INTERVAL = 16000
+
+
+########################################
+# returns interface of first filter in graph that supports it, or None
+########################################
+def find_filter_interface(filter_graph, interface):
+    enum = filter_graph.EnumFilters()
+    while True:
+        filt, fetched = enum.Next(1)
+        if not fetched:
+            return None
+        try:
+            return filt.QueryInterface(interface)
+        except Exception:
+            pass
+
+
+class MetadataWatcher():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, interface, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self._interface = interface
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._filter_graph = None
+        self._media_content = None
+        self._metadata = None
+
+        # interval in ms until next poll() is due, None if polling is pointless
+        self.interval = None
+
+        self.searches = 0
+
+    ########################################
+    #
+    ########################################
+    def attach(self, filter_graph):
+        self.detach()
+        self._filter_graph = filter_graph
+        self.searches += 1
+        self._media_content = find_filter_interface(filter_graph, self._interface)
+        if self._media_content is not None:
+            self.interval = self._min_interval
+
+    ########################################
+    #
+    ########################################
+    def detach(self):
+        self._filter_graph = None
+        self._media_content = None
+        self._metadata = None
+        self.interval = None
+
+    ########################################
+    # returns current metadata dict, or None if no metadata-capable filter was found
+    ########################################
+    def get_metadata(self):
+        if self._media_content is None:
+            return None
+        res = {}
+        for key, getter in (('author', 'get_AuthorName'), ('title', 'get_Title'), ('description', 'get_Description')):
+            try:
+                res[key] = getattr(self._media_content, getter)()
+            except Exception:
+                pass
+        return res
+
+    ########################################
+    # returns metadata if it changed since last poll, otherwise None
+    ########################################
+    def poll(self):
+        if self._media_content is None:
+            return None
+        metadata = self.get_metadata()
+        if metadata != self._metadata:
+            self._metadata = metadata
+            self.interval = self._min_interval
+            return metadata
+        self.interval = min(self._max_interval, self.interval * 2)
+        return None
+
+
+if __name__ == '__main__':
+    # demo with a fake filter graph: 10 simulated minutes of a stream whose title
+    # changes 3 times, metadata must be reported once per change, never for unchanged
+    # polls, and the filter graph must only be searched once
+    class IAMMediaContent():
+        pass
+
+    class FakeMediaContent():
+        def __init__(self):
+            self.title = 'Song 0'
+            self.calls = 0
+        def get_AuthorName(self):
+            self.calls += 1
+            return 'Station'
+        def get_Title(self):
+            self.calls += 1
+            return self.title
+        def get_Description(self):
+            raise OSError('not supported')
+
+    class FakeFilter():
+        def __init__(self, interface=None):
+            self._interface = interface
+        def QueryInterface(self, interface):
+            if self._interface is None:
+                raise OSError('E_NOINTERFACE')
+            return self._interface
+
+    class FakeEnumFilters():
+        def __init__(self, filters):
+            self._filters = iter(filters)
+        def Next(self, n):
+            filt = next(self._filters, None)
+            return filt, int(filt is not None)
+
+    media_content = FakeMediaContent()
+    filters = [FakeFilter(), FakeFilter(media_content), FakeFilter()]
+
+    class FakeFilterGraph():
+        def EnumFilters(self):
+            return FakeEnumFilters(filters)
+
+    CHANGES = {130000: 'Song 1', 300000: 'Song 2', 360000: 'Song 3'}
+    watcher = MetadataWatcher(IAMMediaContent)
+    watcher.attach(FakeFilterGraph())
+    now = polls = 0
+    changed = []
+    while now < 600000:
+        for t, title in CHANGES.items():
+            if now - watcher.interval < t <= now:
+                media_content.title = title
+        metadata = watcher.poll()
+        polls += 1
+        if metadata is not None:
+            changed.append((now, metadata['title']))
+        now += watcher.interval
+    for t, title in changed:
+        print(f'{t / 1000:6.1f} s: changed, {title!r}')
+    assert [title for t, title in changed] == ['Song 0', 'Song 1', 'Song 2', 'Song 3'], changed
+    assert watcher.searches == 1
+    print(f'{polls} polls ({media_content.calls} COM calls) in 600 s, {len(changed)} changes, '
+          f'{watcher.searches} filter graph search')
+
+    watcher.attach(type('FakeFilterGraph', (), {'EnumFilters': lambda self: FakeEnumFilters([FakeFilter()])})())
+    assert watcher.poll() is None and watcher.interval is None
+    print('graph without metadata filter: not polled')
@@ -0,0 +1,349 @@
+'''
+List models for the dock lists (TV livestreams, TV search, radio search, favorites).
+
+Records are stored as plain tuples in one Python list instead of one QListWidgetItem
+(plus QVariants for URL, id and full tooltip HTML) per entry. Display strings and
+tooltips are only built in data() for the rows that are actually shown, and
+replacing or clearing all results just swaps the list.
+
+PagedRecordListModel loads search results page by page: a small first page for
+a fast first paint, further pages when the view is scrolled to the end (Qt's
+canFetchMore/fetchMore), up to max_rows.
+'''
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+__all__ = ['RecordListModel', 'PagedRecordListModel']
+
+ACTIVE_COLOR = QColor('#2E9ADC')
+
+FIRST_PAGE_SIZE = 25
+PAGE_SIZE = 100
+MAX_ROWS = 2000
+
+
+class RecordListModel(QAbstractListModel):
+
+    ########################################
+    # display, url and tooltip are callables that take a record (tuple),
+    # rename(record, text) returns the renamed record if rows are editable,
+    # foreground(record) returns a QColor or None
+    ########################################
+    def __init__(self, display, url, tooltip=None, sort_key=None, rename=None, foreground=None, parent=None):
+        super().__init__(parent)
+        self._display = display
+        self._url = url
+        self._tooltip = tooltip
+        self._sort_key = sort_key
+        self._rename = rename
+        self._foreground = foreground
+        self._rows = []
+        self._active = None
+        self._generation = 0
+
+    ########################################
+    #
+    ########################################
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    ########################################
+    #
+    ########################################
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._rows[index.row()]
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self._display(record)
+        if role == Qt.ToolTipRole:
+            return self._tooltip(record) if self._tooltip else None
+        if role == Qt.ForegroundRole:
+            if record is self._active:
+                return ACTIVE_COLOR
+            return self._foreground(record) if self._foreground else None
+        if role == Qt.UserRole:
+            return self._url(record)
+        return None
+
+    ########################################
+    #
+    ########################################
+    def flags(self, index):
+        flags = super().flags(index)
+        if self._rename and index.isValid():
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    ########################################
+    #
+    ########################################
+    def setData(self, index, value, role=Qt.EditRole):
+        if not self._rename or role != Qt.EditRole or not index.isValid() or not value:
+            return False
+        record = self._rows[index.row()]
+        renamed = self._rename(record, value)
+        if record is self._active:
+            self._active = renamed
+        self._rows[index.row()] = renamed
+        self.dataChanged.emit(index, index)
+        if self._sort_key:
+            self.sort()
+        return True
+
+    ########################################
+    #
+    ########################################
+    def sort(self, column=0, order=Qt.AscendingOrder):
+        if not self._sort_key:
+            return
+        self.layoutAboutToBeChanged.emit()
+        key = self._sort_key
+        old_rows = sorted(range(len(self._rows)), key=lambda row: key(self._rows[row]),
+                reverse=order == Qt.DescendingOrder)
+        new_rows = [0] * len(old_rows)
+        for new_row, row in enumerate(old_rows):
+            new_rows[row] = new_row
+        self._rows = [self._rows[row] for row in old_rows]
+        # current and selected rows of views follow their records
+        old = self.persistentIndexList()
+        self.changePersistentIndexList(old, [self.index(new_rows[index.row()]) for index in old])
+        self.layoutChanged.emit()
+
+    ########################################
+    #
+    ########################################
+    def record(self, row):
+        return self._rows[row]
+
+    ########################################
+    #
+    ########################################
+    def records(self):
+        return list(self._rows)
+
+    ########################################
+    # takes ownership of records, expected to be sorted already if model sorts
+    ########################################
+    def set_records(self, records):
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = records
+        self._active = None
+        self.endResetModel()
+
+    ########################################
+    #
+    ########################################
+    def clear(self):
+        self.set_records([])
+
+    ########################################
+    #
+    ########################################
+    def add_records(self, records):
+        if not records:
+            return
+        if self._sort_key:
+            key = self._sort_key
+            records = sorted(records, key=key)
+            if self._rows:
+                # merged in as runs of inserted rows, so views keep selection and scroll position
+                runs = []
+                pos = 0
+                for record in records:
+                    k = key(record)
+                    while pos < len(self._rows) and not k < key(self._rows[pos]):
+                        pos += 1
+                    if runs and runs[-1][0] == pos:
+                        runs[-1][1].append(record)
+                    else:
+                        runs.append((pos, [record]))
+                inserted = 0
+                for pos, run in runs:
+                    row = pos + inserted
+                    self.beginInsertRows(QModelIndex(), row, row + len(run) - 1)
+                    self._rows[row:row] = run
+                    self.endInsertRows()
+                    inserted += len(run)
+                return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(records) - 1)
+        self._rows += records
+        self.endInsertRows()
+
+    ########################################
+    #
+    ########################################
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        if self._rows[row] is self._active:
+            self._active = None
+        del self._rows[row]
+        self.endRemoveRows()
+
+    ########################################
+    # clears the model and returns a callback for (records, final) that adds
+    # records, until the model is cleared or reset again
+    ########################################
+    def appender(self):
+        self.clear()
+        generation = self._generation
+        def _append(records, final=False):
+            if generation == self._generation:
+                self.add_records(records)
+        return _append
+
+    ########################################
+    # tooltips and colors of all rows have to be queried again
+    ########################################
+    def refresh(self):
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.ToolTipRole, Qt.ForegroundRole])
+
+    ########################################
+    # row (int) or None
+    ########################################
+    def set_active(self, row):
+        old = self._active
+        self._active = None if row is None else self._rows[row]
+        if old is not None:
+            # by identity, an equal record (e.g. a duplicate row) is another row
+            old_row = next((i for i, record in enumerate(self._rows) if record is old), None)
+            if old_row is not None:
+                index = self.index(old_row)
+                self.dataChanged.emit(index, index, [Qt.ForegroundRole])
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ForegroundRole])
+
+
+class PagedRecordListModel(RecordListModel):
+
+    ########################################
+    # fetch_page(query, offset, size, callback) requests a page of results,
+    # callback is called with (records, final)
+    ########################################
+    def __init__(self, display, url, fetch_page, tooltip=None, first_page_size=FIRST_PAGE_SIZE,
+            page_size=PAGE_SIZE, max_rows=MAX_ROWS, parent=None):
+        super().__init__(display, url, tooltip, parent=parent)
+        self._fetch_page = fetch_page
+        self._first_page_size = first_page_size
+        self._page_size = page_size
+        self._max_rows = max_rows
+        self._query = None
+        self._offset = 0
+        self._loading = False
+        self._exhausted = True
+
+    ########################################
+    # replaces rows with first page of results for query
+    ########################################
+    def search(self, query):
+        self.set_records([])
+        self._query = query
+        self._exhausted = False
+        self.__fetch(self._first_page_size)
+
+    ########################################
+    # records that don't belong to a search, no more pages are loaded
+    ########################################
+    def set_records(self, records):
+        self._query = None
+        self._offset = 0
+        self._loading = False
+        self._exhausted = True
+        super().set_records(records)
+
+    ########################################
+    #
+    ########################################
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and not self._loading and not self._exhausted
+                and len(self._rows) < self._max_rows)
+
+    ########################################
+    # called by the view when it's scrolled to the end
+    ########################################
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.__fetch(min(self._page_size, self._max_rows - len(self._rows)))
+
+    ########################################
+    #
+    ########################################
+    def __fetch(self, size):
+        self._loading = True
+        generation = self._generation
+        received = [0]
+        def _loaded(records, final):
+            if generation != self._generation:
+                return
+            received[0] += len(records)
+            self.add_records(records[:max(0, self._max_rows - len(self._rows))])
+            if final:
+                self._loading = False
+                self._offset += received[0]
+                if received[0] < size or len(self._rows) >= self._max_rows:
+                    self._exhausted = True
+        self._fetch_page(self._query, self._offset, size, _loaded)
+
+
+if __name__ == '__main__':
+    # benchmark: memory and clear time for 100k TV search results, QListWidget vs. model
+    import gc, os, resource, sys, time
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QListWidget, QListWidgetItem, QListView
+
+    N = 100000
+
+    def _rss():
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return rss if sys.platform == 'darwin' else rss * 1024
+
+    app = QApplication(sys.argv)
+    description = 'Lorem ipsum dolor sit amet, consetetur sadipscing elitr, sed diam nonumy eirmod tempor. ' * 3
+
+    def _tracks():
+        return [(f'CH{i % 40}', f'Title {i}', f'https://example.com/video/{i}_hd.mp4', description[:200 + i % 50])
+                for i in range(N)]
+
+    gc.collect()
+    rss = _rss()
+    view = QListView()
+    view.setUniformItemSizes(True)
+    model = RecordListModel(lambda r: f'[{r[0]}] {r[1]}', lambda r: r[2], lambda r: '<p>' + r[3] + '</p>',
+            sort_key=lambda r: (r[0], r[1]))
+    view.setModel(model)
+    t = time.perf_counter()
+    model.set_records(sorted(_tracks(), key=lambda r: (r[0], r[1])))
+    app.processEvents()
+    t_fill = time.perf_counter() - t
+    rss_model = _rss() - rss
+    t = time.perf_counter()
+    model.clear()
+    t_clear = time.perf_counter() - t
+    print(f'model:       {rss_model / 2**20:6.1f} MB, fill {1000 * t_fill:7.1f} ms, clear {1000 * t_clear:7.2f} ms')
+    del view, model
+    gc.collect()
+
+    rss = _rss()
+    widget = QListWidget()
+    widget.setUniformItemSizes(True)
+    t = time.perf_counter()
+    for r in _tracks():
+        list_item = QListWidgetItem(f'[{r[0]}] {r[1]}')
+        list_item.setData(Qt.UserRole, r[2])
+        list_item.setToolTip('<p>' + r[3] + '</p>')
+        widget.addItem(list_item)
+    app.processEvents()
+    t_fill = time.perf_counter() - t
+    rss_widget = _rss() - rss
+    t = time.perf_counter()
+    widget.clear()
+    t_clear = time.perf_counter() - t
+    print(f'QListWidget: {rss_widget / 2**20:6.1f} MB, fill {1000 * t_fill:7.1f} ms, clear {1000 * t_clear:7.2f} ms')
@@ -0,0 +1,326 @@
+'''
+Request layer on top of QNetworkAccessManager.
+
+- Identical GETs (same URL and headers) that are in flight at the same time share
+  one network request, subscribers joining late get the data received so far
+  replayed first.
+- Subscriptions can be put into a group (e.g. 'radio_search'), a new subscription
+  in a group cancels the previous one, so replies of superseded searches are never
+  delivered. A request is aborted once its last subscriber was cancelled.
+- At most max_per_host requests per host are running at the same time, others
+  are queued.
+- For each finished request a timing dict (queued, time to first byte, total, bytes,
+  number of shared subscribers) is emitted via requestFinished and kept in history.
+'''
+
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QUrl, pyqtSignal
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+
+__all__ = ['RequestManager', 'Request', 'Subscription']
+
+MAX_PER_HOST = 4
+HISTORY_SIZE = 200
+
+
+class Request():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, url, headers, key):
+        self.url = url
+        self.host = QUrl(url).host()
+        self.headers = headers
+        self.key = key
+        self.subscriptions = []
+        self.chunks = []
+        self.size = 0
+        self.reply = None
+        self.status = None
+        self.ok = False
+        self.cancelled = False
+        self.shared = 0
+        self._response_headers = {}
+
+        self.t_queued = time.perf_counter()
+        self.t_started = None
+        self.t_first_byte = None
+        self.t_finished = None
+
+    ########################################
+    #
+    ########################################
+    def data(self):
+        return b''.join(self.chunks)
+
+    ########################################
+    # returns response header as str, or None
+    ########################################
+    def header(self, name):
+        return self._response_headers.get(name.lower())
+
+    ########################################
+    # ms
+    ########################################
+    def timing(self):
+        def _ms(t0, t1):
+            return round(1000 * (t1 - t0), 1) if t0 is not None and t1 is not None else None
+        return {
+            'url': self.url,
+            'status': self.status,
+            'cancelled': self.cancelled,
+            'queued': _ms(self.t_queued, self.t_started),
+            'ttfb': _ms(self.t_started, self.t_first_byte),
+            'total': _ms(self.t_queued, self.t_finished),
+            'bytes': self.size,
+            'shared': self.shared,
+        }
+
+
+class Subscription():
+
+    __slots__ = ('request', 'group', 'on_data', 'on_finished', 'on_cancel', '_manager')
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, manager, request, on_finished, on_data, on_cancel, group):
+        self._manager = manager
+        self.request = request
+        self.on_finished = on_finished
+        self.on_data = on_data
+        self.on_cancel = on_cancel
+        self.group = group
+
+    ########################################
+    #
+    ########################################
+    def cancel(self):
+        self._manager._unsubscribe(self)
+
+
+class RequestManager(QObject):
+
+    # timing dict, see Request.timing()
+    requestFinished = pyqtSignal(dict)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, net_manager, max_per_host=MAX_PER_HOST, parent=None):
+        super().__init__(parent)
+        self._net_manager = net_manager
+        self._max_per_host = max_per_host
+        self._requests = {}
+        self._queues = {}
+        self._running = {}
+        self._groups = {}
+
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.network_requests = 0
+        self.shared_requests = 0
+
+    ########################################
+    # on_finished is called with the Request, on_data with each received chunk,
+    # on_cancel if the subscription was cancelled (explicitly or by a newer one
+    # in the same group). Returns Subscription.
+    ########################################
+    def get(self, url, on_finished, on_data=None, headers=None, group=None, on_cancel=None):
+        key = (url, tuple(sorted(headers.items())) if headers else ())
+        request = self._requests.get(key)
+        if request is None:
+            request = Request(url, headers, key)
+            self._requests[key] = request
+            self._queues.setdefault(request.host, deque()).append(request)
+        else:
+            request.shared += 1
+            self.shared_requests += 1
+
+        subscription = Subscription(self, request, on_finished, on_data, on_cancel, group)
+        request.subscriptions.append(subscription)
+        if on_data:
+            for data in request.chunks:
+                on_data(data)
+
+        if group is not None:
+            old = self._groups.get(group)
+            self._groups[group] = subscription
+            if old is not None:
+                self._unsubscribe(old)
+
+        self.__start_queued(request.host)
+        return subscription
+
+    ########################################
+    #
+    ########################################
+    def cancel_group(self, group):
+        subscription = self._groups.get(group)
+        if subscription is not None:
+            self._unsubscribe(subscription)
+
+    ########################################
+    #
+    ########################################
+    def _unsubscribe(self, subscription):
+        request = subscription.request
+        if subscription not in request.subscriptions:
+            return
+        request.subscriptions.remove(subscription)
+        if subscription.group is not None and self._groups.get(subscription.group) is subscription:
+            del self._groups[subscription.group]
+        if subscription.on_cancel:
+            subscription.on_cancel()
+        if request.subscriptions:
+            return
+        request.cancelled = True
+        del self._requests[request.key]
+        if request.reply is None:
+            self._queues[request.host].remove(request)
+            self.__report(request)
+        else:
+            request.reply.abort()
+
+    ########################################
+    #
+    ########################################
+    def __start_queued(self, host):
+        queue = self._queues.get(host)
+        while queue and self._running.get(host, 0) < self._max_per_host:
+            request = queue.popleft()
+            self._running[host] = self._running.get(host, 0) + 1
+            self.network_requests += 1
+            req = QNetworkRequest(QUrl(request.url))
+            if request.headers:
+                for name, value in request.headers.items():
+                    req.setRawHeader(name.encode(), value.encode())
+            request.t_started = time.perf_counter()
+            request.reply = self._net_manager.get(req)
+            request.reply.readyRead.connect(lambda request=request: self.__ready_read(request))
+            request.reply.finished.connect(lambda request=request: self.__finished(request))
+        if not queue:
+            self._queues.pop(host, None)
+
+    ########################################
+    #
+    ########################################
+    def __ready_read(self, request):
+        data = request.reply.readAll().data()
+        if not data:
+            return
+        if request.t_first_byte is None:
+            request.t_first_byte = time.perf_counter()
+        request.chunks.append(data)
+        request.size += len(data)
+        for subscription in list(request.subscriptions):
+            if subscription.on_data and subscription in request.subscriptions:
+                subscription.on_data(data)
+
+    ########################################
+    #
+    ########################################
+    def __finished(self, request):
+        if request.t_finished is not None:
+            return
+        reply = request.reply
+        if not request.cancelled:
+            self.__ready_read(request)
+        request.t_finished = time.perf_counter()
+        request.status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        request.ok = reply.error() == QNetworkReply.NoError
+        for name, value in reply.rawHeaderPairs():
+            request._response_headers[name.data().decode('latin-1').lower()] = value.data().decode('latin-1')
+        reply.deleteLater()
+
+        self._running[request.host] -= 1
+        if not self._running[request.host]:
+            del self._running[request.host]
+        if self._requests.get(request.key) is request:
+            del self._requests[request.key]
+
+        subscriptions, request.subscriptions = request.subscriptions, []
+        for subscription in subscriptions:
+            if subscription.group is not None and self._groups.get(subscription.group) is subscription:
+                del self._groups[subscription.group]
+            try:
+                subscription.on_finished(request)
+            except Exception as e:
+                print('netrequest: callback failed:', e)
+        self.__report(request)
+        self.__start_queued(request.host)
+
+    ########################################
+    #
+    ########################################
+    def __report(self, request):
+        timing = request.timing()
+        self.history.append(timing)
+        self.requestFinished.emit(timing)
+
+
+if __name__ == '__main__':
+    # demo against a local HTTP test server: duplicate GETs, superseded searches, host limit
+    import http.server, os, sys, threading, urllib.parse
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+    from PyQt5.QtNetwork import QNetworkAccessManager
+
+    hits = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            hits.append(self.path)
+            query = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(self.path).query))
+            time.sleep(float(query.get('delay', 0.1)))
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    app = QCoreApplication(sys.argv)
+    manager = RequestManager(QNetworkAccessManager())
+
+    def _wait():
+        loop = QEventLoop()
+        def _check():
+            if not manager._requests:
+                loop.quit()
+        timer = QTimer()
+        timer.timeout.connect(_check)
+        timer.start(10)
+        loop.exec_()
+
+    # double-clicking the same station 10 times
+    results = []
+    for _ in range(10):
+        manager.get(base + '/station.pls', lambda request: results.append(request.data()))
+    _wait()
+    print(f'10 identical GETs: {len(hits)} network request(s), {len(results)} callbacks')
+
+    # typing a search query, older (slower) searches must not overwrite newer results
+    hits.clear()
+    delivered = []
+    for i, query in enumerate(('r', 'ro', 'roc', 'rock')):
+        manager.get(f'{base}/search?q={query}&delay={0.4 - 0.1 * i:.1f}',
+                lambda request: delivered.append(request.data()), group='search')
+    _wait()
+    print(f'4 superseded searches: {len(hits)} reached server, delivered: {[d.decode() for d in delivered]}')
+
+    # 12 requests to one host, at most MAX_PER_HOST at a time
+    t = time.perf_counter()
+    for i in range(12):
+        manager.get(f'{base}/page?i={i}&delay=0.2', lambda request: None)
+    _wait()
+    print(f'12 requests, {MAX_PER_HOST} per host: {1000 * (time.perf_counter() - t):.0f} ms')
+    for timing in list(manager.history)[-3:]:
+        print(timing)
@@ -0,0 +1,161 @@
+'''
+Network layer shared by the main window and the video widget.
+
+One QNetworkAccessManager (so connections to the same hosts are reused), one
+RequestManager (coalescing, cancellation, per-host limits) and one HttpCache.
+Network.get() serves responses from the cache when fresh, otherwise it sends a
+conditional request, so repeated navigation costs no body bytes.
+'''
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QNetworkAccessManager
+
+from httpcache import HttpCache
+from netrequest import RequestManager
+
+__all__ = ['Network', 'shared_network']
+
+_shared = None
+
+
+class Network(QObject):
+
+    ########################################
+    # without cache_dir, responses are only cached in memory
+    ########################################
+    def __init__(self, cache_dir=None, parent=None):
+        super().__init__(parent)
+        self.manager = QNetworkAccessManager(self)
+        self.requests = RequestManager(self.manager, parent=self)
+        self.cache = HttpCache(cache_dir)
+
+    ########################################
+    # callback is called with (data, ok). If on_data is given, it gets every body
+    # that is delivered before callback is called, network bodies chunk by chunk
+    # while they arrive.
+    # provider selects the heuristic TTL for responses without Cache-Control.
+    # If stale_ok is True, a stale entry is delivered immediately and revalidated in
+    # the background, with refresh=True the new body is delivered as well if it
+    # changed. Returns Subscription of network request, or None if served from cache.
+    ########################################
+    def get(self, url, callback, provider=None, stale_ok=False, refresh=False, on_data=None,
+            on_cancel=None, group=None):
+        entry = self.cache.get(url)
+        delivered = False
+        if entry is not None and (stale_ok or self.cache.is_fresh(entry)):
+            if on_data:
+                on_data(entry.body)
+            callback(entry.body, True)
+            if self.cache.is_fresh(entry):
+                return None
+            delivered = True
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        def _finished(request):
+            if entry is not None and request.status == 304:
+                self.cache.touch(entry, request.header)
+                if not delivered:
+                    if on_data:
+                        on_data(entry.body)
+                    callback(entry.body, True)
+                return
+            data = request.data()
+            if not request.ok or request.status != 200:
+                if not delivered:
+                    callback(data, False)
+                return
+            self.cache.store(url, data, request.header, provider)
+            if not delivered:
+                callback(data, True)
+            elif refresh and data != entry.body:
+                if on_data:
+                    on_data(data)
+                callback(data, True)
+
+        return self.requests.get(url, _finished, headers=headers, group=group, on_cancel=on_cancel,
+                on_data=on_data if on_data and not delivered else None)
+
+    ########################################
+    # fetches urls that are not cached or stale in the background
+    ########################################
+    def prewarm(self, urls, provider=None):
+        for url in urls:
+            entry = self.cache.get(url)
+            if entry is None or not self.cache.is_fresh(entry):
+                self.get(url, lambda data, ok: None, provider)
+
+    ########################################
+    #
+    ########################################
+    def inspect(self, url):
+        return self.cache.inspect(url)
+
+
+########################################
+# returns the process wide Network, cache_dir is only used by the first call
+########################################
+def shared_network(cache_dir=None):
+    global _shared
+    if _shared is None:
+        _shared = Network(cache_dir)
+    return _shared
+
+
+if __name__ == '__main__':
+    # demo against a local HTTP test server: body bytes transferred for repeated navigation
+    import http.server, os, sys, tempfile, threading
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+    sent = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            etag = '"' + self.path + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = self.path.encode() * 1000
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            if self.path.startswith('/max-age'):
+                self.send_header('Cache-Control', 'max-age=60')
+            elif self.path.startswith('/no-store'):
+                self.send_header('Cache-Control', 'no-store')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            sent.append(len(body))
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    app = QCoreApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        network = Network(cache_dir)
+
+        def _get(url):
+            loop = QEventLoop()
+            network.get(url, lambda data, ok: loop.quit())
+            if network.requests._requests:
+                loop.exec_()
+
+        for path in ('/max-age', '/etag-only', '/no-store'):
+            for i in range(3):
+                sent.clear()
+                n = network.requests.network_requests
+                _get(base + path)
+                print(f'{path:>10} visit {i + 1}: {network.requests.network_requests - n} request(s), '
+                        f'{sum(sent):>6} body bytes')
+        print(network.inspect(base + '/max-age'))
+        print(network.cache.stats())
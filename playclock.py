@@ -0,0 +1,178 @@
+'''
+Playback clock for the time display.
+
+Reading the position from the backend (IMediaSeeking.GetCurrentPosition on
+Windows, AVPlayer.currentTime on macOS) is comparatively expensive, so
+PlaybackClock only reads it when the playback state changes (play, pause, seek,
+step) and every resync_interval seconds while playing. In between the position
+is interpolated from a monotonic clock.
+
+next_change() tells the display when the shown second or the slider's handle
+pixel changes next, so it can sleep until then instead of polling.
+'''
+
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+__all__ = ['PlaybackClock', 'next_change']
+
+# seconds
+RESYNC_INTERVAL = 5
+# backends apply seeks and steps asynchronously, the position is read again after
+SEEK_SETTLE_DELAY = .3
+
+
+########################################
+# returns seconds until the displayed second or slider pixel changes, pixels is
+# the width of the slider (only used if duration > 0)
+########################################
+def next_change(t, duration=0, pixels=0):
+    res = int(t) + 1 - t
+    if duration > 0 and pixels > 0:
+        pixel_duration = duration / pixels
+        res = min(res, (int(t / pixel_duration) + 1) * pixel_duration - t)
+    return max(res, 0)
+
+
+class PlaybackClock(QObject):
+
+    # position changed other than by playing on, e.g. seek, pause or resync
+    changed = pyqtSignal()
+
+    ########################################
+    # get_time returns the backend's position in seconds, clock the current
+    # time in seconds (monotonic)
+    ########################################
+    def __init__(self, get_time, resync_interval=RESYNC_INTERVAL, clock=time.monotonic, parent=None):
+        super().__init__(parent)
+        self._get_time = get_time
+        self._resync_interval = resync_interval
+        self._clock = clock
+        self._duration = 0
+        self._playing = False
+        self._position = 0
+        self._anchor = clock()
+
+        self._timer_settle = QTimer(self)
+        self._timer_settle.setSingleShot(True)
+        self._timer_settle.setInterval(int(1000 * SEEK_SETTLE_DELAY))
+        self._timer_settle.timeout.connect(self.sync)
+
+        self.backend_calls = 0
+
+    ########################################
+    # new media, duration in seconds (0 for live streams)
+    ########################################
+    def reset(self, duration=0):
+        self._timer_settle.stop()
+        self._duration = duration
+        self._playing = False
+        self.sync()
+
+    ########################################
+    #
+    ########################################
+    def is_playing(self):
+        return self._playing
+
+    ########################################
+    #
+    ########################################
+    def set_playing(self, flag):
+        if flag == self._playing:
+            return
+        self._playing = flag
+        self.sync()
+
+    ########################################
+    # position as seconds (float)
+    ########################################
+    def time(self):
+        if not self._playing:
+            return self._position
+        if self._clock() - self._anchor > self._resync_interval:
+            self.sync()
+        t = self._position + self._clock() - self._anchor
+        return min(t, self._duration) if self._duration > 0 else t
+
+    ########################################
+    # backend was asked to seek to t (seconds)
+    ########################################
+    def seek(self, t):
+        self._position = max(0, min(t, self._duration) if self._duration > 0 else t)
+        self._anchor = self._clock()
+        self._timer_settle.start()
+        self.changed.emit()
+
+    ########################################
+    # backend changed the position on its own (e.g. frame step), it's read again
+    # once settled
+    ########################################
+    def invalidate(self):
+        self._timer_settle.start()
+
+    ########################################
+    # reads position from backend
+    ########################################
+    def sync(self):
+        self.backend_calls += 1
+        self._position = self._get_time() or 0
+        self._anchor = self._clock()
+        self.changed.emit()
+
+
+if __name__ == '__main__':
+    # benchmark: backend position reads and time display updates per minute of
+    # playback, polling every 250 ms vs. PlaybackClock, using a fake backend and
+    # simulated time
+    import sys
+    from PyQt5.QtCore import QCoreApplication
+
+    DURATION = 5400
+    SLIDER_WIDTH = 800
+    MINUTE = 60
+
+    app = QCoreApplication(sys.argv)
+
+    class FakeBackend():
+        def __init__(self):
+            self.now = 0
+            self.calls = 0
+        def clock(self):
+            return self.now
+        def get_time(self):
+            self.calls += 1
+            # backend runs slightly slow, like a real one that buffers now and then
+            return self.now * .999
+
+    # polling, as before: every 250 ms, get_time() for slider and label, both always set
+    backend = FakeBackend()
+    updates = 0
+    while backend.now < MINUTE:
+        backend.get_time()
+        backend.get_time()
+        updates += 2
+        backend.now += .25
+    print(f'polling:        {backend.calls:4} backend calls, {updates:4} widget updates per minute')
+
+    # clock: display sleeps until the shown second or slider pixel changes
+    backend = FakeBackend()
+    clock = PlaybackClock(backend.get_time, clock=backend.clock)
+    clock.reset(DURATION)
+    clock.set_playing(True)
+    shown_second = shown_pixel = None
+    updates = max_error = 0
+    while backend.now < MINUTE:
+        t = clock.time()
+        max_error = max(max_error, abs(t - backend.now * .999))
+        second, pixel = int(t), int(SLIDER_WIDTH * t / DURATION)
+        if second != shown_second:
+            shown_second = second
+            updates += 1
+        if pixel != shown_pixel:
+            shown_pixel = pixel
+            updates += 1
+        backend.now += max(.01, next_change(t, DURATION, SLIDER_WIDTH)) + .001
+    print(f'PlaybackClock:  {backend.calls:4} backend calls, {updates:4} widget updates per minute, '
+          f'max. drift {1000 * max_error:.0f} ms')
@@ -0,0 +1,372 @@
+'''
+Station playlist resolution.
+
+PlaylistParser is an incremental parser for .pls, .m3u/.m3u8, .xspf and .asx
+playlists (and the plain URL lists returned by TuneIn's Tune.ashx), it's fed the
+response while it arrives. HLS playlists (#EXT-X- tags) are streams themselves and
+are not resolved.
+
+PlaylistResolver fetches playlists through the shared Network, follows nested
+playlists up to max_depth and returns ranked candidate stream URLs: URLs that
+recently failed to play and unresolved playlists are moved to the end, if a
+StreamProber is given, candidates are probed and working ones are ordered by
+time to first byte, otherwise playlist order is kept. Resolutions are cached
+with a TTL, keyed by station id, so the same station reached via search results
+or the directory tree is only resolved once.
+'''
+
+from collections import OrderedDict
+import os
+import re
+import time
+import urllib.parse
+from xml.parsers import expat
+
+from PyQt5.QtCore import QObject
+
+__all__ = ['PlaylistParser', 'PlaylistResolver', 'is_playlist_url', 'parse_playlist', 'station_id']
+
+PLAYLIST_EXTENSIONS = ('.pls', '.m3u', '.xspf', '.asx')
+
+MAX_DEPTH = 3
+MAX_ENTRIES = 256
+MAX_PROBED = 4
+
+# seconds
+TTL = 600
+FAILURE_TTL = 600
+
+_HREF = re.compile(rb'''href\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+_LOCATION = re.compile(rb'<location>\s*([^<\s]+)\s*</location>', re.IGNORECASE)
+
+
+########################################
+# True if url most likely points to a playlist rather than to a stream
+########################################
+def is_playlist_url(url):
+    path = urllib.parse.urlsplit(url).path.lower()
+    return path.endswith(PLAYLIST_EXTENSIONS) or path.endswith('/tune.ashx')
+
+
+########################################
+# returns id that identifies the station behind a playlist url, independent of
+# extra query parameters
+########################################
+def station_id(url):
+    parts = urllib.parse.urlsplit(url)
+    query = dict(urllib.parse.parse_qsl(parts.query))
+    host = (parts.hostname or '').lower()
+    if host.endswith('shoutcast.com') and 'id' in query:
+        return 'shoutcast:' + query['id']
+    if parts.path.lower().endswith('/tune.ashx') and 'id' in query:
+        return 'tunein:' + query['id']
+    if host.endswith('somafm.com'):
+        return 'somafm:' + os.path.splitext(os.path.basename(parts.path))[0]
+    return url
+
+
+class PlaylistParser():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self):
+        # 'pls', 'm3u', 'hls', 'xspf', 'asx' or 'xml', None until detected
+        self.format = None
+        self._head = b''
+        self._rest = b''
+        self._files = []
+        self._urls = []
+        self._xml = None
+        self._xml_raw = None
+        self._text = None
+
+    ########################################
+    #
+    ########################################
+    def feed(self, data, final=False):
+        if self.format is None:
+            self._head += data
+            head = self._head.lstrip(b'\xef\xbb\xbf \t\r\n')
+            if len(head) < 16 and not final:
+                return
+            data, self._head = head, b''
+            lower = head[:10].lower()
+            if lower.startswith(b'[playlist]'):
+                self.format = 'pls'
+            elif lower.startswith(b'<'):
+                self.format = 'xml'
+                self._xml_raw = []
+                self._xml = expat.ParserCreate()
+                self._xml.buffer_text = True
+                self._xml.StartElementHandler = self.__start_element
+                self._xml.EndElementHandler = self.__end_element
+                self._xml.CharacterDataHandler = self.__character_data
+            else:
+                self.format = 'm3u'
+
+        if self._xml_raw is not None:
+            self._xml_raw.append(data)
+            if self._xml is not None:
+                try:
+                    self._xml.Parse(data, final)
+                except expat.ExpatError:
+                    # asx files often aren't well-formed, urls are extracted from raw data at close()
+                    self._xml = None
+            return
+
+        data = self._rest + data
+        lines = data.split(b'\n')
+        self._rest = b'' if final else lines.pop()
+        if self.format == 'pls':
+            for line in lines:
+                key, _, value = line.partition(b'=')
+                key = key.strip().lower()
+                if key[:4] == b'file' and key[4:].isdigit():
+                    value = value.strip()
+                    if value:
+                        self._files.append((int(key[4:]), value.decode('utf-8', errors='replace')))
+        else:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                if line[0] == 35:  # '#'
+                    if line.startswith(b'#EXT-X-'):
+                        self.format = 'hls'
+                elif b'://' in line:
+                    self._urls.append(line.decode('utf-8', errors='replace'))
+
+    ########################################
+    # returns list of urls in playlist order
+    ########################################
+    def close(self):
+        self.feed(b'', True)
+        if self.format == 'pls':
+            self._files.sort(key=lambda item: item[0])
+            return [url for n, url in self._files]
+        if self._xml_raw is not None and self._xml is None:
+            raw = b''.join(self._xml_raw)
+            matches = _LOCATION.findall(raw) if self.format == 'xspf' else _HREF.findall(raw)
+            return [url.decode('utf-8', errors='replace') for url in matches]
+        return self._urls
+
+    ########################################
+    #
+    ########################################
+    def __start_element(self, name, attrs):
+        name = name.lower()
+        if self.format == 'xml':
+            self.format = 'xspf' if name == 'playlist' else 'asx' if name == 'asx' else 'xml'
+        if name == 'location':
+            self._text = []
+        elif name in ('ref', 'entryref'):
+            for key, value in attrs.items():
+                if key.lower() == 'href':
+                    self._urls.append(value.strip())
+
+    ########################################
+    #
+    ########################################
+    def __end_element(self, name):
+        if self._text is not None and name.lower() == 'location':
+            url = ''.join(self._text).strip()
+            if url:
+                self._urls.append(url)
+            self._text = None
+
+    ########################################
+    #
+    ########################################
+    def __character_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+########################################
+# returns list of urls contained in playlist data (bytes)
+########################################
+def parse_playlist(data):
+    parser = PlaylistParser()
+    parser.feed(data)
+    return parser.close()
+
+
+class PlaylistResolver(QObject):
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, network, prober=None, ttl=TTL, max_entries=MAX_ENTRIES, max_depth=MAX_DEPTH, parent=None):
+        super().__init__(parent)
+        self._network = network
+        self._prober = prober
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_depth = max_depth
+
+        # station id: (candidate urls, time resolved), least recently used first
+        self._resolved = OrderedDict()
+        # station id: list of callbacks
+        self._waiting = {}
+        # station id: prober group for the candidates of a pending resolve
+        self._probe_groups = {}
+        # stream url: time of failure
+        self._failed = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    ########################################
+    # returns ranked candidate urls if url was resolved already, otherwise None
+    ########################################
+    def cached(self, url):
+        if not is_playlist_url(url):
+            return [url]
+        key = station_id(url)
+        item = self._resolved.get(key)
+        if item is None or time.time() - item[1] > self._ttl:
+            return None
+        self._resolved.move_to_end(key)
+        return self._rank(item[0])
+
+    ########################################
+    # like cached(), but read-only (LRU order and failures are left alone), for
+    # lookups while painting
+    ########################################
+    def peek(self, url):
+        if not is_playlist_url(url):
+            return [url]
+        item = self._resolved.get(station_id(url))
+        if item is None or time.time() - item[1] > self._ttl:
+            return None
+        return self._rank(item[0], prune=False)
+
+    ########################################
+    #
+    ########################################
+    def is_pending(self, url):
+        return station_id(url) in self._waiting
+
+    ########################################
+    # callback is called with list of ranked candidate urls (empty if resolving
+    # failed), synchronously if url was resolved already. The best candidates are
+    # probed in probe_group (see StreamProber.probe).
+    ########################################
+    def resolve(self, url, callback, probe_group=None):
+        candidates = self.cached(url)
+        if candidates is not None:
+            self.hits += 1
+            callback(candidates)
+            return
+        self.misses += 1
+        key = station_id(url)
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            if self._probe_groups[key] != probe_group:
+                self._probe_groups[key] = None
+            return
+        self._waiting[key] = [callback]
+        self._probe_groups[key] = probe_group
+        self.__resolve(url, 0, lambda urls: self.__resolved(key, urls))
+
+    ########################################
+    # stream url failed to play, it's ranked last for a while
+    ########################################
+    def report_failure(self, stream_url):
+        self._failed[stream_url] = time.time()
+
+    ########################################
+    #
+    ########################################
+    def _rank(self, urls, prune=True):
+        now = time.time()
+        if prune:
+            for url, t in list(self._failed.items()):
+                if now - t > FAILURE_TTL:
+                    del self._failed[url]
+        failed = lambda url: url in self._failed and now - self._failed[url] <= FAILURE_TTL
+        res = list(dict.fromkeys(urls))
+        if self._prober:
+            res.sort(key=lambda url: (failed(url), is_playlist_url(url), self._prober.rank_key(url)))
+        else:
+            res.sort(key=lambda url: (failed(url), is_playlist_url(url)))
+        return res
+
+    ########################################
+    #
+    ########################################
+    def __resolved(self, key, urls):
+        if urls:
+            self._resolved[key] = (urls, time.time())
+            self._resolved.move_to_end(key)
+            while len(self._resolved) > self._max_entries:
+                self._resolved.popitem(last=False)
+        candidates = self._rank(urls)
+        probe_group = self._probe_groups.pop(key, None)
+        if self._prober:
+            self._prober.probe([url for url in candidates[:MAX_PROBED] if not is_playlist_url(url)], probe_group)
+        for callback in self._waiting.pop(key, []):
+            callback(candidates)
+
+    ########################################
+    # calls done with list of stream urls in playlist order, nested playlists
+    # replaced by their contents
+    ########################################
+    def __resolve(self, url, depth, done):
+        parser = PlaylistParser()
+
+        def _finished(data, ok):
+            urls = parser.close() if ok else []
+            if parser.format == 'hls':
+                done([url])
+                return
+            urls = [urllib.parse.urljoin(url, u) for u in urls]
+            nested = list(dict.fromkeys(u for u in urls if is_playlist_url(u))) if depth < self._max_depth else []
+            if not nested:
+                done(urls)
+                return
+            results = {}
+            def _nested_done(nested_url, nested_urls):
+                results[nested_url] = nested_urls
+                if len(results) == len(nested):
+                    flat = []
+                    for u in urls:
+                        flat += results[u] if u in results else [u]
+                    done(flat)
+            for nested_url in nested:
+                self.__resolve(nested_url, depth + 1, lambda nested_urls, nested_url=nested_url:
+                        _nested_done(nested_url, nested_urls))
+
+        self._network.get(url, _finished, on_data=parser.feed)
+
+
+if __name__ == '__main__':
+    # benchmark: parsing large synthetic playlists, fed in 16 KB chunks
+    N = 100000
+    CHUNK_SIZE = 16384
+
+    playlists = {
+        'pls': ('[playlist]\n' + ''.join(f'File{i}=http://stream{i % 97}.example.com:8000/live{i}\n'
+                f'Title{i}=Station {i}\nLength{i}=-1\n' for i in range(1, N + 1)) + f'NumberOfEntries={N}\nVersion=2\n'),
+        'm3u': ('#EXTM3U\n' + ''.join(f'#EXTINF:-1,Station {i}\nhttp://stream{i % 97}.example.com:8000/live{i}\n'
+                for i in range(N))),
+        'xspf': ('<?xml version="1.0" encoding="UTF-8"?>\n<playlist version="1" xmlns="http://xspf.org/ns/0/"><trackList>'
+                + ''.join(f'<track><title>Station {i}</title><location>http://stream{i % 97}.example.com:8000/live{i}'
+                f'</location></track>' for i in range(N)) + '</trackList></playlist>'),
+        'asx': ('<asx version="3.0">' + ''.join(f'<entry><title>Station {i}</title><ref href="http://stream{i % 97}'
+                f'.example.com:8000/live{i}"/></entry>' for i in range(N)) + '</asx>'),
+        'asx (broken)': ('<asx version="3.0">' + ''.join(f'<entry><title>Rock & Roll {i}</title><ref href="http://stream'
+                f'{i % 97}.example.com:8000/live{i}"/></entry>' for i in range(N)) + '</asx>'),
+    }
+    for name, text in playlists.items():
+        data = text.encode()
+        t = time.perf_counter()
+        parser = PlaylistParser()
+        for pos in range(0, len(data), CHUNK_SIZE):
+            parser.feed(data[pos:pos + CHUNK_SIZE])
+        urls = parser.close()
+        t = time.perf_counter() - t
+        assert len(urls) == N, (name, len(urls))
+        print(f'{name:>12}: {N} entries, {len(data) / 2**20:5.1f} MB in {1000 * t:6.1f} ms '
+              f'({len(data) / 2**20 / t:6.1f} MB/s)')
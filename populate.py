@@ -0,0 +1,518 @@
+'''
+Population pipeline for the directory tree and the dock lists.
+
+Raw response bytes are parsed on a worker thread (BackgroundParser), the resulting
+record batches come back to the GUI thread via signal, and ChunkedInserter adds
+them to the view in chunks, one chunk per event loop turn, with updates and
+sorting suspended while inserting. So no single step blocks the GUI thread for
+longer than about one frame. Given a sort key, each chunk is merged into place,
+so views that are kept sorted this way never need a (blocking) re-sort.
+
+Decoders are pluggable per provider (register_decoder), for each decoded payload
+the time spent in the parser on the worker thread (bytes, records, ms) is emitted
+via BackgroundParser.decoded and kept in its history.
+'''
+
+from bisect import bisect_right
+from collections import deque
+import json
+import time
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+__all__ = ['BackgroundParser', 'ChunkedInserter', 'JsonRecordParser', 'decoder', 'register_decoder']
+
+# ms per event loop turn
+FRAME_BUDGET = 8
+
+HISTORY_SIZE = 200
+
+# keys per block of _SortedKeys
+BLOCK_SIZE = 1024
+
+# provider: parser factory
+_decoders = {}
+
+
+########################################
+# make_parser returns a parser (see BackgroundParser.start) for responses of provider
+########################################
+def register_decoder(provider, make_parser):
+    _decoders[provider] = make_parser
+
+
+########################################
+# returns parser factory registered for provider, or None
+########################################
+def decoder(provider):
+    return _decoders.get(provider)
+
+
+class JsonRecordParser():
+
+    ########################################
+    # extract is called with the decoded JSON and returns list of records
+    ########################################
+    def __init__(self, extract):
+        self._extract = extract
+        self._chunks = []
+
+    ########################################
+    #
+    ########################################
+    def feed(self, data, final=False):
+        self._chunks.append(data)
+        if not final:
+            return []
+        data, self._chunks = b''.join(self._chunks), []
+        return self._extract(json.loads(data))
+
+
+class _ParseWorker(QObject):
+
+    # job, records, final, stats (bytes, records, ms) if final
+    parsed = pyqtSignal(int, list, bool, dict)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self):
+        super().__init__()
+        self._parsers = {}
+        self._stats = {}
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(int, object)
+    def add(self, job, parser):
+        self._parsers[job] = parser
+        self._stats[job] = {'bytes': 0, 'records': 0, 'ms': 0.0}
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(int)
+    def remove(self, job):
+        self._parsers.pop(job, None)
+        self._stats.pop(job, None)
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(int, object, bool)
+    def feed(self, job, data, final):
+        parser = self._parsers.get(job)
+        if parser is None:
+            return
+        t = time.perf_counter()
+        try:
+            records = parser.feed(data, final)
+        except Exception as e:
+            print('populate: parsing failed:', e)
+            records, final = [], True
+        stats = self._stats[job]
+        stats['ms'] += 1000 * (time.perf_counter() - t)
+        stats['bytes'] += len(data)
+        stats['records'] += len(records)
+        if final:
+            del self._parsers[job]
+            del self._stats[job]
+        if records or final:
+            self.parsed.emit(job, records, final, stats if final else {})
+
+
+class BackgroundParser(QObject):
+
+    # name, bytes, records, ms (time spent parsing on the worker thread)
+    decoded = pyqtSignal(dict)
+
+    _add = pyqtSignal(int, object)
+    _remove = pyqtSignal(int)
+    _feed = pyqtSignal(int, object, bool)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._callbacks = {}
+        self._names = {}
+        self._next_job = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+        self._thread = QThread(self)
+        self._worker = _ParseWorker()
+        self._worker.moveToThread(self._thread)
+        self._add.connect(self._worker.add)
+        self._remove.connect(self._worker.remove)
+        self._feed.connect(self._worker.feed)
+        self._worker.parsed.connect(self.__parsed)
+        self._thread.start()
+
+    ########################################
+    # parser must provide feed(data, final) returning a list of records,
+    # callback is called in the GUI thread with (records, final), name (e.g. the
+    # provider) is used for instrumentation
+    ########################################
+    def start(self, parser, callback, name=None):
+        self._next_job += 1
+        self._callbacks[self._next_job] = callback
+        self._names[self._next_job] = name or type(parser).__name__
+        self._add.emit(self._next_job, parser)
+        return self._next_job
+
+    ########################################
+    # returns (callback, on_data, on_cancel) for Network.get that parse each
+    # delivered body on the worker thread and call callback with (records, final)
+    ########################################
+    def callbacks(self, make_parser, callback, name=None):
+        jobs = []
+        def _data(data):
+            if not jobs:
+                jobs.append(self.start(make_parser(), callback, name))
+            self.feed(jobs[0], data)
+        def _finished(data, ok):
+            if not jobs:
+                jobs.append(self.start(make_parser(), callback, name))
+            self.feed(jobs.pop(), b'', True)
+        def _cancel():
+            if jobs:
+                self.cancel(jobs.pop())
+        return _finished, _data, _cancel
+
+    ########################################
+    #
+    ########################################
+    def feed(self, job, data, final=False):
+        if job in self._callbacks:
+            self._feed.emit(job, data, final)
+
+    ########################################
+    #
+    ########################################
+    def cancel(self, job):
+        self._names.pop(job, None)
+        if self._callbacks.pop(job, None):
+            self._remove.emit(job)
+
+    ########################################
+    #
+    ########################################
+    def shutdown(self):
+        self._callbacks.clear()
+        self._names.clear()
+        self._thread.quit()
+        self._thread.wait()
+
+    ########################################
+    # returns dict name: (payloads, bytes, ms) of decoded payloads in history
+    ########################################
+    def stats(self):
+        res = {}
+        for item in self.history:
+            payloads, size, ms = res.get(item['name'], (0, 0, 0.0))
+            res[item['name']] = (payloads + 1, size + item['bytes'], ms + item['ms'])
+        return res
+
+    ########################################
+    #
+    ########################################
+    def __parsed(self, job, records, final, stats):
+        callback = self._callbacks.get(job)
+        if callback is None:
+            return
+        if final:
+            del self._callbacks[job]
+            stats['name'] = self._names.pop(job)
+            self.history.append(stats)
+            self.decoded.emit(stats)
+        callback(records, final)
+
+
+class _SortedKeys():
+
+    ########################################
+    # sorted list of keys split into blocks, so inserting stays cheap for 100k+ keys
+    ########################################
+    def __init__(self):
+        self._blocks = []
+        self._maxes = []
+
+    ########################################
+    # inserts key after equal ones, returns its index
+    ########################################
+    def insert(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            return 0
+        b = min(bisect_right(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[b]
+        i = bisect_right(block, key)
+        block.insert(i, key)
+        self._maxes[b] = block[-1]
+        index = i + sum(map(len, self._blocks[:b]))
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks[b:b + 1] = block[:BLOCK_SIZE], block[BLOCK_SIZE:]
+            self._maxes[b:b + 1] = block[BLOCK_SIZE - 1], block[-1]
+        return index
+
+
+class ChunkedInserter(QObject):
+
+    # number of views currently being populated, sorting is restored when it drops to 0
+    _populating = {}
+
+    finished = pyqtSignal()
+
+    ########################################
+    # make_item turns a record into a view item, add_items adds a list of them.
+    # If sort_key and insert_items(index, items) are given instead, each chunk is
+    # merged into the rows added so far in sort_key order, so the view can keep its
+    # own sorting switched off and no final re-sort is needed.
+    ########################################
+    def __init__(self, view, make_item, add_items=None, budget=FRAME_BUDGET, parent=None,
+            sort_key=None, insert_items=None):
+        super().__init__(parent if parent else view)
+        self._view = view
+        self._make_item = make_item
+        self._add_items = add_items
+        self._sort_key = sort_key
+        self._insert_items = insert_items
+        self._keys = _SortedKeys() if sort_key else None
+        self._budget = budget / 1000
+        self._pending = []
+        self._pos = 0
+        self._final = False
+        self._active = False
+        self._cancelled = False
+
+        self.rows = 0
+        self.max_chunk_time = 0
+        self._last_chunk_end = None
+        self.max_turn_time = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.__insert_chunk)
+
+    ########################################
+    #
+    ########################################
+    def append(self, records, final=False):
+        if self._cancelled:
+            return
+        if records:
+            if self._pos:
+                self._pending = self._pending[self._pos:]
+                self._pos = 0
+            self._pending += records
+            self.__begin()
+        if final:
+            self._final = True
+        if not self._timer.isActive():
+            self._timer.start()
+
+    ########################################
+    #
+    ########################################
+    def cancel(self):
+        self._cancelled = True
+        self._timer.stop()
+        self._pending = []
+        self._pos = 0
+        self.__end()
+
+    ########################################
+    #
+    ########################################
+    def __begin(self):
+        if self._active:
+            return
+        self._active = True
+        key = id(self._view)
+        if not self._populating.get(key):
+            self._populating[key] = (self._view.isSortingEnabled(), 0)
+            self._view.setSortingEnabled(False)
+        sorting, count = self._populating[key]
+        self._populating[key] = (sorting, count + 1)
+
+    ########################################
+    #
+    ########################################
+    def __end(self):
+        if not self._active:
+            return
+        self._active = False
+        key = id(self._view)
+        sorting, count = self._populating[key]
+        if count > 1:
+            self._populating[key] = (sorting, count - 1)
+        else:
+            del self._populating[key]
+            self._view.setSortingEnabled(sorting)
+
+    ########################################
+    #
+    ########################################
+    def __insert_chunk(self):
+        t0 = time.perf_counter()
+        if self._last_chunk_end is not None:
+            # time the event loop spent elsewhere (layout, painting) since last chunk
+            self.max_turn_time = max(self.max_turn_time, t0 - self._last_chunk_end)
+        deadline = t0 + self._budget
+        make_item = self._make_item
+        self._view.setUpdatesEnabled(False)
+        try:
+            while self._pos < len(self._pending):
+                chunk = self._pending[self._pos:self._pos + 256]
+                self._pos += len(chunk)
+                if self._keys is None:
+                    self._add_items([make_item(record) for record in chunk])
+                else:
+                    self.__merge_chunk(chunk)
+                self.rows += len(chunk)
+                if time.perf_counter() > deadline:
+                    break
+        finally:
+            self._view.setUpdatesEnabled(True)
+        self._last_chunk_end = time.perf_counter()
+        self.max_chunk_time = max(self.max_chunk_time, self._last_chunk_end - t0)
+        if self._pos < len(self._pending):
+            self._timer.start()
+            return
+        self._last_chunk_end = None
+        self._pending = []
+        self._pos = 0
+        if self._final:
+            self.__end()
+            self.finished.emit()
+
+    ########################################
+    # inserts chunk at its sorted positions, runs of adjacent rows in one call
+    ########################################
+    def __merge_chunk(self, chunk):
+        sort_key = self._sort_key
+        chunk.sort(key=sort_key)
+        start, items = 0, []
+        for record in chunk:
+            index = self._keys.insert(sort_key(record))
+            if index != start + len(items):
+                if items:
+                    self._insert_items(start, items)
+                start, items = index, []
+            items.append(self._make_item(record))
+        if items:
+            self._insert_items(start, items)
+
+
+if __name__ == '__main__':
+    # benchmark: inserting rows into a sorted QListWidget/QTreeWidget under the offscreen
+    # platform, per item with the view sorting vs. chunks merged into place
+    import os, sys
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication, QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem
+
+    app = QApplication(sys.argv)
+
+    # longest single garbage collection, it's part of the GUI stalls but not caused
+    # by the inserter
+    import gc
+    gc_pauses = []
+    def _gc_callback(phase, info):
+        if phase == 'start':
+            gc_pauses.append(time.perf_counter())
+        else:
+            gc_pauses[-1] = time.perf_counter() - gc_pauses[-1]
+    gc.callbacks.append(_gc_callback)
+
+    def _run(view, make_item, insert_items, records):
+        gc_pauses.clear()
+        inserter = ChunkedInserter(view, make_item, sort_key=lambda r: r[0], insert_items=insert_items)
+        loop = QEventLoop()
+        inserter.finished.connect(loop.quit)
+        t = time.perf_counter()
+        inserter.append(records, True)
+        loop.exec_()
+        t = time.perf_counter() - t
+        t_sort = time.perf_counter()
+        app.processEvents()
+        t_sort = time.perf_counter() - t_sort
+        return t, max(inserter.max_chunk_time, inserter.max_turn_time, t_sort), max(gc_pauses, default=0)
+
+    for n in (10000, 50000, 100000):
+        records = [(f'Station {(i * 7919) % n}', str(i)) for i in range(n)]
+
+        view = QListWidget()
+        view.setSortingEnabled(True)
+        view.show()
+        t = time.perf_counter()
+        for name, _ in records:
+            view.addItem(QListWidgetItem(name))
+        app.processEvents()
+        t_naive = time.perf_counter() - t
+
+        view = QListWidget()
+        view.setUniformItemSizes(True)
+        view.show()
+        t, stall, gc_pause = _run(view, lambda r: QListWidgetItem(r[0]),
+                lambda index, items: [view.insertItem(index + i, item) for i, item in enumerate(items)], records)
+        assert [view.item(i).text() for i in range(n)] == sorted(name for name, _ in records)
+        print(f'{n:>6} rows, list: per-item {1000 * t_naive:7.0f} ms blocking, '
+              f'chunked {1000 * t:7.0f} ms total, longest GUI stall {1000 * stall:5.1f} ms '
+              f'(longest gc pause {1000 * gc_pause:5.1f} ms)')
+
+        tree = QTreeWidget()
+        tree.setUniformRowHeights(True)
+        tree.show()
+        parent_item = QTreeWidgetItem(['Genre'])
+        tree.addTopLevelItem(parent_item)
+        parent_item.setExpanded(True)
+        t, stall, gc_pause = _run(tree, lambda r: QTreeWidgetItem([r[0]]), parent_item.insertChildren, records)
+        assert [parent_item.child(i).text(0) for i in range(n)] == sorted(name for name, _ in records)
+        print(f'{n:>6} rows, tree: chunked {1000 * t:7.0f} ms total, longest GUI stall {1000 * stall:5.1f} ms '
+              f'(longest gc pause {1000 * gc_pause:5.1f} ms)')
+
+    # benchmark: longest GUI thread stall while decoding large payloads, on the GUI
+    # thread vs. on the worker thread (responses fed in 16 KB chunks)
+    from dirparse import RecordParser
+
+    payloads = {
+        'shoutcast_stations': (lambda: RecordParser('station'), ('<stationlist>' + ''.join(
+                f'<station name="Station {i}" id="{i}" br="128" genre="Rock" lc="{i % 100}"/>'
+                for i in range(100000)) + '</stationlist>').encode()),
+        'tv_search': (lambda: JsonRecordParser(lambda res: [(t['channel'], t['title'], t['url_video'], t['description'])
+                for t in res['result']['results']]), json.dumps({'result': {'results': [{'channel': 'ARD',
+                'title': f'Show {i}', 'url_video': f'https://example.com/{i}.mp4', 'description': 'Lorem ipsum ' * 20}
+                for i in range(20000)]}}).encode()),
+    }
+    bg_parser = BackgroundParser()
+    for name, (make_parser, data) in payloads.items():
+        ticks = []
+        timer = QTimer()
+        timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        timer.start(5)
+        app.processEvents()
+
+        t = time.perf_counter()
+        make_parser().feed(data, True)
+        stall_gui = time.perf_counter() - t
+
+        ticks.clear()
+        loop = QEventLoop()
+        job = bg_parser.start(make_parser(), lambda records, final: loop.quit() if final else None, name)
+        for pos in range(0, len(data), 16384):
+            bg_parser.feed(job, data[pos:pos + 16384])
+        bg_parser.feed(job, b'', True)
+        t = time.perf_counter()
+        loop.exec_()
+        timer.stop()
+        stall_worker = max(b - a for a, b in zip([t] + ticks, ticks + [time.perf_counter()]))
+        stats = bg_parser.history[-1]
+        print(f'{name:>18}: {len(data) / 2**20:4.1f} MB, GUI thread blocked {1000 * stall_gui:6.1f} ms, '
+              f'with worker {1000 * stall_worker:5.1f} ms (timer period 5 ms), {stats["ms"]:6.1f} ms decoding '
+              f'kept off the GUI thread')
+    bg_parser.shutdown()
@@ -0,0 +1,109 @@
+'''
+Background resolution of station playlists.
+
+Playlist URLs (.pls, .m3u, TuneIn Tune.ashx, ...) of the selected, hovered and
+neighbouring items are resolved ahead of time by the PlaylistResolver (which
+keeps them in its bounded cache), so a double-click can call load_media right
+away instead of waiting for the playlist round trip. For resolved streams the
+host name is looked up and a connection is opened by the shared
+QNetworkAccessManager, which warms the system DNS cache for the native player and
+lets the ICY metadata reader reuse the connection.
+'''
+
+from collections import OrderedDict, deque
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QUrl
+from PyQt5.QtNetwork import QHostInfo
+
+from playlist import is_playlist_url
+
+__all__ = ['Prefetcher']
+
+MAX_HOSTS = 256
+MAX_PENDING = 4
+
+# seconds
+PRECONNECT_INTERVAL = 60
+
+# ms
+HOVER_DELAY = 150
+
+
+class Prefetcher(QObject):
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, resolver, network, parent=None):
+        super().__init__(parent)
+        self._resolver = resolver
+        self._network = network
+        self._queue = deque()
+        self._pending = 0
+        self._connected_hosts = OrderedDict()
+
+        self._hover_url = None
+        self._timer_hover = QTimer(self)
+        self._timer_hover.setSingleShot(True)
+        self._timer_hover.setInterval(HOVER_DELAY)
+        self._timer_hover.timeout.connect(lambda: self.prefetch([self._hover_url]))
+
+    ########################################
+    # most important url first, urls that can't be fetched right away are
+    # queued, replacing older queued ones
+    ########################################
+    def prefetch(self, urls):
+        self._queue.clear()
+        for url in urls:
+            if not url:
+                continue
+            if not is_playlist_url(url):
+                self.preconnect(url)
+            elif self._resolver.cached(url) is None and not self._resolver.is_pending(url):
+                self._queue.append(url)
+        self.__next()
+
+    ########################################
+    # prefetches url if mouse rests on its item for a moment
+    ########################################
+    def hover(self, url):
+        if not url:
+            return
+        self._hover_url = url
+        self._timer_hover.start()
+
+    ########################################
+    #
+    ########################################
+    def preconnect(self, stream_url):
+        url = QUrl(stream_url)
+        host = url.host()
+        if not host or time.time() - self._connected_hosts.get(host, 0) < PRECONNECT_INTERVAL:
+            return
+        self._connected_hosts[host] = time.time()
+        self._connected_hosts.move_to_end(host)
+        while len(self._connected_hosts) > MAX_HOSTS:
+            self._connected_hosts.popitem(last=False)
+        QHostInfo.lookupHost(host, lambda info: None)
+        if url.scheme() == 'https':
+            self._network.manager.connectToHostEncrypted(host, url.port(443))
+        elif url.scheme() == 'http':
+            self._network.manager.connectToHost(host, url.port(80))
+
+    ########################################
+    #
+    ########################################
+    def __next(self):
+        while self._queue and self._pending < MAX_PENDING:
+            self._pending += 1
+            self._resolver.resolve(self._queue.popleft(), self.__resolved)
+
+    ########################################
+    #
+    ########################################
+    def __resolved(self, stream_urls):
+        self._pending -= 1
+        if stream_urls:
+            self.preconnect(stream_urls[0])
+        self.__next()
@@ -0,0 +1,174 @@
+'''
+Persistent playback state (resume positions) of files and VOD URLs.
+
+ResumeStore keeps (key, position, duration, played) rows in an SQLite table
+with the normalized path/URL as primary key, so a lookup is a single index
+probe no matter how many entries there are. Checkpoints only update an
+in-memory dict; pending entries are written in one transaction at most every
+FLUSH_INTERVAL seconds (and on close), and positions that moved less than
+MIN_CHANGE seconds aren't written again, so playing a file for an hour causes
+a few dozen row writes instead of one per tick. The table is trimmed to the
+max_entries most recently played entries when opened.
+'''
+
+import os
+import sqlite3
+import time
+import urllib.parse
+
+__all__ = ['ResumeStore', 'normalize_key']
+
+MAX_ENTRIES = 100000
+
+# seconds
+FLUSH_INTERVAL = 60
+MIN_CHANGE = 5
+# positions closer to the start or end aren't resumed
+MIN_RESUME = 10
+END_MARGIN = 15
+
+
+########################################
+# returns key of local path or URL
+########################################
+def normalize_key(path):
+    if '://' in path:
+        parts = urllib.parse.urlsplit(path)
+        return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                parts.query, ''))
+    return os.path.normcase(os.path.realpath(path))
+
+
+class ResumeStore():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, path=':memory:', max_entries=MAX_ENTRIES):
+        self._db = sqlite3.connect(path)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS positions (key TEXT PRIMARY KEY, '
+                'position REAL, duration REAL, played REAL) WITHOUT ROWID')
+        self._db.execute('CREATE INDEX IF NOT EXISTS positions_played ON positions (played)')
+        self._db.execute('DELETE FROM positions WHERE key IN (SELECT key FROM positions '
+                'ORDER BY played DESC LIMIT -1 OFFSET ?)', (max_entries,))
+        self._db.commit()
+        # key: (position, duration, played), not written yet
+        self._pending = {}
+        self._flushed = time.time()
+        self.writes = 0
+
+    ########################################
+    #
+    ########################################
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    ########################################
+    # returns (position, duration, played) of path or None
+    ########################################
+    def get(self, path):
+        return self._row(normalize_key(path))
+
+    ########################################
+    #
+    ########################################
+    def _row(self, key):
+        if key in self._pending:
+            return self._pending[key]
+        return self._db.execute('SELECT position, duration, played FROM positions WHERE key = ?', (key,)).fetchone()
+
+    ########################################
+    # returns position (seconds) to resume path at, or None
+    ########################################
+    def position(self, path):
+        row = self.get(path)
+        if row is None:
+            return None
+        position, duration, played = row
+        if position < MIN_RESUME or (duration > 0 and position > duration - END_MARGIN):
+            return None
+        return position
+
+    ########################################
+    # records position and duration (seconds) of path, cheap enough to be called
+    # on every checkpoint
+    ########################################
+    def update(self, path, position, duration):
+        key = normalize_key(path)
+        row = self._row(key)
+        now = time.time()
+        if row is None or abs(row[0] - position) >= MIN_CHANGE or row[1] != duration:
+            self._pending[key] = (position, duration, now)
+        if now - self._flushed >= FLUSH_INTERVAL:
+            self.flush()
+
+    ########################################
+    # writes pending entries
+    ########################################
+    def flush(self):
+        self._flushed = time.time()
+        if not self._pending:
+            return
+        try:
+            with self._db:
+                self._db.executemany('INSERT OR REPLACE INTO positions (key, position, duration, played) '
+                        'VALUES (?, ?, ?, ?)', [(key, *row) for key, row in self._pending.items()])
+        except sqlite3.Error as e:
+            print('resume: writing positions failed:', e)
+            return
+        self.writes += len(self._pending)
+        self._pending.clear()
+
+
+if __name__ == '__main__':
+    # benchmark: lookup of one entry among 100k, ResumeStore vs. a JSON blob (like the
+    # favorites setting) that has to be parsed, and row writes for half an hour of
+    # playback with a checkpoint every 10 s
+    import json, random, tempfile
+
+    N = 100000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        entries = {f'/media/videos/{i // 1000}/file_{i}.mkv': (random.uniform(0, 5000), 5400, time.time() - i)
+                for i in range(N)}
+
+        blob = json.dumps({normalize_key(path): row for path, row in entries.items()})
+        t = time.perf_counter()
+        for i in range(10):
+            json.loads(blob).get(normalize_key(f'/media/videos/{i}/file_{i * 1000 + 7}.mkv'))
+        t_json = (time.perf_counter() - t) / 10
+
+        store = ResumeStore(os.path.join(tmp_dir, 'resume.sqlite'))
+        store._pending = {normalize_key(path): row for path, row in entries.items()}
+        t = time.perf_counter()
+        store.flush()
+        t_fill = time.perf_counter() - t
+        store.close()
+
+        t = time.perf_counter()
+        store = ResumeStore(os.path.join(tmp_dir, 'resume.sqlite'))
+        t_open = time.perf_counter() - t
+        keys = random.sample(list(entries), 1000)
+        t = time.perf_counter()
+        for path in keys:
+            store.get(path)
+        t_lookup = (time.perf_counter() - t) / len(keys)
+        print(f'{N} entries: lookup {1e6 * t_lookup:.0f} us (JSON blob: {1000 * t_json:.0f} ms), '
+              f'open {1000 * t_open:.1f} ms, initial fill {t_fill:.1f} s')
+
+        # simulated clock: half an hour of playback, checkpoint every 10 s
+        now = time.time()
+        real_time, time.time = time.time, lambda: now
+        store.writes = 0
+        for i in range(180):
+            store.update('/media/videos/new.mkv', i * 10., 3600.)
+            now += 10
+        store.flush()
+        time.time = real_time
+        print(f'30 min of playback: 180 checkpoints, {store.writes} row writes, '
+              f'resume at {store.position("/media/videos/new.mkv")}')
+        store.close()
@@ -0,0 +1,195 @@
+'''
+Seek scheduling for slider scrubbing and skip keys.
+
+At most one seek is sent to the backend at a time, requests that arrive while
+it's in flight replace each other, so only the latest target is sent once the
+backend reports the seek as finished (seekFinished signal). While the slider is
+dragged or a skip key is held, fast (keyframe) seeks are used, followed by one
+precise seek to the final position. The skip step grows while the key is held.
+If the keyframe index of the media is known, fast seeks are snapped to the
+nearest keyframe, so the position is exact and the backend doesn't have to
+decode from the start of the GOP.
+'''
+
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+__all__ = ['SeekScheduler']
+
+# seconds
+SKIP_STEPS = (1, 2, 5, 10, 30)
+# key repeats per step size
+SKIP_REPEATS_PER_STEP = 8
+# skips closer together are key repeats
+SKIP_REPEAT_INTERVAL = .25
+
+# ms
+SEEK_TIMEOUT = 2000
+SKIP_SETTLE_DELAY = 250
+
+
+class SeekScheduler(QObject):
+
+    ########################################
+    # backend must provide seek_to_time(sec, fast) and emit seekFinished once the
+    # seek was applied, get_position returns the current position in seconds
+    ########################################
+    def __init__(self, backend, get_position, parent=None):
+        super().__init__(parent)
+        self._backend = backend
+        self._get_position = get_position
+        self._duration = 0
+        self._busy = False
+        # (target, fast) or None
+        self._pending = None
+        self._target = 0
+        self._keyframes = None
+
+        self._skip_time = 0
+        self._skip_direction = 0
+        self._skip_repeats = 0
+
+        self._timer_timeout = QTimer(self)
+        self._timer_timeout.setSingleShot(True)
+        self._timer_timeout.setInterval(SEEK_TIMEOUT)
+        self._timer_timeout.timeout.connect(self.__finished)
+        backend.seekFinished.connect(self.__finished)
+
+        self._timer_skip = QTimer(self)
+        self._timer_skip.setSingleShot(True)
+        self._timer_skip.setInterval(SKIP_SETTLE_DELAY)
+        self._timer_skip.timeout.connect(lambda: self.seek(self._target))
+
+        self.requested = 0
+        self.issued = 0
+
+    ########################################
+    # new media, duration in seconds
+    ########################################
+    def reset(self, duration=0):
+        self._duration = duration
+        self._keyframes = None
+        self._pending = None
+        self._timer_skip.stop()
+        self._skip_direction = 0
+
+    ########################################
+    # KeyframeIndex of the current media or None
+    ########################################
+    def set_keyframes(self, index):
+        self._keyframes = index
+
+    ########################################
+    # returns target clamped to the media's duration (and snapped to a keyframe
+    # for fast seeks)
+    ########################################
+    def seek(self, t, fast=False):
+        t = max(0, min(t, self._duration) if self._duration > 0 else t)
+        if fast and self._keyframes is not None and self._keyframes.keyframes:
+            t = self._keyframes.keyframe(t)
+        self.requested += 1
+        self._target = t
+        self._pending = (t, fast)
+        if not self._busy:
+            self.__next()
+        return t
+
+    ########################################
+    # direction is 1 or -1, returns target
+    ########################################
+    def skip(self, direction):
+        now = time.monotonic()
+        if direction == self._skip_direction and now - self._skip_time < SKIP_REPEAT_INTERVAL:
+            self._skip_repeats += 1
+            base = self._target
+        else:
+            self._skip_repeats = 0
+            base = self._get_position()
+        self._skip_time = now
+        self._skip_direction = direction
+        step = SKIP_STEPS[min(self._skip_repeats // SKIP_REPEATS_PER_STEP, len(SKIP_STEPS) - 1)]
+        if self._skip_repeats == 0:
+            return self.seek(base + direction * step)
+        # key is held, precise seek once it's released
+        self._timer_skip.start()
+        return self.seek(base + direction * step, True)
+
+    ########################################
+    #
+    ########################################
+    def __next(self):
+        t, fast = self._pending
+        self._pending = None
+        self._busy = True
+        self.issued += 1
+        self._timer_timeout.start()
+        self._backend.seek_to_time(t, fast)
+
+    ########################################
+    #
+    ########################################
+    def __finished(self):
+        self._timer_timeout.stop()
+        self._busy = False
+        if self._pending is not None:
+            self.__next()
+
+
+if __name__ == '__main__':
+    # test with a fake backend that needs 20 ms for fast and 150 ms for precise
+    # seeks: scrubbing (mouse moves every 8 ms) and a held skip key (repeats every 33 ms)
+    import os, sys
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop, pyqtSignal
+
+    app = QCoreApplication(sys.argv)
+
+    class FakeBackend(QObject):
+        seekFinished = pyqtSignal()
+        def __init__(self):
+            super().__init__()
+            self.position = 0
+            self.seeks = []
+            self.busy_time = 0
+        def seek_to_time(self, sec, fast=False):
+            latency = .02 if fast else .15
+            self.seeks.append((sec, fast))
+            self.busy_time += latency
+            # fast seeks land on a keyframe (every 2 s)
+            self.position = sec - sec % 2 if fast else sec
+            QTimer.singleShot(int(1000 * latency), self.seekFinished.emit)
+
+    def _wait(ms):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec_()
+
+    backend = FakeBackend()
+    seeker = SeekScheduler(backend, lambda: backend.position)
+    seeker.reset(3600)
+    for i in range(200):
+        seeker.seek(i * 10.3, fast=True)
+        _wait(8)
+    seeker.seek(200 * 10.3)
+    _wait(400)
+    print(f'scrubbing: {seeker.requested} requests, {len(backend.seeks)} seeks '
+          f'({sum(1 for t, fast in backend.seeks if not fast)} precise), backend busy {backend.busy_time:.1f} s, '
+          f'final position {backend.position:.1f} (target {200 * 10.3:.1f}), '
+          f'naive: {seeker.requested} seeks, {seeker.requested * .15:.1f} s busy')
+    assert backend.position == 200 * 10.3
+
+    backend = FakeBackend()
+    seeker = SeekScheduler(backend, lambda: backend.position)
+    seeker.reset(3600)
+    steps = []
+    target = 0
+    for i in range(60):
+        t = seeker.skip(1)
+        steps.append(round(t - target))
+        target = t
+        _wait(33)
+    _wait(600)
+    print(f'skip key held for 2 s: {seeker.requested} requests, {len(backend.seeks)} seeks, steps {steps[::8]}..., '
+          f'final position {backend.position:.0f} (target {target:.0f})')
+    assert backend.position == target and not backend.seeks[-1][1]
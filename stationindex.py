@@ -0,0 +1,459 @@
+'''
+Offline full-text index of radio stations and TV channels.
+
+StationIndex keeps (title, url, provider, kind) rows in an SQLite FTS5 table, so
+prefix queries over all stations of all directories take about a millisecond and
+can be run on every keystroke. StationCrawler fills it in the background by
+walking the SHOUTcast, SomaFM, TuneIn and zapp listings through a fetch function
+with the signature of Main._http_get_cached (so listings come from, and end up in,
+the directory cache). All directory URLs can be overridden, e.g. to point the
+crawler at local stand-in servers.
+
+Each crawl of a provider gets a new generation number, rows of older generations
+are only dropped once the provider was crawled completely, so the index stays
+usable while a crawl is running.
+'''
+
+import re
+import sqlite3
+import time
+from collections import deque
+from functools import partial
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from dirparse import RecordParser
+from populate import JsonRecordParser
+
+__all__ = ['StationIndex', 'StationCrawler', 'DIRECTORY_URLS']
+
+SEARCH_LIMIT = 200
+
+# seconds
+CRAWL_INTERVAL = 86400
+
+MAX_PENDING = 2
+TUNEIN_MAX_DEPTH = 2
+TUNEIN_MAX_REQUESTS = 500
+
+DIRECTORY_URLS = {
+    'shoutcast_genres': 'http://api.shoutcast.com/genre/primary?k=fa1669MuiRPorUBw&f=xml',
+    'shoutcast_subgenres': 'http://api.shoutcast.com/genre/secondary?k=fa1669MuiRPorUBw&f=xml&parentid={id}',
+    'shoutcast_stations': 'http://api.shoutcast.com/station/advancedsearch?k=fa1669MuiRPorUBw&f=xml&genre_id={id}',
+    'shoutcast_tunein': 'http://yp.shoutcast.com/sbin/tunein-station.pls?id={id}&type=.pls',
+    'somafm': 'http://somafm.com/channels.xml',
+    'tunein': 'http://opml.radiotime.com/',
+    'zapp': 'https://api.zapp.mediathekview.de/v1/channelInfoList',
+}
+
+# provider: kind
+PROVIDERS = {
+    'shoutcast': 'radio',
+    'somafm': 'radio',
+    'tunein': 'radio',
+    'zapp': 'tv',
+}
+
+
+########################################
+# turns user input into an FTS5 query that matches all words as title prefixes
+########################################
+def _match_query(text, kind=None):
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    query = 'title : (' + ' '.join(f'"{word}"*' for word in words) + ')'
+    if kind:
+        # kind is an indexed column, so filtering by it doesn't scan all title matches
+        query += f' AND kind : "{kind}"'
+    return query
+
+
+class StationIndex():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, path=':memory:'):
+        self._db = sqlite3.connect(path)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)')
+        try:
+            self._db.execute('CREATE VIRTUAL TABLE IF NOT EXISTS stations USING fts5(title, '
+                    'url UNINDEXED, provider UNINDEXED, kind, generation UNINDEXED, '
+                    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite was built without FTS5, fall back to (slower) LIKE queries
+            self._db.execute('CREATE TABLE IF NOT EXISTS stations_plain '
+                    '(title TEXT, url TEXT, provider TEXT, kind TEXT, generation INTEGER)')
+            self.fts = False
+        self._table = 'stations' if self.fts else 'stations_plain'
+        self._db.commit()
+
+    ########################################
+    #
+    ########################################
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+    ########################################
+    #
+    ########################################
+    def _get_meta(self, key, default=None):
+        row = self._db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    ########################################
+    #
+    ########################################
+    def _set_meta(self, key, value):
+        self._db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    ########################################
+    # returns time of last complete crawl of provider, 0 if never crawled
+    ########################################
+    def crawled(self, provider):
+        return self._get_meta('crawled:' + provider, 0)
+
+    ########################################
+    # starts a new crawl of provider, returns its generation
+    ########################################
+    def begin(self, provider):
+        generation = self._get_meta('generation:' + provider, 0) + 1
+        self._set_meta('generation:' + provider, generation)
+        self._db.commit()
+        return generation
+
+    ########################################
+    # records are (title, url) tuples
+    ########################################
+    def add(self, provider, kind, generation, records):
+        if not records:
+            return
+        self._db.executemany(f'INSERT INTO {self._table} (title, url, provider, kind, generation) VALUES (?, ?, ?, ?, ?)',
+                [(title, url, provider, kind, generation) for title, url in records])
+        self._db.commit()
+
+    ########################################
+    # crawl of provider completed, drops rows of older generations
+    ########################################
+    def finish(self, provider, generation):
+        self._db.execute(f'DELETE FROM {self._table} WHERE provider = ? AND generation != ?', (provider, generation))
+        self._set_meta('crawled:' + provider, time.time())
+        self._db.commit()
+
+    ########################################
+    #
+    ########################################
+    def count(self, provider=None):
+        if provider is None:
+            return self._db.execute(f'SELECT count(*) FROM {self._table}').fetchone()[0]
+        return self._db.execute(f'SELECT count(*) FROM {self._table} WHERE provider = ?', (provider,)).fetchone()[0]
+
+    ########################################
+    # returns list of (title, url, provider), in index order
+    ########################################
+    def search(self, text, kind=None, limit=SEARCH_LIMIT):
+        if self.fts:
+            query = _match_query(text, kind)
+            if not query:
+                return []
+            sql = 'SELECT title, url, provider FROM stations WHERE stations MATCH ? LIMIT ?'
+            params = [query]
+        else:
+            words = re.findall(r'\w+', text)
+            if not words:
+                return []
+            sql = 'SELECT title, url, provider FROM stations_plain WHERE ' + ' AND '.join(['title LIKE ?'] * len(words))
+            params = [f'%{word}%' for word in words]
+            if kind:
+                sql += ' AND kind = ?'
+                params.append(kind)
+            sql += ' LIMIT ?'
+        # while a provider is recrawled, stations are contained twice
+        params.append(2 * limit)
+        res, urls = [], set()
+        for row in self._db.execute(sql, params):
+            if row[1] not in urls:
+                urls.add(row[1])
+                res.append(row)
+                if len(res) == limit:
+                    break
+        return res
+
+
+class StationCrawler(QObject):
+
+    # provider, number of indexed entries
+    providerFinished = pyqtSignal(str, int)
+    finished = pyqtSignal()
+
+    ########################################
+    # fetch(url, callback, provider, make_parser=...) must call callback with
+    # (records, final), like Main._http_get_cached
+    ########################################
+    def __init__(self, index, fetch, urls=None, max_pending=MAX_PENDING, interval=CRAWL_INTERVAL, parent=None):
+        super().__init__(parent)
+        self._index = index
+        self._fetch = fetch
+        self._urls = dict(DIRECTORY_URLS)
+        if urls:
+            self._urls.update(urls)
+        self._max_pending = max_pending
+        self._interval = interval
+
+        self._queue = deque()
+        self._pending = 0
+        self._crawls = {}
+        self._crawl_id = 0
+
+        self.requests = 0
+
+    ########################################
+    #
+    ########################################
+    def is_running(self):
+        return bool(self._crawls)
+
+    ########################################
+    # crawls all providers that weren't crawled within the crawl interval
+    ########################################
+    def start(self, providers=None, force=False):
+        for provider in providers if providers else PROVIDERS:
+            if provider in self._crawls:
+                continue
+            if not force and time.time() - self._index.crawled(provider) < self._interval:
+                continue
+            self._crawls[provider] = {
+                'generation': self._index.begin(provider),
+                'tasks': 0,
+                'seen': set(),
+                'requests': 0,
+                'added': 0,
+            }
+            if provider == 'shoutcast':
+                self._enqueue(provider, self._urls['shoutcast_genres'], 'shoutcast', 'genre', self.__shoutcast_genres)
+            elif provider == 'somafm':
+                self._enqueue(provider, self._urls['somafm'], 'somafm', 'channel', self.__stations)
+            elif provider == 'tunein':
+                self._enqueue(provider, self._urls['tunein'], 'tunein', 'opml', partial(self.__tunein_outlines, 0))
+            elif provider == 'zapp':
+                self._enqueue(provider, self._urls['zapp'], 'zapp', partial(JsonRecordParser, lambda res:
+                        [(track['name'], track['streamUrl']) for track in res.values()]), self.__stations)
+        self.__next()
+
+    ########################################
+    # running requests are ignored, incomplete crawls are finished on next start
+    ########################################
+    def stop(self):
+        self._crawl_id += 1
+        self._queue.clear()
+        self._pending = 0
+        self._crawls.clear()
+
+    ########################################
+    # parser is a RecordParser kind or a factory
+    ########################################
+    def _enqueue(self, provider, url, cache_provider, parser, handler):
+        crawl = self._crawls[provider]
+        if url in crawl['seen']:
+            return
+        crawl['seen'].add(url)
+        crawl['tasks'] += 1
+        make_parser = partial(RecordParser, parser) if type(parser) == str else parser
+        self._queue.append((provider, url, cache_provider, make_parser, handler))
+
+    ########################################
+    #
+    ########################################
+    def __next(self):
+        while self._queue and self._pending < self._max_pending:
+            provider, url, cache_provider, make_parser, handler = self._queue.popleft()
+            self._pending += 1
+            self._crawls[provider]['requests'] += 1
+            self.requests += 1
+            self._fetch(url, partial(self.__loaded, self._crawl_id, provider, handler),
+                    cache_provider, make_parser=make_parser)
+
+    ########################################
+    #
+    ########################################
+    def __loaded(self, crawl_id, provider, handler, records, final):
+        if crawl_id != self._crawl_id:
+            return
+        try:
+            handler(provider, records)
+        except Exception as e:
+            print('stationindex: crawling failed:', e)
+        if not final:
+            return
+        self._pending -= 1
+        crawl = self._crawls[provider]
+        crawl['tasks'] -= 1
+        if not crawl['tasks']:
+            if crawl['added']:
+                self._index.finish(provider, crawl['generation'])
+            else:
+                # probably offline, keep results of last crawl
+                print('stationindex: crawling found no entries:', provider)
+            del self._crawls[provider]
+            self.providerFinished.emit(provider, self._index.count(provider))
+            if not self._crawls:
+                self.finished.emit()
+        self.__next()
+
+    ########################################
+    # records are (title, url)
+    ########################################
+    def __stations(self, provider, records):
+        seen = self._crawls[provider]['seen']
+        records = [record for record in records if record[1] not in seen]
+        seen.update(record[1] for record in records)
+        self._crawls[provider]['added'] += len(records)
+        self._index.add(provider, PROVIDERS[provider], self._crawls[provider]['generation'], records)
+
+    ########################################
+    #
+    ########################################
+    def __shoutcast_genres(self, provider, records):
+        for name, genre_id in records:
+            self._enqueue(provider, self._urls['shoutcast_subgenres'].format(id=genre_id), 'shoutcast',
+                    'genre', self.__shoutcast_subgenres)
+
+    ########################################
+    #
+    ########################################
+    def __shoutcast_subgenres(self, provider, records):
+        for name, genre_id in records:
+            self._enqueue(provider, self._urls['shoutcast_stations'].format(id=genre_id), 'shoutcast_stations',
+                    'station', self.__shoutcast_stations)
+
+    ########################################
+    #
+    ########################################
+    def __shoutcast_stations(self, provider, records):
+        self.__stations(provider, [(name, self._urls['shoutcast_tunein'].format(id=station_id))
+                for name, station_id in records])
+
+    ########################################
+    # records are (text, URL, type)
+    ########################################
+    def __tunein_outlines(self, depth, provider, records):
+        crawl = self._crawls[provider]
+        stations = []
+        for text, url, outline_type in records:
+            if outline_type == 'audio':
+                stations.append((text, url))
+            elif outline_type == 'link' and depth < TUNEIN_MAX_DEPTH and crawl['requests'] + crawl['tasks'] < TUNEIN_MAX_REQUESTS:
+                self._enqueue(provider, url, 'tunein', 'opml', partial(self.__tunein_outlines, depth + 1))
+        self.__stations(provider, stations)
+
+
+if __name__ == '__main__':
+    # self-check: crawl of canned directory replies from a local stand-in server,
+    # then a benchmark of as-you-type queries against an index of 100k synthetic stations
+    import http.server, json, os, random, sys, threading
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop, QTimer
+    from network import Network
+    from populate import BackgroundParser
+
+    REPLIES = {
+        '/shoutcast/genres': '<genrelist><genre name="Rock" id="1"/><genre name="Jazz" id="2"/></genrelist>',
+        '/shoutcast/subgenres?id=1': '<genrelist><genre name="Hard Rock" id="11"/></genrelist>',
+        '/shoutcast/subgenres?id=2': '<genrelist><genre name="Bebop" id="21"/><genre name="Swing" id="22"/></genrelist>',
+        '/shoutcast/stations?id=11': '<stationlist><station name="Rock Antenne" id="101"/>'
+                '<station name="Hard Rock FM" id="102"/></stationlist>',
+        '/shoutcast/stations?id=21': '<stationlist><station name="Bebop Radio" id="201"/></stationlist>',
+        # duplicate of another genre is indexed once
+        '/shoutcast/stations?id=22': '<stationlist><station name="Bebop Radio" id="201"/>'
+                '<station name="Swing &amp; Jive" id="202"/></stationlist>',
+        '/somafm': '<channels><channel id="groovesalad"><title><![CDATA[Groove Salad]]></title>'
+                '<fastpls format="mp3">https://somafm.com/groovesalad.pls</fastpls></channel></channels>',
+        '/tunein': '<opml><body><outline type="link" text="Music" URL="BASE/tunein/music"/>'
+                '<outline type="audio" text="Talk Radio" URL="http://tunein.example/talk"/></body></opml>',
+        '/tunein/music': '<opml><body><outline type="audio" text="Jazz Lounge" URL="http://tunein.example/jazz"/>'
+                '<outline type="link" text="Music" URL="BASE/tunein/music"/></body></opml>',
+        '/zapp': json.dumps({'das_erste': {'name': 'Das Erste', 'streamUrl': 'https://zapp.example/ard.m3u8'}}),
+    }
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            body = REPLIES.get(self.path)
+            self.send_response(200 if body else 404)
+            body = (body or '').replace('BASE', base).encode()
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    app = QCoreApplication(sys.argv)
+    network = Network()
+    bg_parser = BackgroundParser()
+
+    def _fetch(url, callback, provider, make_parser=None):
+        finished, on_data, on_cancel = bg_parser.callbacks(make_parser, callback, provider)
+        network.get(url, finished, provider, on_data=on_data, on_cancel=on_cancel)
+
+    index = StationIndex()
+    crawler = StationCrawler(index, _fetch, {
+        'shoutcast_genres': base + '/shoutcast/genres',
+        'shoutcast_subgenres': base + '/shoutcast/subgenres?id={id}',
+        'shoutcast_stations': base + '/shoutcast/stations?id={id}',
+        'shoutcast_tunein': 'http://yp.example/tunein?id={id}',
+        'somafm': base + '/somafm',
+        'tunein': base + '/tunein',
+        'zapp': base + '/zapp',
+    })
+    loop = QEventLoop()
+    crawler.finished.connect(loop.quit)
+    QTimer.singleShot(10000, loop.quit)
+    crawler.start()
+    loop.exec_()
+    bg_parser.shutdown()
+    assert not crawler.is_running(), 'crawl timed out'
+    rows = {provider: sorted(index._db.execute(f'SELECT title, url FROM {index._table} WHERE provider = ?', (provider,)))
+            for provider in PROVIDERS}
+    assert rows == {
+        'shoutcast': [('Bebop Radio', 'http://yp.example/tunein?id=201'), ('Hard Rock FM', 'http://yp.example/tunein?id=102'),
+                ('Rock Antenne', 'http://yp.example/tunein?id=101'), ('Swing & Jive', 'http://yp.example/tunein?id=202')],
+        'somafm': [('Groove Salad', 'https://somafm.com/groovesalad.pls')],
+        'tunein': [('Jazz Lounge', 'http://tunein.example/jazz'), ('Talk Radio', 'http://tunein.example/talk')],
+        'zapp': [('Das Erste', 'https://zapp.example/ard.m3u8')],
+    }, rows
+    # the TuneIn link back to an already crawled outline isn't requested again
+    assert crawler.requests == 10, crawler.requests
+    assert sorted(row[0] for row in index.search('roc', 'radio')) == ['Hard Rock FM', 'Rock Antenne']
+    print(f'self-check: crawl of local stand-in directories OK, {crawler.requests} requests, '
+          f'{index.count()} entries')
+
+    N = 100000
+    WORDS = ('rock', 'jazz', 'radio', 'classic', 'hits', 'lounge', 'metal', 'news', 'talk', 'deutsch',
+            'chill', 'ambient', 'fm', 'soul', 'funk', 'techno', 'house', 'country', 'blues', 'pop')
+
+    random.seed(1)
+    index = StationIndex()
+    t = time.perf_counter()
+    generation = index.begin('bench')
+    records = [(' '.join(random.choice(WORDS) for _ in range(3)) + f' {i}', f'http://example.com/{i}.pls')
+            for i in range(N)]
+    for pos in range(0, N, 1000):
+        index.add('bench', 'radio', generation, records[pos:pos + 1000])
+    index.finish('bench', generation)
+    print(f'indexing {N} stations: {1000 * (time.perf_counter() - t):.0f} ms, FTS5: {index.fts}')
+
+    for text in ('r', 'ro', 'roc', 'rock', 'rock j', 'rock ja', 'rock jazz', 'deutsch hits 99', 'xyz'):
+        t = time.perf_counter()
+        for _ in range(20):
+            res = index.search(text, 'radio')
+        t = (time.perf_counter() - t) / 20
+        print(f'{text!r:>18}: {len(res):>3} results in {1000 * t:6.2f} ms')
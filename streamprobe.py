@@ -0,0 +1,233 @@
+'''
+Background health checks for stream URLs.
+
+A probe opens the stream, follows redirects (recording the chain), waits for the
+first body bytes (time to first byte), reads the advertised bitrate (icy-br) and
+closes the connection again. At most max_parallel probes run at the same time.
+Probes can be put into a group (e.g. 'radio_search'), so the ones of replaced
+search results can be dropped with clear(group) without touching the others.
+Results are kept with a timestamp and reused until they expire, rank_key()
+orders working streams by TTFB ahead of unknown and dead ones.
+'''
+
+from collections import deque
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+
+__all__ = ['StreamProber']
+
+MAX_PARALLEL = 4
+
+# ms
+PROBE_TIMEOUT = 8000
+
+# seconds
+RESULT_TTL = 600
+
+
+class StreamProber(QObject):
+
+    # url, result dict
+    probed = pyqtSignal(str, dict)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, net_manager, max_parallel=MAX_PARALLEL, timeout=PROBE_TIMEOUT, ttl=RESULT_TTL, parent=None):
+        super().__init__(parent)
+        self._net_manager = net_manager
+        self._max_parallel = max_parallel
+        self._timeout = timeout
+        self._ttl = ttl
+        self._queue = deque()
+        self._running = {}
+        self._results = {}
+        # url: group of queued or running probe, None if it doesn't belong to one
+        self._groups = {}
+
+    ########################################
+    # returns result dict or None if url wasn't probed (recently):
+    # url, alive, status, ttfb (ms), bitrate (kbit/s), content_type, redirects,
+    # error, checked (timestamp)
+    ########################################
+    def result(self, url):
+        res = self._results.get(url)
+        if res is None or time.time() - res['checked'] > self._ttl:
+            return None
+        return res
+
+    ########################################
+    # urls that were probed recently or are already queued are skipped, a probe
+    # requested by another group (or none) no longer belongs to a group
+    ########################################
+    def probe(self, urls, group=None):
+        for url in urls:
+            if url in self._groups:
+                if self._groups[url] != group:
+                    self._groups[url] = None
+                continue
+            if self.result(url) is not None or not QUrl(url).scheme() in ('http', 'https'):
+                continue
+            self._groups[url] = group
+            self._queue.append(url)
+        self.__next()
+
+    ########################################
+    # drops queued and aborts running probes of group, e.g. when the probed rows
+    # were replaced. Results are kept.
+    ########################################
+    def clear(self, group):
+        if group is None:
+            return
+        self._queue = deque(url for url in self._queue if self._groups[url] != group)
+        for url in [url for url in self._running if self._groups[url] == group]:
+            probe = self._running.pop(url)
+            del self._groups[url]
+            probe['timer'].stop()
+            probe['timer'].deleteLater()
+            probe['reply'].abort()
+            probe['reply'].deleteLater()
+        for url in [url for url, g in self._groups.items() if g == group]:
+            del self._groups[url]
+        self.__next()
+
+    ########################################
+    # sort key: working streams by TTFB, then unknown, then dead ones
+    ########################################
+    def rank_key(self, url):
+        res = self.result(url)
+        if res is None:
+            return (1, 0)
+        if res['alive']:
+            return (0, res['ttfb'])
+        return (2, 0)
+
+    ########################################
+    #
+    ########################################
+    def rank(self, urls):
+        return sorted(urls, key=self.rank_key)
+
+    ########################################
+    #
+    ########################################
+    def __next(self):
+        while self._queue and len(self._running) < self._max_parallel:
+            self.__start(self._queue.popleft())
+
+    ########################################
+    #
+    ########################################
+    def __start(self, url):
+        req = QNetworkRequest(QUrl(url))
+        req.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        req.setAttribute(QNetworkRequest.CacheLoadControlAttribute, QNetworkRequest.AlwaysNetwork)
+        reply = self._net_manager.get(req)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        probe = {
+            'reply': reply,
+            'timer': timer,
+            't_started': time.perf_counter(),
+            'redirects': [],
+        }
+        self._running[url] = probe
+        reply.redirected.connect(lambda redirect_url: probe['redirects'].append(redirect_url.toString()))
+        reply.readyRead.connect(lambda: self.__done(url, None))
+        reply.finished.connect(lambda: self.__done(url, reply.errorString() if reply.error() != QNetworkReply.NoError
+                else 'no data'))
+        timer.timeout.connect(lambda: self.__done(url, 'timeout'))
+        timer.start(self._timeout)
+
+    ########################################
+    #
+    ########################################
+    def __done(self, url, error):
+        probe = self._running.pop(url, None)
+        if probe is None:
+            return
+        del self._groups[url]
+        reply = probe['reply']
+        probe['timer'].stop()
+        probe['timer'].deleteLater()
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        bitrate = reply.rawHeader(b'icy-br').data().decode('latin-1').split(',')[0].strip()
+        res = {
+            'url': url,
+            'alive': error is None and (status is None or 200 <= status < 300),
+            'status': status,
+            'ttfb': round(1000 * (time.perf_counter() - probe['t_started']), 1) if error is None else None,
+            'bitrate': int(bitrate) if bitrate.isdigit() else None,
+            'content_type': reply.header(QNetworkRequest.ContentTypeHeader),
+            'redirects': probe['redirects'],
+            'error': error,
+            'checked': time.time(),
+        }
+        self._results[url] = res
+        # stream data isn't needed, closes the connection
+        reply.abort()
+        reply.deleteLater()
+        self.probed.emit(url, res)
+        self.__next()
+
+
+if __name__ == '__main__':
+    # demo against local stand-in stream servers
+    import http.server, os, sys, threading
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+    from PyQt5.QtNetwork import QNetworkAccessManager
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            if self.path == '/redirect':
+                self.send_response(302)
+                self.send_header('Location', '/fast')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if self.path == '/dead':
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if self.path == '/hang':
+                time.sleep(3)
+                return
+            if self.path == '/slow':
+                time.sleep(0.3)
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/mpeg')
+            self.send_header('icy-br', '128')
+            self.end_headers()
+            try:
+                for _ in range(50):
+                    self.wfile.write(b'\0' * 4096)
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    app = QCoreApplication(sys.argv)
+    prober = StreamProber(QNetworkAccessManager(), timeout=1000)
+    urls = [base + path for path in ('/slow', '/dead', '/fast', '/redirect', '/hang', '/fast2')]
+    loop = QEventLoop()
+    prober.probed.connect(lambda url, res: loop.quit() if all(prober.result(u) for u in urls) else None)
+    t = time.perf_counter()
+    prober.probe(urls)
+    loop.exec_()
+    print(f'{len(urls)} probes, {MAX_PARALLEL} in parallel: {1000 * (time.perf_counter() - t):.0f} ms')
+    for url in prober.rank(urls):
+        res = prober.result(url)
+        print(f"{url[len(base):]:>10}: alive={res['alive']!s:5} status={res['status']} ttfb={res['ttfb']} "
+              f"br={res['bitrate']} redirects={len(res['redirects'])} error={res['error']}")
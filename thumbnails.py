@@ -0,0 +1,355 @@
+'''
+Seek preview thumbnails.
+
+After a local video was loaded, ThumbnailGenerator extracts low resolution
+frames at regular intervals on a worker thread and assembles them into one
+sprite (a grid of equally sized tiles). Frames are extracted by a pluggable
+decoder, a callable (path, t, width, height) -> QImage or None, by default
+FfmpegDecoder which runs one ffmpeg process per frame with input seeking.
+
+Sprites are stored as JPEG plus a JSON header in a disk cache keyed by path,
+size and mtime, so reopening a file loads its previews from disk at once.
+ThumbnailPreview shows the tile for a position above the time slider.
+'''
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from PyQt5.QtCore import Qt, QObject, QThread, QPoint, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QImage, QPainter, QPixmap, QColor
+from PyQt5.QtWidgets import QLabel
+
+__all__ = ['FfmpegDecoder', 'ThumbnailCache', 'ThumbnailGenerator', 'ThumbnailPreview']
+
+TILE_WIDTH = 160
+TILE_HEIGHT = 90
+COLUMNS = 10
+MAX_THUMBNAILS = 100
+MAX_SPRITES = 500
+# sprite is emitted after this many new tiles, so previews appear while generating
+UPDATE_EVERY = 10
+JPEG_QUALITY = 80
+# sprites with fewer decoded tiles (e.g. codec missing, timeouts on a slow share) aren't cached
+MIN_DECODED_RATIO = .5
+CACHE_VERSION = 3
+
+# seconds
+MIN_INTERVAL = 2
+FFMPEG_TIMEOUT = 10
+
+
+class FfmpegDecoder():
+
+    ########################################
+    # ffmpeg is the path of the ffmpeg binary
+    ########################################
+    def __init__(self, ffmpeg):
+        self._ffmpeg = ffmpeg
+
+    ########################################
+    # returns path of ffmpeg binary in res_dir or on PATH, or None
+    ########################################
+    @staticmethod
+    def find(res_dir=None):
+        if res_dir:
+            path = os.path.join(res_dir, 'ffmpeg.exe' if sys.platform == 'win32' else 'ffmpeg')
+            if os.path.isfile(path):
+                return path
+        return shutil.which('ffmpeg')
+
+    ########################################
+    # returns QImage (width x height, letterboxed) of frame at t (seconds), or None
+    ########################################
+    def __call__(self, path, t, width, height):
+        vf = (f'scale={width}:{height}:force_original_aspect_ratio=decrease,'
+              f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2')
+        try:
+            res = subprocess.run([self._ffmpeg, '-v', 'error', '-ss', f'{t:.3f}', '-i', path, '-frames:v', '1',
+                    '-an', '-sn', '-vf', vf, '-f', 'image2pipe', '-vcodec', 'bmp', '-'],
+                    capture_output=True, timeout=FFMPEG_TIMEOUT,
+                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print('thumbnails: ffmpeg failed:', e)
+            return None
+        image = QImage.fromData(res.stdout, 'BMP')
+        return None if image.isNull() else image
+
+
+class ThumbnailCache():
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, cache_dir, max_sprites=MAX_SPRITES):
+        self._cache_dir = cache_dir
+        self._max_sprites = max_sprites
+        os.makedirs(cache_dir, exist_ok=True)
+
+    ########################################
+    # returns cache key of file or None if it doesn't exist
+    ########################################
+    def key(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return hashlib.sha1(f'{CACHE_VERSION}\0{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}'
+                .encode()).hexdigest()
+
+    ########################################
+    # returns (sprite QImage, header dict) or None
+    ########################################
+    def load(self, key):
+        base = os.path.join(self._cache_dir, key)
+        try:
+            with open(base + '.json', 'r') as f:
+                header = json.load(f)
+            os.utime(base + '.json')
+        except (OSError, ValueError):
+            return None
+        sprite = QImage(base + '.jpg')
+        if sprite.isNull():
+            return None
+        return sprite, header
+
+    ########################################
+    # called on the worker thread
+    ########################################
+    def store(self, key, sprite, header):
+        base = os.path.join(self._cache_dir, key)
+        if not sprite.save(base + '.jpg', 'JPG', JPEG_QUALITY):
+            print('thumbnails: writing sprite failed:', base)
+            return
+        try:
+            with open(base + '.json', 'w') as f:
+                json.dump(header, f)
+        except OSError as e:
+            print('thumbnails: writing header failed:', e)
+            return
+        self.__prune()
+
+    ########################################
+    # removes least recently used sprites
+    ########################################
+    def __prune(self):
+        headers = sorted((f.stat().st_mtime, f.path) for f in os.scandir(self._cache_dir) if f.name.endswith('.json'))
+        for mtime, path in headers[:max(0, len(headers) - self._max_sprites)]:
+            for fn in (path, path[:-5] + '.jpg'):
+                try:
+                    os.remove(fn)
+                except OSError:
+                    pass
+
+
+class _ThumbnailWorker(QObject):
+
+    # job, sprite, header (count is the number of tiles done, total the number of all tiles,
+    # failed the indexes of tiles that couldn't be decoded)
+    updated = pyqtSignal(int, QImage, dict)
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, owner, decoder, cache):
+        super().__init__()
+        self._owner = owner
+        self._decoder = decoder
+        self._cache = cache
+
+    ########################################
+    #
+    ########################################
+    @pyqtSlot(int, str, str, float)
+    def generate(self, job, path, key, duration):
+        count = min(MAX_THUMBNAILS, max(1, int(duration / MIN_INTERVAL)))
+        header = {
+            'count': 0,
+            'total': count,
+            'failed': [],
+            'interval': duration / count,
+            'columns': COLUMNS,
+            'width': TILE_WIDTH,
+            'height': TILE_HEIGHT,
+        }
+        sprite = QImage(TILE_WIDTH * min(count, COLUMNS), TILE_HEIGHT * ((count - 1) // COLUMNS + 1),
+                QImage.Format_RGB32)
+        sprite.fill(Qt.black)
+        painter = QPainter(sprite)
+        for i in range(count):
+            # superseded by another file
+            if self._owner._job != job:
+                painter.end()
+                return
+            # frame in the middle of each interval
+            image = self._decoder(path, (i + .5) * header['interval'], TILE_WIDTH, TILE_HEIGHT)
+            if image is not None:
+                painter.drawImage(TILE_WIDTH * (i % COLUMNS), TILE_HEIGHT * (i // COLUMNS),
+                        image.scaled(TILE_WIDTH, TILE_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            else:
+                header['failed'].append(i)
+            header['count'] = i + 1
+            if (i + 1) % UPDATE_EVERY == 0 and i + 1 < count:
+                self.updated.emit(job, sprite.copy(), dict(header, failed=list(header['failed'])))
+        painter.end()
+        if count - len(header['failed']) >= MIN_DECODED_RATIO * count:
+            self._cache.store(key, sprite, header)
+        else:
+            print('thumbnails: too many frames failed to decode, not cached:', path)
+        self.updated.emit(job, sprite, header)
+
+
+class ThumbnailGenerator(QObject):
+
+    # sprite or header changed
+    updated = pyqtSignal()
+
+    _generate = pyqtSignal(int, str, str, float)
+
+    ########################################
+    # without decoder, only cached sprites are used
+    ########################################
+    def __init__(self, cache_dir, decoder=None, parent=None):
+        super().__init__(parent)
+        self._cache = ThumbnailCache(cache_dir)
+        self._job = 0
+        self._sprite = None
+        self._header = None
+        self._thread = None
+        if decoder is not None:
+            self._thread = QThread(self)
+            self._worker = _ThumbnailWorker(self, decoder, self._cache)
+            self._worker.moveToThread(self._thread)
+            self._generate.connect(self._worker.generate)
+            self._worker.updated.connect(self.__updated)
+            self._thread.start()
+
+    ########################################
+    # loads cached sprite of file, or generates it in the background
+    ########################################
+    def request(self, path, duration):
+        self.clear()
+        key = self._cache.key(path)
+        if key is None or duration <= 0:
+            return
+        res = self._cache.load(key)
+        if res is not None:
+            self._sprite, self._header = res
+            self.updated.emit()
+        elif self._thread is not None:
+            self._generate.emit(self._job, path, key, duration)
+
+    ########################################
+    # stops generating
+    ########################################
+    def clear(self):
+        self._job += 1
+        self._sprite = self._header = None
+
+    ########################################
+    # returns QImage of thumbnail for t (seconds), or None if not available (yet)
+    ########################################
+    def thumbnail(self, t):
+        if self._header is None:
+            return None
+        h = self._header
+        # t at the very end of the last interval still belongs to the last tile
+        i = min(max(0, int(t / h['interval'])), h['total'] - 1)
+        # not generated yet, or decoding failed
+        if i >= h['count'] or i in h['failed']:
+            return None
+        return self._sprite.copy(h['width'] * (i % h['columns']), h['height'] * (i // h['columns']),
+                h['width'], h['height'])
+
+    ########################################
+    #
+    ########################################
+    def shutdown(self):
+        self.clear()
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+
+    ########################################
+    #
+    ########################################
+    def __updated(self, job, sprite, header):
+        if job != self._job:
+            return
+        self._sprite, self._header = sprite, header
+        self.updated.emit()
+
+
+class ThumbnailPreview(QLabel):
+
+    ########################################
+    #
+    ########################################
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.ToolTip | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setStyleSheet('border: 1px solid #808080; background: black;')
+
+    ########################################
+    # shows image with caption centered above position x of widget
+    ########################################
+    def show_at(self, widget, x, image, caption=''):
+        pixmap = QPixmap.fromImage(image)
+        if caption:
+            painter = QPainter(pixmap)
+            rect = pixmap.rect().adjusted(0, 0, 0, -2)
+            painter.setPen(QColor('#000000'))
+            painter.drawText(rect.translated(1, 1), Qt.AlignHCenter | Qt.AlignBottom, caption)
+            painter.setPen(QColor('#FFFFFF'))
+            painter.drawText(rect, Qt.AlignHCenter | Qt.AlignBottom, caption)
+            painter.end()
+        self.setPixmap(pixmap)
+        self.adjustSize()
+        pos = widget.mapToGlobal(QPoint(x - self.width() // 2, -self.height() - 4))
+        self.move(pos)
+        self.show()
+
+
+if __name__ == '__main__':
+    # demo: first and second open of a file, with a fake decoder that takes 20 ms per
+    # frame (or ffmpeg, if a video file is passed)
+    import tempfile, time
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+
+    def _fake_decoder(path, t, width, height):
+        time.sleep(.02)
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor.fromHsv(int(t) % 360, 200, 200))
+        return image
+
+    if len(sys.argv) > 1:
+        path, duration, decoder = sys.argv[1], float(sys.argv[2]), FfmpegDecoder(FfmpegDecoder.find())
+    else:
+        path, duration, decoder = __file__, 3600., _fake_decoder
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for run in ('first open', 'second open'):
+            generator = ThumbnailGenerator(cache_dir, decoder)
+            loop = QEventLoop()
+            first = []
+            def _updated():
+                if not first:
+                    first.append(time.perf_counter() - t)
+                if generator._header['count'] == min(MAX_THUMBNAILS, int(duration / MIN_INTERVAL)):
+                    loop.quit()
+            generator.updated.connect(_updated)
+            t = time.perf_counter()
+            generator.request(path, duration)
+            if not first:
+                loop.exec_()
+            t_all = time.perf_counter() - t
+            print(f'{run:>11}: first previews after {1000 * first[0]:7.1f} ms, all {generator._header["count"]} '
+                  f'after {1000 * t_all:7.1f} ms, thumbnail(1800): {generator.thumbnail(1800).size()}')
+            generator.shutdown()
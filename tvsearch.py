@@ -0,0 +1,132 @@
+'''
+Paged search in the mediathekviewweb.de API.
+
+Results are requested page by page (offset/size) in a stable order, newest
+first, so further pages can be appended to what is already shown. Descriptions
+are truncated, they are only used for tooltips, which bounds the memory used by
+very broad queries together with the model's row limit. Responses are decoded
+on the parser worker thread ('tv_search' decoder).
+'''
+
+from functools import partial
+import json
+import urllib.parse
+
+from populate import JsonRecordParser, register_decoder
+
+__all__ = ['query_url', 'extract_results']
+
+API_URL = 'https://mediathekviewweb.de/api/query'
+
+# characters
+MAX_DESCRIPTION = 1000
+
+
+########################################
+# returns url of the page of results for text starting at offset
+########################################
+def query_url(text, offset, size):
+    q = {
+        'queries': [
+            {'fields': ['title', 'topic', 'description'], 'query': text},
+        ],
+        'sortBy': 'timestamp',
+        'sortOrder': 'desc',
+        'future': 0,
+        'offset': offset,
+        'size': size,
+    }
+    return API_URL + '?query=' + urllib.parse.quote(json.dumps(q))
+
+
+########################################
+# returns list of (channel, title, url, description) records of decoded response
+########################################
+def extract_results(res):
+    return [(
+            track['channel'], track['title'],
+            track['url_video_hd'] if track.get('url_video_hd') else track['url_video'],
+            (track.get('description') or '')[:MAX_DESCRIPTION]) for track in res['result']['results']]
+
+
+register_decoder('tv_search', partial(JsonRecordParser, extract_results))
+
+
+if __name__ == '__main__':
+    # benchmark: time to first result against a local mock API, one 500 result response
+    # vs. a small first page
+    import http.server, os, sys, threading, time
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication, QListView
+    from models import PagedRecordListModel
+    from network import Network
+    from populate import BackgroundParser
+
+    TOTAL = 5000
+    # the API's time to search, per result returned (and fixed)
+    DELAY_PER_RESULT = 0.0004
+    DELAY = 0.05
+
+    description = 'Lorem ipsum dolor sit amet, consetetur sadipscing elitr, sed diam nonumy eirmod tempor. ' * 12
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            q = json.loads(urllib.parse.unquote(self.path.split('?query=', 1)[1]))
+            offset, size = q['offset'], q['size']
+            results = [{'channel': f'CH{i % 20}', 'title': f'Show {i}', 'topic': 'Topic', 'description': description,
+                    'url_video': f'https://example.com/{i}.mp4', 'url_video_hd': f'https://example.com/{i}_hd.mp4'}
+                    for i in range(offset, min(offset + size, TOTAL))]
+            time.sleep(DELAY + DELAY_PER_RESULT * len(results))
+            body = json.dumps({'result': {'results': results, 'queryInfo': {'totalResults': TOTAL}}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    API_URL = f'http://127.0.0.1:{server.server_port}/api/query'
+
+    app = QApplication(sys.argv)
+    network = Network()
+    bg_parser = BackgroundParser()
+    pages = []
+
+    def _fetch_page(text, offset, size, callback):
+        pages.append(size)
+        finished, on_data, on_cancel = bg_parser.callbacks(partial(JsonRecordParser, extract_results), callback,
+                'tv_search')
+        network.get(query_url(text, offset, size), finished, on_data=on_data, on_cancel=on_cancel)
+
+    for name, first_page_size in (('one 500 result page', 500), ('paged', 25)):
+        model = PagedRecordListModel(lambda r: f'[{r[0]}] {r[1]}', lambda r: r[2], _fetch_page,
+                first_page_size=first_page_size)
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setModel(model)
+        view.resize(300, 400)
+        view.show()
+        pages.clear()
+        loop = QEventLoop()
+        model.rowsInserted.connect(loop.quit)
+        t = time.perf_counter()
+        model.search(name)
+        loop.exec_()
+        t_first = time.perf_counter() - t
+        rows = model.rowCount()
+
+        # scroll to the end until the row limit is reached
+        model.rowsInserted.disconnect()
+        t = time.perf_counter()
+        while model.canFetchMore() or model._loading:
+            if not model._loading:
+                view.scrollToBottom()
+                model.fetchMore()
+            app.processEvents(QEventLoop.WaitForMoreEvents)
+        t_all = time.perf_counter() - t
+        print(f'{name:>20}: first {rows:3} results after {1000 * t_first:6.1f} ms, '
+              f'scrolled to {model.rowCount()} rows (cap) in {len(pages)} pages, {t_all:.1f} s')
+    bg_parser.shutdown()